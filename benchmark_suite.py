@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# Benchmark Suite - Timing and memory benchmarks for the audit pipeline
+# Runs against seeded synthetic histories (see workload.py) and compares the
+# results with a stored baseline so regressions show up before they ship.
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from triad_tracker import TriadTracker
+from workload import WorkloadGenerator
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(PACKAGE_DIR, "benchmark_baseline.json")
+DEFAULT_TOLERANCE = 0.5  # Fail when a result is more than 50% worse than the baseline
+NOISE_FLOOR = {"per_op_us": 0.5, "peak_kib": 16.0}  # Absolute differences below these are noise
+
+# Start-up budgets in milliseconds above a bare interpreter start (`python -c pass`),
+# enforced by --check independently of the baseline
+STARTUP_BUDGET_MS = {"cli_log_startup": 50.0, "app_startup": 35.0}
+STARTUP_RUNS = 10
+
+# Last day of the synthetic histories (a Monday with logs), fixed so a seed gives the same workload on any day
+DEFAULT_END_DATE = "2026-06-29"
+
+
+class BenchmarkContext:
+    """Shared, pre-built workload so each benchmark only times its own operation"""
+
+    def __init__(self, seed=7, users=3, years=2, end_date=DEFAULT_END_DATE):
+        self.generator = WorkloadGenerator(seed=seed, users=users, years=years, end_date=date.fromisoformat(end_date))
+        self.config = {"seed": seed, "users": users, "years": years, "end_date": end_date}
+        self.dashboards = self.generator.build_dashboards()
+        self.user_id = self.generator.user_ids()[0]
+        self.dashboard = self.dashboards[self.user_id]
+        self.dates = sorted(self.dashboard.tracker.daily_logs)
+        self._interpreter_startup_us = None
+        self._workdir = tempfile.TemporaryDirectory(prefix="mirror-benchmark-")
+
+    def temp_dir(self):
+        """A fresh scratch directory, removed by close()"""
+        return tempfile.mkdtemp(dir=self._workdir.name)
+
+    def close(self):
+        self._workdir.cleanup()
+
+    def interpreter_startup_us(self):
+        """Median wall time of a bare interpreter start, measured once"""
+        if self._interpreter_startup_us is None:
+            timings = [_time_python(["-c", "pass"]) for _ in range(STARTUP_RUNS)]
+            self._interpreter_startup_us = round(statistics.median(timings), 3)
+        return self._interpreter_startup_us
+
+
+def bench_log_throughput(context):
+    """Log every user's full history into fresh trackers"""
+    def run():
+        total = 0
+        for user_id in context.generator.user_ids():
+            total += context.generator.populate_tracker(TriadTracker(), user_id)
+        return total
+    return run
+
+
+def bench_calculate_daily_scores(context):
+    """Score every logged day of one user's history"""
+    tracker = context.dashboard.tracker
+
+    def run():
+        for target_date in context.dates:
+            tracker.calculate_daily_scores(target_date)
+        return len(context.dates)
+    return run
+
+
+def bench_get_weekly_average(context):
+    tracker = context.dashboard.tracker
+
+    def run():
+        for _ in range(200):
+            tracker.get_weekly_average()
+        return 200
+    return run
+
+
+def bench_generate_daily_report(context):
+    def run():
+        for dashboard in context.dashboards.values():
+            dashboard.generate_daily_report()
+        return len(context.dashboards)
+    return run
+
+
+def bench_get_priority_actions(context):
+    def run():
+        for _ in range(500):
+            for dashboard in context.dashboards.values():
+                dashboard.profile.get_priority_actions()
+        return 500 * len(context.dashboards)
+    return run
+
+
+def bench_export_daily_log(context):
+    tracker = context.dashboard.tracker
+
+    def run():
+        for target_date in context.dates:
+            json.dumps(tracker.export_daily_log(target_date))
+        return len(context.dates)
+    return run
+
+
+def bench_snapshot_load(context):
+    """Restore a snapshot of the full history (the app's start-up path)"""
+    from mirror_snapshot import save_snapshot, load_snapshot
+
+    workdir = context.temp_dir()
+    path = os.path.join(workdir, "benchmark.snapshot")
+    save_snapshot(context.dashboard, path)
+
+    def run():
+        for _ in range(20):
+            load_snapshot(path).tracker.calculate_daily_scores()
+        return 20
+    return run
+
+
+def bench_group_commit_ingest(context):
+    """Push every user's history through the group-commit queue (with fsync) and flush"""
+    from ingest_queue import GroupCommitQueue
+
+    workdir = context.temp_dir()
+    histories = [list(context.generator.entries(user_id)) for user_id in context.generator.user_ids()]
+
+    def run():
+        journal_path = os.path.join(workdir, "benchmark.journal")
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        total = 0
+        with GroupCommitQueue(TriadTracker(), journal_path) as queue:
+            loggers = {
+                "cognitive": queue.log_cognitive_effort,
+                "kinetic": queue.log_kinetic_effort,
+                "moral": queue.log_moral_effort
+            }
+            for history in histories:
+                for frequency, fields in history:
+                    loggers[frequency](**fields)
+                total += len(history)
+        return total
+    return run
+
+
+def bench_cli_log_startup(context):
+    """`main.py log cognitive ...` end to end in a fresh interpreter (journal append with fsync)"""
+    state_dir = context.temp_dir()
+    command = [os.path.join(PACKAGE_DIR, "main.py"), "log", "cognitive", "1.5", "--type", "derivation", "--state-dir", state_dir]
+
+    def run():
+        for _ in range(STARTUP_RUNS):
+            _time_python(command)
+        return STARTUP_RUNS
+    return run
+
+
+def bench_app_startup(context):
+    """Interactive app start until the menu is shown, then exit without using the dashboard"""
+    state_dir = context.temp_dir()
+    command = [os.path.join(PACKAGE_DIR, "main.py"), "--state-dir", state_dir]
+
+    def run():
+        for _ in range(STARTUP_RUNS):
+            _time_python(command, stdin="4\n")
+        return STARTUP_RUNS
+    return run
+
+
+BENCHMARKS = {
+    "log_throughput": bench_log_throughput,
+    "group_commit_ingest": bench_group_commit_ingest,
+    "calculate_daily_scores": bench_calculate_daily_scores,
+    "get_weekly_average": bench_get_weekly_average,
+    "generate_daily_report": bench_generate_daily_report,
+    "get_priority_actions": bench_get_priority_actions,
+    "export_daily_log": bench_export_daily_log,
+    "snapshot_load": bench_snapshot_load,
+    "cli_log_startup": bench_cli_log_startup,
+    "app_startup": bench_app_startup
+}
+
+
+def measure(run, repeats):
+    """
+    Time `run` (which returns its operation count) and measure its peak allocation
+    Returns per-operation microseconds (median of repeats) and peak KiB
+    """
+    timings = []
+    ops = 1
+    for _ in range(repeats):
+        gc.collect()
+        began = time.perf_counter()
+        ops = run() or 1
+        timings.append((time.perf_counter() - began) / ops * 1e6)
+
+    # Memory is measured on a separate run; tracemalloc would distort the timings
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "per_op_us": round(statistics.median(timings), 3),
+        "ops": ops,
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def run_benchmarks(context, names=None, repeats=5):
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = measure(BENCHMARKS[name](context), repeats)
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return a list of human-readable regressions (empty if everything is within tolerance)"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            continue
+        for metric in ("per_op_us", "peak_kib"):
+            limit = max(reference[metric] * (1 + tolerance), reference[metric] + NOISE_FLOOR[metric])
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}.{metric}: {result[metric]} exceeds {limit:.1f} "
+                    f"(baseline {reference[metric]}, tolerance {tolerance:.0%})"
+                )
+    return regressions
+
+
+def check_startup_budgets(results, interpreter_us):
+    """Return the start-up benchmarks whose overhead above interpreter start-up exceeds its budget"""
+    failures = []
+    for name, budget_ms in STARTUP_BUDGET_MS.items():
+        result = results.get(name)
+        if result is None:
+            continue
+        overhead_ms = (result["per_op_us"] - interpreter_us) / 1000
+        if overhead_ms > budget_ms:
+            failures.append(f"{name}: {overhead_ms:.1f} ms above interpreter start-up exceeds the {budget_ms:.0f} ms budget")
+    return failures
+
+
+def _time_python(arguments, stdin=None):
+    """Run a fresh interpreter from the package directory; returns wall time in microseconds"""
+    began = time.perf_counter()
+    subprocess.run([sys.executable, *arguments], input=stdin, text=True, cwd=PACKAGE_DIR,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - began) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark The Mirror's audit pipeline")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--end-date", default=DEFAULT_END_DATE, help="Last day of the synthetic histories (YYYY-MM-DD)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run a subset of benchmarks")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=None, help="Allowed slowdown as a fraction (default from baseline)")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if any result regresses past the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--metrics", help="Run once more with instrumentation on and write a per-method JSON dump here")
+    args = parser.parse_args(argv)
+
+    context = BenchmarkContext(seed=args.seed, users=args.users, years=args.years, end_date=args.end_date)
+    try:
+        return _run(args, context)
+    finally:
+        context.close()
+
+
+def _run(args, context):
+    print(f"Workload: {args.users} users x {args.years} years to {args.end_date} (seed {args.seed}), "
+          f"{sum(len(d.tracker.daily_logs) for d in context.dashboards.values())} logged days")
+
+    results = run_benchmarks(context, args.only, args.repeats)
+    print(f"\n{'benchmark':<26}{'us/op':>12}{'ops':>10}{'peak KiB':>12}")
+    print("-" * 60)
+    for name, result in results.items():
+        print(f"{name:<26}{result['per_op_us']:>12.2f}{result['ops']:>10}{result['peak_kib']:>12.1f}")
+    startup_run = any(name in results for name in STARTUP_BUDGET_MS)
+    if startup_run:
+        print(f"{'(interpreter start-up)':<26}{context.interpreter_startup_us():>12.2f}")
+
+    if args.metrics:
+        import instrumentation
+        with instrumentation.instrumented() as registry:
+            run_benchmarks(context, args.only, repeats=1)
+            registry.dump_json(args.metrics)
+        print(f"\nInstrumented call histograms written to {args.metrics}")
+
+    report = {"config": context.config, "results": results}
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.update_baseline:
+        report["tolerance"] = args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE
+        with open(args.baseline, "w") as handle:
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if args.check:
+        budget_failures = check_startup_budgets(results, context.interpreter_startup_us()) if startup_run else []
+        if budget_failures:
+            print("\nSTART-UP BUDGET EXCEEDED:")
+            for failure in budget_failures:
+                print(f"  ✗ {failure}")
+            return 1
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --update-baseline first.")
+            return 1
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        if baseline.get("config") != context.config:
+            print(f"\nBaseline was recorded with {baseline.get('config')}; rerun with the same workload to compare.")
+            return 1
+        tolerance = args.tolerance if args.tolerance is not None else baseline.get("tolerance", DEFAULT_TOLERANCE)
+        regressions = compare_to_baseline(results, baseline, tolerance)
+        if regressions:
+            print("\nREGRESSIONS DETECTED:")
+            for regression in regressions:
+                print(f"  ✗ {regression}")
+            return 1
+        print("\n✓ All benchmarks within tolerance of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+# Columnar Export Module - Analytics export of the full tracker history
+# Writes every entry and every day's scores as typed, dictionary-encoded columns,
+# readable with the standard library (mmap + memoryview) or zero-copy with NumPy.
+
+from array import array
+from datetime import date, datetime
+import json
+import mmap
+import os
+import struct
+import sys
+
+from durable_files import align, write_atomically
+from triad_tracker import LABEL_FIELDS
+
+COLUMNAR_MAGIC = b"MRCL"
+COLUMNAR_VERSION = 1
+
+HEADER = struct.Struct("<4sHH")   # magic, version, reserved
+TRAILER = struct.Struct("<Q4s")   # footer length, magic (the file ends with the magic)
+
+# array typecode -> (NumPy dtype, item size); all data is little-endian
+COLUMN_TYPES = {
+    "B": ("<u1", 1),
+    "i": ("<i4", 4),
+    "I": ("<u4", 4),
+    "q": ("<i8", 8),
+    "d": ("<f8", 8)
+}
+
+EPOCH = datetime(1970, 1, 1)
+NO_PROGRESS_FLAG = 255  # progress_made for entries that do not carry it
+
+# Entry fields that hold the numeric value, whatever the frequency (labels: LABEL_FIELDS)
+VALUE_FIELDS = ("hours", "time_spent")
+
+
+class ColumnarError(Exception):
+    """Raised when a columnar file is truncated, corrupt or from an unknown version"""
+
+
+class _ColumnBuilder:
+    """Accumulates one typed column, or the codes and dictionary of a string column"""
+
+    def __init__(self, typecode, dictionary=False):
+        self.values = array(typecode)
+        self.dictionary = {} if dictionary else None
+
+    def append(self, value):
+        if self.dictionary is not None:
+            code = self.dictionary.get(value)
+            if code is None:
+                code = self.dictionary[value] = len(self.dictionary)
+            value = code
+        self.values.append(value)
+
+
+def export_columnar(tracker, path, start=None, end=None):
+    """
+    Write the tracker's history (hot and archived days) in columnar form to `path`
+
+    - start, end: Optional inclusive date range (any form to_ordinal accepts)
+
+    Two tables are written:
+    - entries: day, timestamp (µs since 1970, wall clock), frequency, label,
+      value, progress_made, notes, tz (timezone suffix); sorted by day
+    - days: day, first_entry, entry_count and the cognitive/kinetic/moral scores
+
+    The file is written atomically. Returns the footer (also stored in the file).
+    """
+    rules = tracker.scoring_rules.current()
+    entries = {
+        "day": _ColumnBuilder("i"),
+        "timestamp": _ColumnBuilder("q"),
+        "frequency": _ColumnBuilder("I", dictionary=True),
+        "label": _ColumnBuilder("I", dictionary=True),
+        "value": _ColumnBuilder("d"),
+        "progress_made": _ColumnBuilder("B"),
+        "notes": _ColumnBuilder("I", dictionary=True),
+        "tz": _ColumnBuilder("I", dictionary=True)
+    }
+    days = {
+        "day": _ColumnBuilder("i"),
+        "first_entry": _ColumnBuilder("I"),
+        "entry_count": _ColumnBuilder("I"),
+        "cognitive": _ColumnBuilder("d"),
+        "kinetic": _ColumnBuilder("d"),
+        "moral": _ColumnBuilder("d")
+    }
+
+    row = 0
+    for day in tracker.active_day_ordinals(start, end):
+        day_entries = tracker.get_day_entries(day)
+        if not day_entries:
+            continue
+        scores = rules.score_entries(day_entries)
+        days["day"].append(day)
+        days["first_entry"].append(row)
+        days["entry_count"].append(len(day_entries))
+        for frequency in ("cognitive", "kinetic", "moral"):
+            days[frequency].append(float(scores.get(frequency, 0)))
+
+        for entry in day_entries:
+            micros, suffix = _split_timestamp(entry.get("timestamp"))
+            progress = entry.get("progress_made")
+            entries["day"].append(day)
+            entries["timestamp"].append(micros)
+            entries["frequency"].append(str(entry.get("frequency", "")))
+            label = _first_present(entry, LABEL_FIELDS)
+            entries["label"].append("" if label is None else str(label))
+            entries["value"].append(_as_float(_first_present(entry, VALUE_FIELDS)))
+            entries["progress_made"].append(NO_PROGRESS_FLAG if progress is None else int(bool(progress)))
+            entries["notes"].append(str(entry.get("notes", "")))
+            entries["tz"].append(suffix)
+        row += len(day_entries)
+
+    body = bytearray(HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, 0))
+    footer = {
+        "version": COLUMNAR_VERSION,
+        "created": datetime.now().isoformat(),
+        "tables": {
+            "entries": _write_table(body, entries, row),
+            "days": _write_table(body, days, len(days["day"].values))
+        },
+        "stats": _date_stats(days["day"].values, row)
+    }
+    footer_bytes = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+    body += footer_bytes
+    body += TRAILER.pack(len(footer_bytes), COLUMNAR_MAGIC)
+
+    write_atomically(path, (body,))
+    return footer
+
+
+class ColumnarReader:
+    """
+    Memory-mapped reader for columnar exports
+
+    column() returns zero-copy memoryviews over the mapping; numpy_column() returns
+    zero-copy NumPy arrays (NumPy is only imported when used). Only the columns a
+    scan touches are paged in. Release every view before close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            try:
+                self._mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ColumnarError(f"Columnar file is empty: {path}")
+        self.footer = self._read_footer()
+        self.tables = self.footer["tables"]
+        self.stats = self.footer["stats"]
+        self._dictionaries = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._mapped.close()
+
+    def rows(self, table="entries"):
+        return self._table(table)["rows"]
+
+    def columns(self, table="entries"):
+        return list(self._table(table)["columns"])
+
+    def column_stats(self, name, table="entries"):
+        """min/max (and dictionary size for string columns) recorded at export time"""
+        spec = self._spec(name, table)
+        return {key: spec[key] for key in ("min", "max", "distinct") if key in spec}
+
+    def column(self, name, table="entries"):
+        """Zero-copy memoryview of a column's values (dictionary codes for string columns)"""
+        spec = self._spec(name, table)
+        view = memoryview(self._mapped)[spec["offset"]:spec["offset"] + spec["length"]]
+        if sys.byteorder != "little" and COLUMN_TYPES[spec["type"]][1] > 1:
+            # Big-endian hosts pay for one byte-swapped copy
+            values = array(spec["type"], view)
+            values.byteswap()
+            return memoryview(values)
+        return view.cast(spec["type"])
+
+    def numpy_column(self, name, table="entries"):
+        """Zero-copy NumPy array of a column (dictionary codes for string columns)"""
+        import numpy
+
+        spec = self._spec(name, table)
+        dtype, size = COLUMN_TYPES[spec["type"]]
+        return numpy.frombuffer(self._mapped, dtype=dtype, count=spec["length"] // size, offset=spec["offset"])
+
+    def dictionary(self, name, table="entries"):
+        """The strings a dictionary-encoded column's codes refer to (decoded once, then cached)"""
+        key = (table, name)
+        if key not in self._dictionaries:
+            spec = self._spec(name, table)
+            if "dictionary" not in spec:
+                raise ColumnarError(f"Column {name!r} is not dictionary-encoded")
+            offsets_spec, data_spec = spec["dictionary"]["offsets"], spec["dictionary"]["data"]
+            offsets = memoryview(self._mapped)[offsets_spec["offset"]:offsets_spec["offset"] + offsets_spec["length"]].cast("I")
+            data = bytes(self._mapped[data_spec["offset"]:data_spec["offset"] + data_spec["length"]])
+            self._dictionaries[key] = [
+                data[offsets[index]:offsets[index + 1]].decode("utf-8") for index in range(len(offsets) - 1)
+            ]
+            offsets.release()
+        return self._dictionaries[key]
+
+    def strings(self, name, table="entries"):
+        """Decode a dictionary-encoded column into a list of strings"""
+        strings = self.dictionary(name, table)
+        codes = self.column(name, table)
+        try:
+            return [strings[code] for code in codes]
+        finally:
+            codes.release()
+
+    def dates(self, table="days"):
+        """The day column as datetime.date objects"""
+        days = self.column("day", table)
+        try:
+            return [date.fromordinal(day) for day in days]
+        finally:
+            days.release()
+
+    def _table(self, table):
+        try:
+            return self.tables[table]
+        except KeyError:
+            raise ColumnarError(f"No table named {table!r}")
+
+    def _spec(self, name, table):
+        try:
+            return self._table(table)["columns"][name]
+        except KeyError:
+            raise ColumnarError(f"No column named {name!r} in table {table!r}")
+
+    def _read_footer(self):
+        mapped = self._mapped
+        if len(mapped) < HEADER.size + TRAILER.size:
+            raise ColumnarError("Columnar file is truncated")
+        magic, version, _ = HEADER.unpack_from(mapped, 0)
+        footer_length, end_magic = TRAILER.unpack_from(mapped, len(mapped) - TRAILER.size)
+        if magic != COLUMNAR_MAGIC or end_magic != COLUMNAR_MAGIC:
+            raise ColumnarError("Not a Mirror columnar export (or the file is truncated)")
+        if version != COLUMNAR_VERSION:
+            raise ColumnarError(f"Unsupported columnar version: {version}")
+        footer_start = len(mapped) - TRAILER.size - footer_length
+        if footer_start < HEADER.size:
+            raise ColumnarError("Footer length runs past the start of the file")
+        try:
+            return json.loads(bytes(mapped[footer_start:footer_start + footer_length]))
+        except ValueError as error:
+            raise ColumnarError(f"Corrupt footer: {error}")
+
+
+def _write_table(body, columns, rows):
+    specs = {}
+    for name, builder in columns.items():
+        values = builder.values
+        spec = _write_array(body, values)
+        if builder.dictionary is not None:
+            strings = list(builder.dictionary)
+            offsets = array("I", [0])
+            data = bytearray()
+            for string in strings:
+                data += string.encode("utf-8")
+                offsets.append(len(data))
+            spec["dictionary"] = {"offsets": _write_array(body, offsets), "data": _write_bytes(body, bytes(data))}
+            spec["distinct"] = len(strings)
+            if strings:
+                spec["min"], spec["max"] = min(strings), max(strings)
+        elif values:
+            present = [value for value in values if value == value] if values.typecode == "d" else values
+            if present:
+                spec["min"], spec["max"] = min(present), max(present)
+        specs[name] = spec
+    return {"rows": rows, "columns": specs}
+
+
+def _write_array(body, values):
+    if COLUMN_TYPES[values.typecode][1] != values.itemsize:
+        raise ColumnarError(f"Unexpected item size for typecode {values.typecode!r} on this platform")
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    spec = _write_bytes(body, values.tobytes())
+    spec["type"] = values.typecode
+    return spec
+
+
+def _write_bytes(body, data):
+    offset = align(len(body))
+    body += bytes(offset - len(body))
+    body += data
+    return {"offset": offset, "length": len(data)}
+
+
+def _date_stats(day_values, entry_count):
+    if not day_values:
+        return {"first_day": None, "last_day": None, "days": 0, "span_days": 0, "entries": 0}
+    return {
+        "first_day": date.fromordinal(day_values[0]).isoformat(),
+        "last_day": date.fromordinal(day_values[-1]).isoformat(),
+        "days": len(day_values),
+        "span_days": day_values[-1] - day_values[0] + 1,
+        "entries": entry_count
+    }
+
+
+def _split_timestamp(stamp):
+    """(µs since 1970 on the wall clock, timezone suffix); unparseable stamps map to (0, "")"""
+    if not isinstance(stamp, str):
+        return 0, ""
+    try:
+        moment = datetime.fromisoformat(stamp)
+    except ValueError:
+        return 0, ""
+    naive = moment.replace(tzinfo=None)
+    suffix = stamp[len(naive.isoformat()):] if stamp.startswith(naive.isoformat()) else ""
+    delta = naive - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds, suffix
+
+
+def _first_present(entry, fields):
+    for field in fields:
+        if field in entry:
+            return entry[field]
+    return None
+
+
+def _as_float(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return float("nan")
+    return float(value)
+
+
+if __name__ == "__main__":
+    # Export a synthetic history (or a saved snapshot) and time a single-column scan
+    import argparse
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Export tracker history to the columnar format")
+    parser.add_argument("output", nargs="?", help="Columnar file to write (default: a temporary file)")
+    parser.add_argument("--snapshot", help="Export this snapshot's history instead of a synthetic one")
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.snapshot:
+        from mirror_snapshot import load_snapshot
+        tracker = load_snapshot(args.snapshot).tracker
+    else:
+        from workload import WorkloadGenerator
+        generator = WorkloadGenerator(seed=2026, years=args.years)
+        tracker = generator.build_dashboards(archive_after_days=30)[generator.user_ids()[0]].tracker
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = args.output or os.path.join(workdir, "history.mrcl")
+        began = time.perf_counter()
+        footer = export_columnar(tracker, path)
+        export_ms = (time.perf_counter() - began) * 1000
+
+        with ColumnarReader(path) as reader:
+            began = time.perf_counter()
+            hours = reader.column("value")
+            total = sum(value for value in hours if value == value)
+            hours.release()
+            scan_ms = (time.perf_counter() - began) * 1000
+            size = os.path.getsize(path)
+
+    stats = footer["stats"]
+    print(f"Exported {stats['entries']} entries over {stats['days']} days "
+          f"({stats['first_day']} .. {stats['last_day']}): {size / 1024:.1f} KiB in {export_ms:.1f} ms")
+    print(f"Scanned the value column (total {total:.1f} h) in {scan_ms:.2f} ms")
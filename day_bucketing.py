@@ -0,0 +1,171 @@
+# Day Bucketing Module - Timezone-aware assignment of timestamps to tracker days
+# Each user's day runs from day_start_hour to day_start_hour in their own timezone.
+# Day boundaries are precomputed as UTC epoch seconds, so bucketing a timestamp
+# is a bisect over integers instead of calendar arithmetic.
+
+from bisect import bisect_right
+from datetime import MAXYEAR, date, datetime, time as day_time
+import os
+import time
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+TABLE_MARGIN_DAYS = 366  # Boundaries precomputed on each side of a day that needs them
+MAX_TABLE_DAYS = 20 * 366  # Widest span the table may grow to; days outside it are computed directly
+FIRST_DAY = 1
+LAST_DAY = date(MAXYEAR, 12, 31).toordinal()
+
+
+class DayBucketer:
+    """
+    Maps timestamps to day ordinals for one user
+
+    - Aware datetimes and epoch seconds are bucketed with the boundary table:
+      boundaries[i] is the UTC second at which day first_day + i starts, so DST
+      changes (23- and 25-hour days) come out right.
+    - Naive datetimes are taken as wall-clock time in the user's timezone and only
+      need the day-start hour.
+    - today() caches the current day's [start, end) range; until the clock leaves
+      it, the answer is two comparisons.
+
+    The table covers one window of at most MAX_TABLE_DAYS around the days looked
+    up (starting around today); a timestamp far outside it (a typo'd year, a
+    historical import) is bucketed from the calendar directly instead of
+    stretching the table across the gap. The table is published as one
+    (first_day, boundaries) tuple and never changed in place, so the
+    process-wide bucketer can be shared between the event loop and worker
+    threads without a lock.
+    """
+
+    def __init__(self, tz=None, day_start_hour=0):
+        """
+        - tz: IANA name ("Asia/Kolkata"), a tzinfo, or None for the system local time
+        - day_start_hour: Hour (0-23) at which a new day begins; with 4, studying
+          until 3am still counts toward the previous day
+        """
+        if not 0 <= day_start_hour <= 23:
+            raise ValueError("day_start_hour must be between 0 and 23")
+        if isinstance(tz, str):
+            from zoneinfo import ZoneInfo
+            tz = ZoneInfo(tz)
+        self.tz = tz
+        self.day_start_hour = day_start_hour
+        self._start_time = day_time(day_start_hour)
+        self._table = (None, [])  # (first day, UTC start of each day from first_day on)
+        self._today = (0, 0, 0)  # (day, start, end) of the cached current day
+
+    @property
+    def tz_name(self):
+        """The IANA key of the timezone (None for system local time)"""
+        return getattr(self.tz, "key", None) if self.tz is not None else None
+
+    def now(self):
+        """The current time for entry timestamps: aware in the user's timezone, naive local without one"""
+        return datetime.now(self.tz)
+
+    def today(self):
+        """The current day ordinal in this user's timezone"""
+        now = time.time()
+        day, start, end = self._today
+        if start <= now < end:
+            return day
+        day = self.day_of_epoch(now)
+        self._today = (day, self.day_start(day), self.day_start(day + 1))
+        return day
+
+    def day_of(self, moment):
+        """The day ordinal a datetime belongs to (naive datetimes are local wall-clock time)"""
+        if moment.tzinfo is None:
+            # 0001-01-01 before the day-start hour has no previous day; it stays on day 1
+            return moment.toordinal() - (moment.hour < self.day_start_hour) or FIRST_DAY
+        return self.day_of_epoch(moment.timestamp())
+
+    def day_of_epoch(self, seconds):
+        """The day ordinal containing a UTC epoch timestamp"""
+        first_day, boundaries = self._table
+        if not boundaries or not boundaries[0] <= seconds < boundaries[-1]:
+            approximate = EPOCH_ORDINAL + int(seconds // 86400)
+            if not FIRST_DAY - 2 <= approximate <= LAST_DAY + 2:
+                raise ValueError("Timestamp is outside the supported date range")
+            table = self._cover(approximate - 2, approximate + 2)
+            if table is None or not table[1][0] <= seconds < table[1][-1]:
+                return self._locate(seconds, approximate)
+            first_day, boundaries = table
+        return first_day + bisect_right(boundaries, seconds) - 1
+
+    def day_start(self, day):
+        """UTC epoch second at which a day ordinal begins"""
+        first_day, boundaries = self._table
+        if first_day is not None and first_day <= day < first_day + len(boundaries):
+            return boundaries[day - first_day]
+        if not FIRST_DAY <= day <= LAST_DAY:
+            raise ValueError("Day is outside the supported date range")
+        table = self._cover(day, day)
+        if table is not None and table[0] <= day < table[0] + len(table[1]):
+            return table[1][day - table[0]]
+        return self._start_of(day)
+
+    def day_of_stamp(self, stamp):
+        """Day ordinal for an ISO timestamp string as stored in tracker entries (None if unparseable)"""
+        try:
+            return self.day_of(datetime.fromisoformat(stamp))
+        except (TypeError, ValueError):
+            return None
+
+    def _cover(self, first, last):
+        """
+        Publish a boundary table covering days first..last plus a margin on each
+        side, and return it; None if that would stretch the table past MAX_TABLE_DAYS
+        """
+        first, last = max(first, FIRST_DAY), min(last, LAST_DAY - 1)
+        table_first, boundaries = self._table
+        if table_first is None:
+            # Start the window around today when the request is near it, so one
+            # early outlier does not pull the table away from where the data is
+            today = EPOCH_ORDINAL + int(time.time() // 86400)
+            if max(last, today) - min(first, today) + 2 * TABLE_MARGIN_DAYS <= MAX_TABLE_DAYS:
+                first, last = min(first, today), max(last, today)
+        else:
+            table_last = table_first + len(boundaries) - 2  # Last day with both boundaries
+            if table_first <= first and last <= table_last:
+                return self._table
+            first, last = min(first, table_first), max(last, table_last)
+        if last - first + 2 * TABLE_MARGIN_DAYS > MAX_TABLE_DAYS:
+            return None
+        first = max(first - TABLE_MARGIN_DAYS, FIRST_DAY)
+        last = min(last + TABLE_MARGIN_DAYS, LAST_DAY - 1)
+        boundaries = [self._start_of(day) for day in range(first, last + 2)]
+        # One assignment, so a concurrent reader sees either the old table or the new one
+        self._table = (first, boundaries)
+        return self._table
+
+    def _locate(self, seconds, approximate):
+        """Day containing `seconds`, found from the calendar without the table"""
+        # A day starts within about two days of UTC midnight, so this steps at most a few times
+        day = min(max(approximate, FIRST_DAY), LAST_DAY)
+        while day > FIRST_DAY and self._start_of(day) > seconds:
+            day -= 1
+        while day < LAST_DAY and self._start_of(day + 1) <= seconds:
+            day += 1
+        return day
+
+    def _start_of(self, day):
+        """UTC epoch second at which a day begins, from the calendar"""
+        try:
+            return int(datetime.combine(date.fromordinal(day), self._start_time, tzinfo=self.tz).timestamp())
+        except (OverflowError, ValueError):
+            # Local time at the very edge of the calendar cannot be converted; use UTC there
+            return (day - EPOCH_ORDINAL) * 86400 + self.day_start_hour * 3600
+
+
+_default_bucketer = None
+
+
+def default_day_bucketer():
+    """The process-wide bucketer (MIRROR_TIMEZONE and MIRROR_DAY_START_HOUR, else local midnight)"""
+    global _default_bucketer
+    if _default_bucketer is None:
+        _default_bucketer = DayBucketer(
+            os.environ.get("MIRROR_TIMEZONE") or None,
+            int(os.environ.get("MIRROR_DAY_START_HOUR", "0"))
+        )
+    return _default_bucketer
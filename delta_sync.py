@@ -0,0 +1,429 @@
+# Delta Sync Module - Incremental device-to-device sync of tracker and profile
+# Every device keeps a change log of its own operations, numbered by a per-device
+# sequence. Devices exchange version vectors and then only the operations the
+# other side has not seen, so catching up after a short offline period is cheap.
+
+from datetime import date, datetime
+import json
+import math
+import socket
+import struct
+import zlib
+
+from durable_files import write_atomically
+from triad_tracker import MirrorDashboard
+
+DELTA_FORMAT_VERSION = 1
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+LAST_DAY = date.max.toordinal()
+
+
+class SyncError(Exception):
+    """Raised when a delta cannot be applied (gaps, unknown format, malformed operations, bad transport data)"""
+
+
+class SyncDevice:
+    """
+    One device's view of the shared tracker and profile
+
+    Local changes go through this object (log_* and the ProfileOfX update methods
+    with the same signatures) so they are recorded as operations:
+
+    - {"device", "seq", "clock", "type": "entry", "day", "entry"}
+    - {"device", "seq", "clock", "type": "pillar" | "shadow" | "dream", ...}
+
+    Merging is deterministic: entries within a day are kept in a canonical order,
+    and profile fields are last-writer-wins registers ordered by (Lamport clock,
+    device id). Two devices that have applied the same set of operations hold the
+    same state, whatever order the syncs happened in.
+    """
+
+    def __init__(self, device_id, dashboard):
+        self.device_id = device_id
+        self.dashboard = dashboard
+        self.clock = 0
+        self.logs = {}        # device id -> list of that device's operations, in seq order
+        self._registers = {}  # (kind, name, field) -> (clock, device) of the winning write
+        self._notes = {}      # pillar -> [(clock, device, note)] notes added through sync
+
+    # ------------------------------------------------------------------
+    # Local changes
+    # ------------------------------------------------------------------
+
+    def log_cognitive_effort(self, hours, activity_type="study", notes="", timestamp=None):
+        return self._record_entry(self.dashboard.tracker.build_entry(
+            "cognitive", timestamp or self.dashboard.tracker.bucketer.now(), hours=hours, activity_type=activity_type, notes=notes), timestamp)
+
+    def log_kinetic_effort(self, activity_type="development", progress_made=True, notes="", timestamp=None):
+        return self._record_entry(self.dashboard.tracker.build_entry(
+            "kinetic", timestamp or self.dashboard.tracker.bucketer.now(), activity_type=activity_type, progress_made=progress_made, notes=notes), timestamp)
+
+    def log_moral_effort(self, topic_area="ethics_study", time_spent=0, notes="", timestamp=None):
+        return self._record_entry(self.dashboard.tracker.build_entry(
+            "moral", timestamp or self.dashboard.tracker.bucketer.now(), topic_area=topic_area, time_spent=time_spent, notes=notes), timestamp)
+
+    def update_identity_pillar(self, pillar_name, status, note=""):
+        if pillar_name in self.dashboard.profile.identity_pillars:
+            self._record({"type": "pillar", "name": pillar_name, "status": max(0, min(10, status)), "note": note})
+
+    def trigger_shadow_warning(self, shadow_name):
+        if shadow_name in self.dashboard.profile.shadow_archive:
+            self._record({"type": "shadow", "name": shadow_name, "active": True, "at": datetime.now().isoformat()})
+
+    def clear_shadow_warning(self, shadow_name):
+        if shadow_name in self.dashboard.profile.shadow_archive:
+            self._record({"type": "shadow", "name": shadow_name, "active": False, "at": None})
+
+    def update_sunday_dream_progress(self, dream_name, progress):
+        if dream_name in self.dashboard.profile.sunday_dreams:
+            self._record({"type": "dream", "name": dream_name, "progress": max(0.0, min(1.0, progress))})
+
+    def adopt_existing_history(self):
+        """
+        Record everything already in the tracker as this device's operations
+
+        Use once when enabling sync on a device that has local history, so peers
+        receive it; later changes should go through the SyncDevice methods.
+        Returns the number of entries recorded.
+        """
+        tracker = self.dashboard.tracker
+        count = 0
+        for day in list(tracker.day_index):
+            for entry in tracker.get_day_entries(day):
+                self._append_own({"type": "entry", "day": day, "entry": dict(entry)})
+                count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+
+    def version_vector(self):
+        """{device id: highest sequence number applied}"""
+        return {device: len(ops) for device, ops in self.logs.items()}
+
+    def changes_since(self, vector):
+        """Every operation this device has that a peer with `vector` lacks"""
+        missing = []
+        for device in sorted(self.logs):
+            missing.extend(self.logs[device][vector.get(device, 0):])
+        return missing
+
+    def apply_changes(self, operations):
+        """
+        Apply operations received from a peer; already-known operations are skipped
+        Returns the number of operations that were new.
+
+        The whole batch is checked (shape and sequence gaps) before anything is
+        applied, so a rejected batch raises SyncError and leaves the state untouched.
+        """
+        if not isinstance(operations, list):
+            raise SyncError(f"Operations must be a list, not {type(operations).__name__}")
+        for operation in operations:
+            _check_operation(operation)
+
+        lengths = {}  # device -> log length once the batch is applied
+        new = []
+        for operation in sorted(operations, key=lambda op: (op["device"], op["seq"])):
+            device, seq = operation["device"], operation["seq"]
+            have = lengths.get(device, len(self.logs.get(device, ())))
+            if seq <= have:
+                continue
+            if seq != have + 1:
+                raise SyncError(f"Missing operations from {device}: have {have}, got {seq}")
+            lengths[device] = seq
+            new.append(operation)
+
+        touched_days = set()
+        try:
+            for operation in new:
+                self.logs.setdefault(operation["device"], []).append(operation)
+                self.clock = max(self.clock, operation["clock"])
+                self._apply(operation, touched_days)
+        finally:
+            # Days stay in canonical order even if applying an operation failed
+            self._canonicalize_days(touched_days)
+        return len(new)
+
+    # ------------------------------------------------------------------
+    # Persistence of the change log
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Write the change log (which is also a full replica of the synced state) atomically"""
+        state = {"version": DELTA_FORMAT_VERSION, "device_id": self.device_id, "clock": self.clock, "logs": self.logs}
+        write_atomically(path, (zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8")),))
+
+    @classmethod
+    def load(cls, path, dashboard=None):
+        """Rebuild a device (and its dashboard state) from a saved change log"""
+        if dashboard is None:
+            dashboard = MirrorDashboard()
+        with open(path, "rb") as handle:
+            state = json.loads(zlib.decompress(handle.read()))
+        if state.get("version") != DELTA_FORMAT_VERSION:
+            raise SyncError(f"Unsupported change log version: {state.get('version')}")
+        device = cls(state["device_id"], dashboard)
+        device.apply_changes([op for ops in state["logs"].values() for op in ops])
+        device.clock = max(device.clock, state["clock"])
+        return device
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _record_entry(self, log_entry, timestamp):
+        day = self.dashboard.tracker.day_for(timestamp)
+        self._record({"type": "entry", "day": day, "entry": log_entry})
+        return log_entry
+
+    def _record(self, operation):
+        touched_days = set()
+        self._apply(self._append_own(operation), touched_days)
+        self._canonicalize_days(touched_days)
+
+    def _append_own(self, operation):
+        self.clock += 1
+        log = self.logs.setdefault(self.device_id, [])
+        operation.update({"device": self.device_id, "seq": len(log) + 1, "clock": self.clock})
+        log.append(operation)
+        return operation
+
+    def _apply(self, operation, touched_days):
+        kind = operation["type"]
+        profile = self.dashboard.profile
+        stamp = (operation["clock"], operation["device"])
+
+        if kind == "entry":
+            # Copy so the tracker never shares a dict with the change log
+            self.dashboard.tracker.add_entry(dict(operation["entry"]), operation["day"])
+            touched_days.add(operation["day"])
+        elif kind == "pillar":
+            pillar = profile.identity_pillars.get(operation["name"])
+            if pillar is None:
+                return
+            if self._wins((kind, operation["name"], "status"), stamp):
+                pillar["current_status"] = operation["status"]
+            if operation["note"]:
+                notes = self._notes.setdefault(operation["name"], [])
+                base = pillar["progress_notes"][:len(pillar["progress_notes"]) - len(notes)]
+                notes.append((operation["clock"], operation["device"], operation["note"]))
+                notes.sort()
+                pillar["progress_notes"] = base + [note for _, _, note in notes]
+        elif kind == "shadow":
+            shadow = profile.shadow_archive.get(operation["name"])
+            if shadow is None:
+                return
+            if self._wins((kind, operation["name"], "active"), stamp):
+                shadow["active"] = operation["active"]
+            if operation["active"] and self._wins((kind, operation["name"], "last_triggered"), stamp):
+                shadow["last_triggered"] = operation["at"]
+        elif kind == "dream":
+            dream = profile.sunday_dreams.get(operation["name"])
+            if dream is not None and self._wins((kind, operation["name"], "progress"), stamp):
+                dream["current_progress"] = operation["progress"]
+        else:
+            raise SyncError(f"Unknown operation type: {kind!r}")
+        if kind != "entry":
+            profile._update_profile_health()
+            profile.publish_snapshot(_PROFILE_SECTIONS[kind], operation["name"])
+
+    def _wins(self, register, stamp):
+        current = self._registers.get(register)
+        if current is not None and current >= stamp:
+            return False
+        self._registers[register] = stamp
+        return True
+
+    def _canonicalize_days(self, days):
+        tracker = self.dashboard.tracker
+        for day in days:
+            entries = tracker.daily_logs.get(day)
+            if entries and len(entries) > 1:
+                entries.sort(key=_entry_order)
+                tracker.publish_day(day)
+
+
+_PROFILE_SECTIONS = {"pillar": "identity_pillars", "shadow": "shadow_archive", "dream": "sunday_dreams"}
+
+# Fields (and their types) each operation type carries besides device, seq and clock
+_NUMBER = (int, float)
+_OPERATION_FIELDS = {
+    "entry": {"day": int, "entry": dict},
+    "pillar": {"name": str, "status": _NUMBER, "note": str},
+    "shadow": {"name": str, "active": bool, "at": (str, type(None))},
+    "dream": {"name": str, "progress": _NUMBER},
+}
+# Fields each frequency's entries carry, as TriadTracker.log_* builds them
+_ENTRY_FIELDS = {
+    "cognitive": {"hours": _NUMBER, "activity_type": str, "notes": str},
+    "kinetic": {"activity_type": str, "progress_made": bool, "notes": str},
+    "moral": {"topic_area": str, "time_spent": _NUMBER, "notes": str},
+}
+
+
+def _check_operation(operation):
+    """Raise SyncError unless a received operation is well formed (peers are not trusted)"""
+    if not isinstance(operation, dict):
+        raise SyncError(f"Operation must be an object, not {type(operation).__name__}")
+    kind = operation.get("type")
+    fields = _OPERATION_FIELDS.get(kind) if isinstance(kind, str) else None
+    if fields is None:
+        raise SyncError(f"Unknown operation type: {kind!r}")
+    _check_fields(operation, {"device": str, "seq": int, "clock": int, **fields}, "Operation")
+    if operation["seq"] < 1:
+        raise SyncError(f"Operation seq must be positive, got {operation['seq']}")
+    if kind == "entry":
+        if not 1 <= operation["day"] <= LAST_DAY:
+            raise SyncError(f"Entry day {operation['day']} is outside the supported date range")
+        entry = operation["entry"]
+        _check_fields(entry, {"frequency": str, "timestamp": str}, "Entry")
+        fields = _ENTRY_FIELDS.get(entry["frequency"])
+        if fields is None:
+            raise SyncError(f"Unknown entry frequency: {entry['frequency']!r}")
+        _check_fields(entry, fields, "Entry")
+        try:
+            datetime.fromisoformat(entry["timestamp"])
+        except ValueError:
+            raise SyncError(f"Entry timestamp is not ISO 8601: {entry['timestamp']!r}")
+
+
+def _check_fields(record, fields, what):
+    for field, kind in fields.items():
+        value = record.get(field)
+        # bool is an int subclass, but a flag is never a valid count or number;
+        # JSON also admits NaN and Infinity, which no field can hold
+        if (not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool)
+                or (isinstance(value, float) and not math.isfinite(value))):
+            raise SyncError(f"{what} field {field!r} is missing or malformed: {value!r}")
+
+
+def _entry_order(entry):
+    # Timestamp first; the full content breaks ties so the order never depends on arrival
+    return (str(entry.get("timestamp", "")), json.dumps(entry, sort_keys=True))
+
+
+# ----------------------------------------------------------------------
+# Wire format and transports
+# ----------------------------------------------------------------------
+
+def encode_delta(operations, vector=None):
+    """Compress a batch of operations (plus optionally the sender's version vector)"""
+    payload = {"version": DELTA_FORMAT_VERSION, "vector": vector, "operations": operations}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_delta(data):
+    try:
+        payload = json.loads(zlib.decompress(data))
+    except (zlib.error, ValueError) as error:
+        raise SyncError(f"Corrupt delta: {error}")
+    if not isinstance(payload, dict):
+        raise SyncError(f"Corrupt delta: expected an object, got {type(payload).__name__}")
+    if payload.get("version") != DELTA_FORMAT_VERSION:
+        raise SyncError(f"Unsupported delta version: {payload.get('version')}")
+    vector = payload.get("vector")
+    if vector is not None and not (isinstance(vector, dict) and all(type(count) is int for count in vector.values())):
+        raise SyncError(f"Malformed version vector: {vector!r}")
+    return payload.get("operations", []), vector
+
+
+def sync_devices(first, second):
+    """Two-way in-process sync; returns (applied to first, applied to second)"""
+    to_first = first.apply_changes(decode_delta(encode_delta(second.changes_since(first.version_vector())))[0])
+    to_second = second.apply_changes(decode_delta(encode_delta(first.changes_since(second.version_vector())))[0])
+    return to_first, to_second
+
+
+def write_vector_file(device, path):
+    """Publish a device's version vector so a peer can prepare a delta for it"""
+    with open(path, "w") as handle:
+        json.dump(device.version_vector(), handle)
+
+
+def write_delta_file(device, path, peer_vector_path=None):
+    """
+    Write the operations a peer lacks (per its vector file) to `path`
+    Without a vector file the full change log is written. Returns bytes written.
+    """
+    vector = {}
+    if peer_vector_path:
+        with open(peer_vector_path) as handle:
+            vector = json.load(handle)
+    data = encode_delta(device.changes_since(vector), device.version_vector())
+    with open(path, "wb") as handle:
+        handle.write(data)
+    return len(data)
+
+
+def read_delta_file(device, path):
+    """Apply a delta file written by a peer; returns the number of new operations"""
+    with open(path, "rb") as handle:
+        operations, _ = decode_delta(handle.read())
+    return device.apply_changes(operations)
+
+
+def serve_sync(device, host="127.0.0.1", port=8766, once=False):
+    """
+    Accept sync sessions on a TCP socket (blocking)
+
+    Session: client sends its vector; server replies with its vector and the
+    operations the client lacks; client sends the operations the server lacks;
+    server replies with the number it applied. A session that sends a malformed
+    or gapped batch is dropped without applying any of it; the server keeps serving.
+    """
+    with socket.create_server((host, port)) as server:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                try:
+                    _, client_vector = decode_delta(_recv_frame(connection))
+                    _send_frame(connection, encode_delta(device.changes_since(client_vector or {}), device.version_vector()))
+                    operations, _ = decode_delta(_recv_frame(connection))
+                    applied = device.apply_changes(operations)
+                    _send_frame(connection, encode_delta([], {"applied": applied}))
+                except (SyncError, ConnectionError, OSError):
+                    pass
+            if once:
+                return
+
+
+def sync_over_socket(device, host="127.0.0.1", port=8766, timeout=30):
+    """
+    Run one sync session against serve_sync()
+    Returns (operations received, operations the server applied, bytes transferred)
+    """
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        transferred = _send_frame(connection, encode_delta([], device.version_vector()))
+        reply = _recv_frame(connection)
+        transferred += len(reply)
+        operations, server_vector = decode_delta(reply)
+        received = device.apply_changes(operations)
+        transferred += _send_frame(connection, encode_delta(device.changes_since(server_vector or {})))
+        ack = _recv_frame(connection)
+        transferred += len(ack)
+        _, result = decode_delta(ack)
+    return received, (result or {}).get("applied", 0), transferred
+
+
+def _send_frame(connection, data):
+    connection.sendall(FRAME_HEADER.pack(len(data)) + data)
+    return len(data) + FRAME_HEADER.size
+
+
+def _recv_frame(connection):
+    (length,) = FRAME_HEADER.unpack(_recv_exact(connection, FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise SyncError(f"Frame of {length} bytes exceeds the limit")
+    return _recv_exact(connection, length)
+
+
+def _recv_exact(connection, size):
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = connection.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("Peer closed the connection mid-frame")
+        chunks += chunk
+    return bytes(chunks)
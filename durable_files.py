@@ -0,0 +1,42 @@
+# Durable Files Module - Shared helpers for the binary file writers
+# Snapshots, columnar exports and sync change logs are all replaced atomically
+# (temporary file, fsync, rename, directory fsync) and lay out 8-byte aligned sections.
+
+import os
+
+
+def align(offset, boundary=8):
+    """Round an offset up to the next multiple of `boundary`"""
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def write_atomically(path, chunks):
+    """
+    Replace `path` with the concatenation of `chunks` (bytes-like objects)
+    Readers see either the old file or the complete new one, and the new one is
+    on disk (data and rename) when this returns. Returns the number of bytes written.
+    """
+    temp_path = f"{path}.tmp"
+    written = 0
+    with open(temp_path, "wb") as handle:
+        for chunk in chunks:
+            written += handle.write(chunk)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+    fsync_directory(path)
+    return written
+
+
+def fsync_directory(path):
+    """Make a rename of `path` durable by fsyncing its directory (skipped where unsupported)"""
+    try:
+        descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,51 @@
+# Frozen Views Module - Read-only building blocks for published snapshots
+# Snapshots handed to readers (reports, the HTTP service, other threads) are built
+# from these, so they can be shared between versions instead of deep-copied.
+
+
+class FrozenDict(dict):
+    """
+    A dict that refuses mutation after construction
+
+    Being a real dict subclass, it serializes with json and compares equal to plain
+    dicts, so existing readers keep working; writers raise TypeError.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+def freeze(value):
+    """
+    Return a read-only copy of nested dicts/lists (FrozenDict / tuple)
+
+    Values that are already frozen are returned as-is, which is what lets a new
+    snapshot share every unchanged part of the previous one.
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
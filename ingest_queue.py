@@ -0,0 +1,391 @@
+# Ingest Queue Module - Group-commit write-behind queue in front of TriadTracker
+# Bursts of log_* calls (commit hooks, timers, the HTTP service) are coalesced
+# into batches that share one journal write and one fsync.
+
+from collections import deque
+from datetime import date
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends and rotation are not serialized
+    fcntl = None
+
+from tracker_archive import to_ordinal
+from triad_tracker import TriadTracker
+
+
+class IngestError(Exception):
+    """Raised when the journal cannot be written or the queue is closed"""
+
+
+class GroupCommitQueue:
+    """
+    Write-behind ingest queue with group commit
+
+    - log_* calls build the entry, queue it and return immediately.
+    - A writer thread collects queued entries until the batch is full (max_batch)
+      or the oldest entry has waited max_latency seconds, appends the whole batch
+      to the journal with a single write + fsync, and only then applies it to the
+      tracker. An entry is durable once its batch is applied.
+    - Readers going through the queue (get_day_entries, calculate_daily_scores)
+      see committed entries plus the pending overlay, never a half-applied batch.
+    - flush() waits until everything submitted so far is durable; when_durable()
+      is the non-blocking form for event loops. close() flushes and stops the writer.
+
+    Journal lines are {"day": <day ordinal>, "entry": {...}}; replay_journal()
+    rebuilds tracker state from them after a restart.
+    """
+
+    def __init__(self, tracker, journal_path, max_batch=1024, max_latency=0.005, fsync=True):
+        """
+        - tracker: TriadTracker that committed entries are applied to
+        - journal_path: Append-only journal file (created if missing)
+        - max_batch: Largest number of entries per group commit
+        - max_latency: Longest time (seconds) an entry waits for its batch to fill
+        - fsync: fsync the journal after each batch (disable only for tests/benchmarks)
+        """
+        self.tracker = tracker
+        self.journal_path = journal_path
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.fsync = fsync
+        self.error = None
+        self.batches_committed = 0
+
+        self._journal = open(journal_path, "ab")
+        self._lock = threading.Lock()
+        self._work_ready = threading.Condition(self._lock)
+        self._committed = threading.Condition(self._lock)
+        self._queue = []            # (day, entry) not yet written to the journal
+        self._pending_by_day = {}   # day -> entries submitted but not yet applied
+        self._first_queued_at = None
+        self._submitted = 0
+        self._durable = 0
+        self._flush_requested = False
+        self._closed = False
+        self._waiters = deque()     # (submitted count, callback) in submission order
+
+        self._writer = threading.Thread(target=self._run, name="mirror-group-commit", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Ingest (same signatures as TriadTracker.log_*)
+    # ------------------------------------------------------------------
+
+    def log_cognitive_effort(self, hours, activity_type="study", notes="", timestamp=None):
+        return self.submit(TriadTracker.build_entry(
+            "cognitive", timestamp or self.tracker.bucketer.now(), hours=hours, activity_type=activity_type, notes=notes), timestamp)
+
+    def log_kinetic_effort(self, activity_type="development", progress_made=True, notes="", timestamp=None):
+        return self.submit(TriadTracker.build_entry(
+            "kinetic", timestamp or self.tracker.bucketer.now(), activity_type=activity_type, progress_made=progress_made, notes=notes), timestamp)
+
+    def log_moral_effort(self, topic_area="ethics_study", time_spent=0, notes="", timestamp=None):
+        return self.submit(TriadTracker.build_entry(
+            "moral", timestamp or self.tracker.bucketer.now(), topic_area=topic_area, time_spent=time_spent, notes=notes), timestamp)
+
+    def submit(self, log_entry, timestamp=None):
+        """Queue a built entry for the next group commit; returns the entry"""
+        # The day is fixed at submit time, exactly as a direct log_* call would file it
+        day = self.tracker.day_for(timestamp)
+        with self._lock:
+            if self._closed or self.error is not None:
+                raise IngestError(self.error or "Ingest queue is closed")
+            if not self._queue:
+                self._first_queued_at = time.monotonic()
+            self._queue.append((day, log_entry))
+            self._pending_by_day.setdefault(day, []).append(log_entry)
+            self._submitted += 1
+            if len(self._queue) == 1 or len(self._queue) >= self.max_batch:
+                self._work_ready.notify()
+        return log_entry
+
+    def flush(self, timeout=None):
+        """Block until every entry submitted so far is durable; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            target = self._submitted
+            if self._durable < target:
+                self._flush_requested = True
+                self._work_ready.notify()
+            while self._durable < target:
+                if self.error is not None:
+                    raise IngestError(self.error)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._committed.wait(remaining)
+        return True
+
+    def when_durable(self, callback):
+        """
+        Call callback(error) once every entry submitted so far is durable
+
+        error is None on success, or the journal error message if the batch failed.
+        The callback runs on the writer thread (or right away if nothing is
+        pending), so event loops should hand it back with call_soon_threadsafe.
+        """
+        with self._lock:
+            if self.error is None and self._durable < self._submitted:
+                self._waiters.append((self._submitted, callback))
+                return
+            error = self.error
+        callback(error)
+
+    def close(self):
+        """Flush outstanding entries, stop the writer and close the journal"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._work_ready.notify()
+        self._writer.join()
+        self._journal.close()
+        if self.error is not None:
+            raise IngestError(self.error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Consistent reads (committed state + pending overlay)
+    # ------------------------------------------------------------------
+
+    def pending_count(self):
+        with self._lock:
+            return self._submitted - self._durable
+
+    def get_day_entries(self, target_date=None):
+        """Entries for a date including ones still waiting for their group commit (None if none)"""
+        with self._lock:
+            committed = self.tracker.get_day_entries(target_date)
+            day = self.tracker.current_day if target_date is None else to_ordinal(target_date)
+            pending = self._pending_by_day.get(day)
+            if not pending:
+                return committed
+            return (list(committed) if committed else []) + pending
+
+    def active_days(self, start=None, end=None):
+        """TriadTracker.active_days, including days that so far only have pending entries"""
+        with self._lock:
+            days = set(self.tracker.active_day_ordinals(start, end))
+            low = None if start is None else to_ordinal(start)
+            high = None if end is None else to_ordinal(end)
+            days.update(day for day in self._pending_by_day
+                        if (low is None or day >= low) and (high is None or day <= high))
+        return [date.fromordinal(day).isoformat() for day in sorted(days)]
+
+    def calculate_daily_scores(self, target_date=None):
+        """calculate_daily_scores over committed plus pending entries"""
+        entries = self.get_day_entries(target_date)
+        if entries is None:
+            return {"cognitive": 0, "kinetic": 0, "moral": 0}
+        return self.tracker.scoring_rules.current().score_entries(entries)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._work_ready.wait()
+                if not self._queue:
+                    return  # Closed and fully drained
+
+                # Give the batch up to max_latency (from its first entry) to fill
+                deadline = self._first_queued_at + self.max_latency
+                while len(self._queue) < self.max_batch and not (self._closed or self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._work_ready.wait(remaining)
+
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+                self._first_queued_at = time.monotonic() if self._queue else None
+                if not self._queue:
+                    self._flush_requested = False
+
+            # Journal I/O happens outside the lock so submitters are never blocked on disk
+            try:
+                self._write_batch(batch)
+            except (OSError, TypeError, ValueError) as error:
+                self._fail(f"Journal write failed: {error}")
+                return
+
+            with self._lock:
+                self.tracker.add_entries(batch)
+                applied = {}
+                for day, _ in batch:
+                    applied[day] = applied.get(day, 0) + 1
+                for day, count in applied.items():
+                    pending = self._pending_by_day[day]
+                    del pending[:count]
+                    if not pending:
+                        del self._pending_by_day[day]
+                self._durable += len(batch)
+                self.batches_committed += 1
+                self._committed.notify_all()
+                ready = []
+                while self._waiters and self._waiters[0][0] <= self._durable:
+                    ready.append(self._waiters.popleft()[1])
+            for callback in ready:
+                callback(None)
+
+    def _fail(self, message):
+        """
+        Stop accepting entries after a journal error
+
+        Nothing that was not journaled is applied: the failed batch and everything
+        queued behind it are dropped from the queue and the pending overlay, and
+        flush(), when_durable() and later submits report the error.
+        """
+        with self._lock:
+            self.error = message
+            self._queue.clear()
+            self._pending_by_day.clear()
+            self._first_queued_at = None
+            self._flush_requested = False
+            self._committed.notify_all()
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for _, callback in waiters:
+            callback(message)
+
+    def _write_batch(self, batch):
+        self._journal.write(_encode_records(batch))
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+
+def append_journal(path, records, fsync=True):
+    """
+    Append (day, entry) records to a journal with one write (+ fsync)
+
+    The single-shot path for short-lived processes such as `main.py log`; the
+    records are picked up by replay_journal() like any group commit. The append
+    holds a lock on the file, and retries if rotate_journal() moved the file
+    aside between opening and locking it.
+    """
+    data = _encode_records(records)
+    while True:
+        with open(path, "ab") as handle:
+            _lock_file(handle)
+            if not _is_current(handle, path):
+                continue
+            handle.write(data)
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+            return len(records)
+
+
+def replay_journal(path, tracker):
+    """
+    Apply every committed journal entry to a tracker; returns the number replayed
+
+    A torn final line (a crash mid-write, before its fsync completed) is ignored.
+    """
+    if not os.path.exists(path):
+        return 0
+    records = []
+    with open(path, "rb") as handle:
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            records.append((record["day"], record["entry"]))
+    return tracker.add_entries(records)
+
+
+def journal_segments(path):
+    """Rotated segments of a journal (<path>.<seq>) as sorted (seq, segment path) pairs"""
+    directory, name = os.path.split(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        return []
+    prefix = name + "."
+    segments = []
+    for candidate in os.listdir(directory):
+        suffix = candidate[len(prefix):]
+        if candidate.startswith(prefix) and suffix.isdigit():
+            segments.append((int(suffix), os.path.join(directory, candidate)))
+    return sorted(segments)
+
+
+def rotate_journal(path, applied_seq=0):
+    """
+    Move the live journal aside as the next numbered segment, so later appends
+    start a fresh file; returns the segments above applied_seq, oldest first
+
+    Segments at or below applied_seq are already reflected in the caller's state
+    (e.g. a snapshot saved just before a crash) and are removed instead.
+    """
+    segments = []
+    for seq, segment in journal_segments(path):
+        if seq <= applied_seq:
+            os.remove(segment)
+        else:
+            segments.append((seq, segment))
+    if os.path.exists(path) and os.path.getsize(path):
+        seq = max([applied_seq] + [seq for seq, _ in segments]) + 1
+        segment = f"{path}.{seq}"
+        os.replace(path, segment)
+        # Wait out any append that locked the file before it was moved
+        with open(segment, "ab") as handle:
+            _lock_file(handle)
+        segments.append((seq, segment))
+    return segments
+
+
+def replay_segments(path, tracker):
+    """
+    Rotate a journal and replay every segment the tracker has not applied yet;
+    returns the number of entries replayed
+
+    tracker.journal_seq records the last segment applied. Once that state is
+    durable (saved in a snapshot), remove_segments() deletes the replayed
+    segments; entries appended meanwhile stay in the live journal.
+    """
+    replayed = 0
+    for seq, segment in rotate_journal(path, tracker.journal_seq):
+        replayed += replay_journal(segment, tracker)
+        tracker.journal_seq = seq
+    return replayed
+
+
+def remove_segments(path, applied_seq):
+    """Delete rotated segments up to applied_seq, once state covering them is durable"""
+    for seq, segment in journal_segments(path):
+        if seq <= applied_seq:
+            os.remove(segment)
+
+
+def _lock_file(handle):
+    # Released when the handle is closed
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _is_current(handle, path):
+    try:
+        return os.fstat(handle.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _encode_records(records):
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    return "".join(encode({"day": day, "entry": entry}) + "\n" for day, entry in records).encode("utf-8")
@@ -0,0 +1,262 @@
+# Instrumentation Module - Hot-path timing hooks and metrics export
+# Wraps the tracker, mirror system, profile and report methods with timers only
+# while instrumentation is enabled; when disabled the original methods are
+# restored, so there is no per-call cost at all.
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import functools
+import json
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets: 1µs .. 10s
+DEFAULT_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Methods that are timed, as (module, class, method)
+INSTRUMENTED_METHODS = [
+    ("triad_tracker", "TriadTracker", "log_cognitive_effort"),
+    ("triad_tracker", "TriadTracker", "log_kinetic_effort"),
+    ("triad_tracker", "TriadTracker", "log_moral_effort"),
+    ("triad_tracker", "TriadTracker", "calculate_daily_scores"),
+    ("triad_tracker", "TriadTracker", "get_weekly_trends"),
+    ("triad_tracker", "TriadTracker", "get_weekly_average"),
+    ("mirror_system", "MirrorSystem", "calculate_spiky_excellence"),
+    ("mirror_system", "MirrorSystem", "generate_daily_audit"),
+    ("mirror_system", "MirrorSystem", "check_first_principles_thinking"),
+    ("mirror_system", "MirrorSystem", "quaspace_reality_check"),
+    ("mirror_system", "MirrorSystem", "shadow_archive_warning"),
+    ("profile_of_x", "ProfileOfX", "get_profile_summary"),
+    ("profile_of_x", "ProfileOfX", "get_risk_assessment"),
+    ("profile_of_x", "ProfileOfX", "get_priority_actions"),
+    ("triad_tracker", "MirrorDashboard", "generate_daily_report")
+]
+
+# The top-level call inside generate_daily_report that produces each report section
+REPORT_SECTIONS = {
+    "calculate_daily_scores": "triad_scores",
+    "generate_daily_audit": "audit_result",
+    "check_first_principles_thinking": "first_principles_feedback",
+    "quaspace_reality_check": "quaspace_status",
+    "shadow_archive_warning": "shadow_warnings",
+    "get_weekly_average": "weekly_average",
+    "get_priority_actions": "priority_actions",
+    "get_risk_assessment": "risk_assessment"
+}
+
+REPORT_METHOD = "MirrorDashboard.generate_daily_report"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative counts are computed on export)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is the +Inf overflow
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Approximate quantile: the upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {_format_bound(bound): count for bound, count in zip(self.buckets + (float("inf"),), self.counts)}
+        }
+
+
+class MetricsRegistry:
+    """
+    Collects call latencies, report section latencies and error counters
+
+    - mirror_call_seconds{method="Class.method"}: every instrumented call
+    - mirror_report_section_seconds{section="..."}: each section of generate_daily_report
+    - mirror_call_errors_total{method="Class.method"}: calls that raised
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.calls = {}
+        self.sections = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def observe_call(self, method, seconds):
+        with self._lock:
+            histogram = self.calls.get(method)
+            if histogram is None:
+                histogram = self.calls[method] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_section(self, section, seconds):
+        with self._lock:
+            histogram = self.sections.get(section)
+            if histogram is None:
+                histogram = self.sections[section] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count_error(self, method):
+        with self._lock:
+            self.errors[method] = self.errors.get(method, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.sections.clear()
+            self.errors.clear()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "calls": {name: histogram.to_dict() for name, histogram in sorted(self.calls.items())},
+                "report_sections": {name: histogram.to_dict() for name, histogram in sorted(self.sections.items())},
+                "errors": dict(sorted(self.errors.items()))
+            }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def dump_json(self, path):
+        with open(path, "w") as handle:
+            handle.write(self.to_json())
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            _prometheus_histogram(lines, "mirror_call_seconds", "Time spent in instrumented Mirror calls",
+                                  "method", self.calls)
+            _prometheus_histogram(lines, "mirror_report_section_seconds", "Time spent building each daily report section",
+                                  "section", self.sections)
+            lines.append("# HELP mirror_call_errors_total Instrumented calls that raised an exception")
+            lines.append("# TYPE mirror_call_errors_total counter")
+            for method, count in sorted(self.errors.items()):
+                lines.append(f'mirror_call_errors_total{{method="{method}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# A process-wide registry; enable() uses it unless given another
+metrics = MetricsRegistry()
+
+_originals = {}
+_active_registry = None
+_report_state = threading.local()
+
+
+def enable(registry=None):
+    """
+    Start timing the hot-path methods; returns the registry being filled
+
+    Calling enable() again swaps the registry without double-wrapping.
+    """
+    global _active_registry
+    _active_registry = registry if registry is not None else metrics
+    if not _originals:
+        for module_name, class_name, method_name in INSTRUMENTED_METHODS:
+            owner = getattr(__import__(module_name), class_name)
+            original = owner.__dict__[method_name]
+            _originals[(owner, method_name)] = original
+            setattr(owner, method_name, _wrap(original, f"{class_name}.{method_name}", method_name))
+    return _active_registry
+
+
+def disable():
+    """Restore the original, uninstrumented methods"""
+    global _active_registry
+    for (owner, method_name), original in _originals.items():
+        setattr(owner, method_name, original)
+    _originals.clear()
+    _active_registry = None
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def active_registry():
+    """The registry the timers are filling, or None while instrumentation is disabled"""
+    return _active_registry
+
+
+@contextmanager
+def instrumented(registry=None):
+    """Enable instrumentation for the duration of a with-block"""
+    active = enable(registry)
+    try:
+        yield active
+    finally:
+        disable()
+
+
+def _wrap(function, metric_name, method_name):
+    section = REPORT_SECTIONS.get(method_name)
+    is_report = metric_name == REPORT_METHOD
+    clock = time.perf_counter
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        registry = _active_registry
+        if registry is None:
+            # A bound method taken while enabled, called after disable()
+            return function(*args, **kwargs)
+        # Only the outermost call inside a report counts as a section; the
+        # calculate_daily_scores calls made by get_weekly_average do not.
+        in_report = getattr(_report_state, "depth", None)
+        if is_report:
+            _report_state.depth = 0
+        elif in_report is not None:
+            _report_state.depth = in_report + 1
+
+        started = clock()
+        try:
+            return function(*args, **kwargs)
+        except Exception:
+            registry.count_error(metric_name)
+            raise
+        finally:
+            elapsed = clock() - started
+            registry.observe_call(metric_name, elapsed)
+            if section and in_report == 0:
+                registry.observe_section(section, elapsed)
+            _report_state.depth = in_report
+
+    return timed
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _prometheus_histogram(lines, name, help_text, label, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label}="{key}",le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.sum}')
+        lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
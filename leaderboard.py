@@ -0,0 +1,308 @@
+# Leaderboard Module - Cross-user rankings and percentiles per frequency and window
+# Fed incrementally from per-user daily scores, so "where does this user rank on
+# kinetic this month" is a bisect instead of re-scoring every user's tracker.
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+import heapq
+import math
+
+from day_bucketing import default_day_bucketer
+from tracker_archive import to_ordinal
+
+FREQUENCIES = ("cognitive", "kinetic", "moral")
+WINDOWS = ("day", "week", "month", "year")
+DEFAULT_RELATIVE_ACCURACY = 0.01
+SCORE_DIGITS = 9  # Totals are rounded so repeated updates do not drift apart on ties
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch-style)
+
+    Values fall into logarithmic buckets, so any quantile is estimated within
+    relative_accuracy of a real value. Counts can be decremented when a user's
+    total changes, and two sketches with the same accuracy merge by adding
+    bucket counts. Memory is proportional to the spread of values, not to n.
+    """
+
+    MIN_VALUE = 1e-9  # Values at or below this (zero scores) share one bucket
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}   # bucket index -> count
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        if value <= self.MIN_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            remaining = self.buckets.get(index, 0) + count
+            if remaining:
+                self.buckets[index] = remaining
+            else:
+                del self.buckets[index]
+        self.count += count
+
+    def remove(self, value):
+        self.add(value, -1)
+
+    def merge(self, other):
+        """Fold another sketch (same accuracy) into this one; returns self"""
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Estimated value at quantile q (0..1); None for an empty sketch"""
+        if self.count <= 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class WindowBoard:
+    """
+    Totals of one frequency over one period (e.g. kinetic, month 2026-10)
+
+    Users are kept in a sorted list of (total, user) and a parallel sorted list of
+    totals, so rank, percentile and top-K are bisects and slices; an update moves
+    one user. A QuantileSketch over the same totals supports merged percentiles
+    across periods.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.totals = {}    # user -> total
+        self._ranked = []   # sorted (total, user)
+        self._scores = []   # sorted totals
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def __len__(self):
+        return len(self.totals)
+
+    def add(self, user_id, delta):
+        previous = self.totals.get(user_id)
+        total = round((previous or 0) + delta, SCORE_DIGITS)
+        if previous is not None:
+            if total == previous:
+                return
+            del self._ranked[bisect_left(self._ranked, (previous, user_id))]
+            del self._scores[bisect_left(self._scores, previous)]
+            self.sketch.remove(previous)
+        self.totals[user_id] = total
+        insort(self._ranked, (total, user_id))
+        insort(self._scores, total)
+        self.sketch.add(total)
+
+    def rank(self, user_id):
+        """1-based rank (users with equal totals share a rank), or None if the user has no total"""
+        total = self.totals.get(user_id)
+        if total is None:
+            return None
+        return len(self._scores) - bisect_right(self._scores, total) + 1
+
+    def percentile(self, user_id):
+        """Share of the cohort (0-100) with a total at or below this user's, or None"""
+        total = self.totals.get(user_id)
+        if total is None:
+            return None
+        return 100.0 * bisect_right(self._scores, total) / len(self._scores)
+
+    def top(self, k):
+        """The k highest (user, total) pairs, best first"""
+        return [(user_id, total) for total, user_id in reversed(self._ranked[-k:])] if k > 0 else []
+
+
+class Leaderboard:
+    """
+    Incrementally maintained cross-user leaderboard
+
+    Feed it with update_user_day() (or update_from_tracker()) whenever a user's
+    daily scores change; every (frequency, window, period) board is adjusted by
+    the change in that day's score. Windows are "day", "week" (ISO, Monday
+    first), "month" and "year"; queries take any date in the period. Queries
+    without a date use today according to `bucketer` (the same DayBucketer the
+    trackers file days with; defaults to the process-wide one).
+    """
+
+    def __init__(self, frequencies=FREQUENCIES, windows=WINDOWS, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, bucketer=None):
+        unknown = set(windows) - set(WINDOWS)
+        if unknown:
+            raise ValueError(f"Unknown leaderboard windows: {sorted(unknown)}")
+        self.frequencies = tuple(frequencies)
+        self.windows = tuple(windows)
+        self.relative_accuracy = relative_accuracy
+        self.bucketer = bucketer if bucketer is not None else default_day_bucketer()
+        self.boards = {}      # (frequency, window, period) -> WindowBoard
+        self._user_days = {}  # user -> {day ordinal: {frequency: score}}
+        self._pruned_before = 0  # Periods ending before this ordinal were pruned (see prune)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update_user_day(self, user_id, target_date, scores):
+        """
+        Record a user's scores for one day (replacing any earlier scores for it)
+        - scores: {frequency: score}, e.g. the result of calculate_daily_scores
+
+        Boards of pruned periods are not recreated, so a pruned day only updates
+        the windows whose periods are still open.
+        """
+        day = to_ordinal(target_date)
+        windows = self.windows
+        if day < self._pruned_before:
+            windows = [window for window in windows if period_end(window, period_of(window, day)) >= self._pruned_before]
+            if not windows:
+                return
+        user_days = self._user_days.setdefault(user_id, {})
+        previous = user_days.get(day)
+        user_days[day] = {frequency: scores.get(frequency, 0) for frequency in self.frequencies}
+        for frequency in self.frequencies:
+            delta = user_days[day][frequency] - (previous[frequency] if previous else 0)
+            if previous is not None and delta == 0:
+                continue
+            for window in windows:
+                key = (frequency, window, period_of(window, day))
+                board = self.boards.get(key)
+                if board is None:
+                    board = self.boards[key] = WindowBoard(self.relative_accuracy)
+                board.add(user_id, delta)
+
+    def update_from_tracker(self, user_id, tracker, target_date=None):
+        """Score one day of a user's tracker (default: its current day) and record it"""
+        day = tracker.current_day if target_date is None else to_ordinal(target_date)
+        self.update_user_day(user_id, day, tracker.calculate_daily_scores(day))
+
+    def prune(self, before_date):
+        """
+        Forget boards whose periods end before a date
+
+        A day's scores are kept until every period containing it has been pruned
+        (e.g. until its year ends, with the "year" window), since a later update
+        to the day must adjust the boards that are left by the change in its score.
+        """
+        cutoff = self._pruned_before = max(self._pruned_before, to_ordinal(before_date))
+        for user_days in self._user_days.values():
+            for day in [day for day in user_days if day < cutoff and self._last_period_end(day) < cutoff]:
+                del user_days[day]
+        for key in [key for key in self.boards if period_end(key[1], key[2]) < cutoff]:
+            del self.boards[key]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def rank(self, user_id, frequency, window="month", target_date=None):
+        """(rank, cohort size) of a user in the period containing target_date (default today), or None"""
+        board = self._board(frequency, window, target_date)
+        rank = board.rank(user_id) if board else None
+        return None if rank is None else (rank, len(board))
+
+    def percentile(self, user_id, frequency, window="month", target_date=None):
+        """Share of the cohort (0-100) at or below the user's total, or None"""
+        board = self._board(frequency, window, target_date)
+        return board.percentile(user_id) if board else None
+
+    def top(self, frequency, window="month", target_date=None, k=10):
+        """The k best (user, total) pairs for the period"""
+        board = self._board(frequency, window, target_date)
+        return board.top(k) if board else []
+
+    def quantile(self, q, frequency, window="month", target_date=None):
+        """Estimated cohort total at quantile q (0..1) for the period, from its sketch"""
+        board = self._board(frequency, window, target_date)
+        return board.sketch.quantile(q) if board else None
+
+    def merged_sketch(self, frequency, window, start, end):
+        """One sketch over every period of `window` between two dates (e.g. all weeks of a term)"""
+        sketch = QuantileSketch(self.relative_accuracy)
+        first, last = period_of(window, to_ordinal(start)), period_of(window, to_ordinal(end))
+        for (board_frequency, board_window, period), board in self.boards.items():
+            if board_frequency == frequency and board_window == window and first <= period <= last:
+                sketch.merge(board.sketch)
+        return sketch
+
+    def top_over(self, frequency, window, periods_dates, k=10):
+        """Best k single-period totals across several periods, as (user, period start, total)"""
+        candidates = []
+        for target_date in periods_dates:
+            day = to_ordinal(target_date)
+            board = self.boards.get((frequency, window, period_of(window, day)))
+            if board:
+                start = date.fromordinal(period_start(window, period_of(window, day))).isoformat()
+                candidates.extend((total, user_id, start) for user_id, total in board.top(k))
+        return [(user_id, start, total) for total, user_id, start in heapq.nlargest(k, candidates)]
+
+    def cohort_summary(self, user_id, frequency, window="month", target_date=None, k=3):
+        """Everything the cohort panel shows, or None if the user has no score in the period"""
+        board = self._board(frequency, window, target_date)
+        if board is None or user_id not in board.totals:
+            return None
+        return {
+            "frequency": frequency,
+            "window": window,
+            "total": board.totals[user_id],
+            "rank": board.rank(user_id),
+            "cohort_size": len(board),
+            "percentile": board.percentile(user_id),
+            "median": board.sketch.quantile(0.5),
+            "p90": board.sketch.quantile(0.9),
+            "top": board.top(k)
+        }
+
+    def _last_period_end(self, day):
+        return max(period_end(window, period_of(window, day)) for window in self.windows)
+
+    def _board(self, frequency, window, target_date):
+        day = self.bucketer.today() if target_date is None else to_ordinal(target_date)
+        return self.boards.get((frequency, window, period_of(window, day)))
+
+
+def period_of(window, day):
+    """The period number of a day ordinal within a window"""
+    if window == "day":
+        return day
+    if window == "week":
+        return (day - 1) // 7  # Ordinal 1 (0001-01-01) is a Monday
+    moment = date.fromordinal(day)
+    if window == "month":
+        return moment.year * 12 + moment.month - 1
+    if window == "year":
+        return moment.year
+    raise ValueError(f"Unknown leaderboard window: {window!r}")
+
+
+def period_start(window, period):
+    """First day ordinal of a period"""
+    if window == "day":
+        return period
+    if window == "week":
+        return period * 7 + 1
+    if window == "month":
+        return date(period // 12, period % 12 + 1, 1).toordinal()
+    return date(period, 1, 1).toordinal()
+
+
+def period_end(window, period):
+    """Last day ordinal of a period"""
+    if window == "year":
+        return date(period, 12, 31).toordinal()
+    return period_start(window, period + 1) - 1
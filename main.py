@@ -1,19 +1,38 @@
 #!/usr/bin/env python3
 # The Mirror (Systems Architect Edition)
 # Main Application File
+#
+# Modules are imported where they are first needed: the menu appears before the
+# dashboard, snapshot and journal are loaded, and `main.py log ...` appends one
+# entry to the journal without building a dashboard at all.
 
-import json
+import os
+import sys
 from datetime import datetime
-from mirror_system import MirrorSystem
-from profile_of_x import ProfileOfX
-from triad_tracker import TriadTracker, MirrorDashboard
+
+DEFAULT_STATE_DIR = os.environ.get("MIRROR_STATE_DIR", os.path.join(os.path.expanduser("~"), ".mirror"))
+SNAPSHOT_FILE = "mirror.snapshot"
+JOURNAL_FILE = "mirror.journal"
 
 class MirrorApp:
     """
     The Mirror Application - Main Interface
     """
-    def __init__(self):
-        self.dashboard = MirrorDashboard()
+    def __init__(self, snapshot_path=None, journal_path=None, leaderboard=None, user_id="X"):
+        """
+        - snapshot_path: Optional snapshot file; state is restored from it when the
+          dashboard is first used and written back to it on exit
+        - journal_path: Optional journal of entries logged from the command line;
+          rotated and replayed on first use, and the replayed part deleted once a
+          snapshot has captured it
+        - leaderboard: Optional shared Leaderboard; the audit then shows where
+          user_id ranks in the cohort
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.leaderboard = leaderboard
+        self.user_id = user_id
+        self._dashboard = None
         self.system_prompt = """
         You are The Mirror, the strategic auditor for the Systems Architect.
         
@@ -33,12 +52,48 @@ class MirrorApp:
         
         Goal: Ensure X masters the Foundational Layer by 2026. No excuses.
         """
-        
-        print("Initializing The Mirror - Systems Architect Edition")
-        print("=" * 60)
-        print("Potential is not a gift; it is a massive structural debt.")
-        print("Today is " + datetime.now().strftime("%Y-%m-%d"))
-        print("=" * 60)
+    
+    @classmethod
+    def from_state_dir(cls, state_dir):
+        """An app persisting to <state_dir>/mirror.snapshot and <state_dir>/mirror.journal"""
+        return cls(os.path.join(state_dir, SNAPSHOT_FILE), os.path.join(state_dir, JOURNAL_FILE))
+    
+    @property
+    def dashboard(self):
+        """The dashboard, built and restored from the snapshot and journal on first access"""
+        if self._dashboard is None:
+            from triad_tracker import MirrorDashboard
+            dashboard = MirrorDashboard()
+            if self.snapshot_path and os.path.exists(self.snapshot_path):
+                from mirror_snapshot import load_snapshot, SnapshotError
+                try:
+                    load_snapshot(self.snapshot_path, dashboard)
+                    # A snapshot from an earlier day must not keep filing entries under that day
+                    dashboard.tracker.reset_for_new_day()
+                except SnapshotError as error:
+                    print(f"Could not restore snapshot ({error}); starting fresh.")
+            if self.journal_path:
+                from ingest_queue import replay_segments
+                replay_segments(self.journal_path, dashboard.tracker)
+            self._dashboard = dashboard
+        return self._dashboard
+    
+    def save_state(self):
+        """
+        Write the snapshot (if the dashboard was used), then delete the journal
+        segments it now covers
+
+        Entries logged while the app was open are still in the live journal and
+        are replayed next time. The snapshot records the last segment it holds,
+        so a crash before the segments are deleted does not replay them twice.
+        """
+        if self._dashboard is None or not self.snapshot_path:
+            return
+        from mirror_snapshot import save_snapshot
+        save_snapshot(self._dashboard, self.snapshot_path)
+        if self.journal_path:
+            from ingest_queue import remove_segments
+            remove_segments(self.journal_path, self._dashboard.tracker.journal_seq)
     
     def display_triad_radar(self, scores):
         """
@@ -75,10 +130,11 @@ class MirrorApp:
             print("○○○ DIM ○○○    | Quaspace pulse weakening")
             print("Signal Strength: WEAK - BUILD SOMETHING TODAY!")
     
-    def display_priority_zero_countdown(self, weekly_avg):
+    def display_priority_zero_countdown(self, weekly_avg, cohort=None):
         """
         Display Priority Zero Countdown - Showing "Estimated Probability of Success" 
         based on the last 7 days of behavior
+        - cohort: Optional Leaderboard.cohort_summary() to show the cohort standing
         """
         print("\n[PRIORITY ZERO COUNTDOWN - 2026]")
         print("-" * 40)
@@ -104,6 +160,14 @@ class MirrorApp:
             print("STATUS: Below expectations, course correction needed")
         else:
             print("STATUS: CRITICAL - Deviating from architect path")
+        
+        if cohort:
+            print(f"Cohort ({cohort['frequency']}, this {cohort['window']}): "
+                  f"rank #{cohort['rank']} of {cohort['cohort_size']}, "
+                  f"top {100 * cohort['rank'] / cohort['cohort_size']:.0f}%, "
+                  f"median {cohort['median']:.1f} vs your {cohort['total']:.1f}")
+            leaders = ", ".join(f"{user_id} ({total:.1f})" for user_id, total in cohort["top"])
+            print(f"Leaders: {leaders}")
     
     def run_daily_audit(self):
         """
@@ -122,8 +186,14 @@ class MirrorApp:
         # Display the Quaspace pulse
         self.display_quaspace_pulse(report["triad_scores"]["kinetic"])
         
-        # Display the Priority Zero countdown
-        self.display_priority_zero_countdown(report["weekly_average"])
+        # Display the Priority Zero countdown (with the cohort standing, if shared)
+        cohort = None
+        if self.leaderboard is not None:
+            tracker = self.dashboard.tracker
+            self.leaderboard.update_from_tracker(self.user_id, tracker)
+            # Query the period of the day just scored, not the leaderboard's own "today"
+            cohort = self.leaderboard.cohort_summary(self.user_id, "kinetic", target_date=tracker.current_day)
+        self.display_priority_zero_countdown(report["weekly_average"], cohort)
         
         # Show the deserve verdict
         print(f"\n[DESERVE VERDICT]")
@@ -223,7 +293,14 @@ class MirrorApp:
     def run(self):
         """
         Main run method to start the application
+        The banner is printed here rather than on construction, so building an app
+        (for the log command, tests or benchmarks) stays silent.
         """
+        print("Initializing The Mirror - Systems Architect Edition")
+        print("=" * 60)
+        print("Potential is not a gift; it is a massive structural debt.")
+        print("Today is " + datetime.now().strftime("%Y-%m-%d"))
+        print("=" * 60)
         print("\nWelcome to The Mirror - Systems Architect Edition")
         print("Your potential is a debt that must be repaid with impact.")
         
@@ -255,12 +332,75 @@ class MirrorApp:
                         else:
                             print(f"  Items: {len(data)}")
             elif choice == "4":
+                self.save_state()
                 print("\nRemember: Potential is a debt. Repay it with impact.")
                 print("The Mirror will continue auditing your trajectory.")
                 break
             else:
                 print("Invalid choice. Please select 1-4.")
 
+def log_command(argv):
+    """
+    `main.py log <frequency> [amount] [options]`: append one entry to the journal
+
+    Only the entry builder and the journal writer are imported, so this stays
+    within a few tens of milliseconds; the app replays the journal on next use.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py log", description="Log one entry without opening the app")
+    parser.add_argument("frequency", choices=["cognitive", "kinetic", "moral"])
+    parser.add_argument("amount", nargs="?", type=float, help="Hours spent (cognitive and moral)")
+    parser.add_argument("--type", help="Activity type (cognitive/kinetic) or topic area (moral)")
+    parser.add_argument("--notes", default="")
+    parser.add_argument("--no-progress", action="store_true", help="Kinetic work without actual progress")
+    parser.add_argument("--state-dir", default=DEFAULT_STATE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.frequency == "cognitive":
+        fields = {"hours": args.amount, "activity_type": args.type or "study", "notes": args.notes}
+    elif args.frequency == "kinetic":
+        fields = {"activity_type": args.type or "development", "progress_made": not args.no_progress, "notes": args.notes}
+    else:
+        fields = {"topic_area": args.type or "ethics_study", "time_spent": args.amount, "notes": args.notes}
+    if args.frequency != "kinetic" and args.amount is None:
+        parser.error(f"{args.frequency} entries need an amount in hours")
+
+    from day_bucketing import default_day_bucketer
+    from triad_tracker import TriadTracker
+    from ingest_queue import append_journal
+
+    os.makedirs(args.state_dir, exist_ok=True)
+    journal_path = os.path.join(args.state_dir, JOURNAL_FILE)
+    bucketer = default_day_bucketer()
+    entry = TriadTracker.build_entry(args.frequency, bucketer.now(), **fields)
+    append_journal(journal_path, [(bucketer.today(), entry)])
+    print(f"✓ {args.frequency.capitalize()} effort logged to {journal_path}")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["log"]:
+        return log_command(argv[1:])
+
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="The Mirror (Systems Architect Edition)")
+    parser.add_argument("--snapshot", help="Snapshot file to restore from and save to on exit")
+    parser.add_argument("--state-dir", help=f"Directory holding the snapshot and journal (default {DEFAULT_STATE_DIR} if it exists)")
+    args = parser.parse_args(argv)
+    
+    if args.snapshot:
+        app = MirrorApp(snapshot_path=args.snapshot)
+    elif args.state_dir or os.path.isdir(DEFAULT_STATE_DIR):
+        state_dir = args.state_dir or DEFAULT_STATE_DIR
+        os.makedirs(state_dir, exist_ok=True)
+        app = MirrorApp.from_state_dir(state_dir)
+    else:
+        app = MirrorApp()
+    app.run()
+    return 0
+
 if __name__ == "__main__":
-    app = MirrorApp()
-    app.run()
\ No newline at end of file
+    sys.exit(main())
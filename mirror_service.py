@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# The Mirror Service - Local HTTP Ingest and Query Layer
+# Exposes the TriadTracker and MirrorDashboard to external tools over a stdlib asyncio server
+
+import asyncio
+import http.client
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from urllib.parse import urlsplit, parse_qs
+
+import instrumentation
+from triad_tracker import MirrorDashboard
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented"
+}
+
+
+class ServiceError(Exception):
+    """An error that maps directly onto an HTTP error response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TextResponse:
+    """A non-JSON response body (used for the Prometheus exposition format)"""
+
+    def __init__(self, body, content_type="text/plain; version=0.0.4; charset=utf-8"):
+        self.body = body
+        self.content_type = content_type
+
+
+class MirrorService:
+    """
+    The Mirror Service - HTTP/1.1 front door for the dashboard
+
+    Endpoints (all bodies and responses are JSON):
+    - POST /log/cognitive, /log/kinetic, /log/moral: Log a single entry (same fields as the log_* methods)
+    - POST /log/batch: {"entries": [{"frequency": "cognitive", ...}, ...]} logged in one request
+    - GET  /scores?start=YYYY-MM-DD&end=YYYY-MM-DD: Daily scores for each logged date in the range
+    - GET  /report: The full generate_daily_report output
+    - GET  /health: Liveness check
+    - GET  /metrics, /metrics.json: Instrumentation histograms (Prometheus text or JSON)
+
+    With an `ingest` queue (see ingest_queue.GroupCommitQueue) log requests are
+    group-committed to its journal and answered only once their batch is durable.
+    /scores and /report both read the tracker's published snapshot, so they show
+    committed entries only and always agree with each other.
+
+    Connections are kept alive (and may be pipelined) until the client closes them.
+    Request bodies need a Content-Length; chunked uploads are refused with 501.
+    Report generation runs on a worker pool so it never stalls ingest on the event loop,
+    and a report request joins one already in flight if that one started from the
+    state the request would see.
+    """
+
+    def __init__(self, dashboard=None, host=DEFAULT_HOST, port=DEFAULT_PORT, report_workers=2, ingest=None):
+        self.dashboard = dashboard if dashboard is not None else MirrorDashboard()
+        # Log and score calls go through the ingest queue when there is one
+        self.ingest = ingest if ingest is not None else self.dashboard.tracker
+        self.host = host
+        self.port = port
+        self.report_pool = ThreadPoolExecutor(max_workers=report_workers, thread_name_prefix="mirror-report")
+        self.server = None
+        self._report_inflight = None  # (tracker version, profile version, future) of the report being built
+        self._routes = {
+            ("POST", "/log/cognitive"): self._log_cognitive,
+            ("POST", "/log/kinetic"): self._log_kinetic,
+            ("POST", "/log/moral"): self._log_moral,
+            ("POST", "/log/batch"): self._log_batch,
+            ("GET", "/scores"): self._scores,
+            ("GET", "/report"): self._report,
+            ("GET", "/health"): self._health,
+            ("GET", "/metrics"): self._metrics,
+            ("GET", "/metrics.json"): self._metrics_json
+        }
+
+    async def start(self):
+        """Start listening; returns once the socket is bound"""
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port 0 asks the OS for a free port, so record the one we actually got
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        """Start the server (if needed) and serve until cancelled"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        """Stop accepting connections, flush any ingest queue and release the worker pool"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.ingest is not self.dashboard.tracker:
+            self.ingest.close()
+        self.report_pool.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # HTTP plumbing
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # Client closed the connection between requests
+                except asyncio.LimitOverrunError:
+                    await self._write_response(writer, 413, {"error": "Request headers too large"}, False)
+                    break
+
+                try:
+                    method, target, version, headers = self._parse_head(head)
+                except ServiceError as error:
+                    await self._write_response(writer, error.status, {"error": error.message}, False)
+                    break
+
+                if "transfer-encoding" in headers:
+                    # Bodies are framed by Content-Length only; an unread chunked body would
+                    # be parsed as the next request, so refuse it and close
+                    await self._write_response(writer, 501, {"error": "Transfer-Encoding is not supported; send Content-Length"}, False)
+                    break
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._write_response(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._write_response(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                status, payload = await self._dispatch(method, target, body)
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    def _parse_head(self, head):
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise ServiceError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, version, headers
+
+    async def _write_response(self, writer, status, payload, keep_alive):
+        if isinstance(payload, TextResponse):
+            body, content_type = payload.body.encode("utf-8"), payload.content_type
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                return 405, {"error": f"{method} not allowed on {url.path}"}
+            return 404, {"error": f"No endpoint at {url.path}"}
+
+        try:
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ServiceError(400, "Request body must be a JSON object")
+            return 200, await handler(data, params)
+        except ServiceError as error:
+            return error.status, {"error": error.message}
+        except json.JSONDecodeError as error:
+            return 400, {"error": f"Invalid JSON body: {error}"}
+        except (TypeError, ValueError) as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def _log_entry(self, frequency, data):
+        return self._log_arguments(frequency, _entry_arguments(frequency, data))
+
+    def _log_arguments(self, frequency, arguments):
+        if frequency == "cognitive":
+            return self.ingest.log_cognitive_effort(*arguments)
+        elif frequency == "kinetic":
+            return self.ingest.log_kinetic_effort(*arguments)
+        return self.ingest.log_moral_effort(*arguments)
+
+    async def _durable(self):
+        """Wait until everything logged so far has been group-committed (no-op without a queue)"""
+        if self.ingest is self.dashboard.tracker:
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.ingest.when_durable(lambda error: loop.call_soon_threadsafe(_settle, future, error))
+        await future
+
+    async def _log_cognitive(self, data, params):
+        entry = self._log_entry("cognitive", data)
+        await self._durable()
+        return {"entry": entry}
+
+    async def _log_kinetic(self, data, params):
+        entry = self._log_entry("kinetic", data)
+        await self._durable()
+        return {"entry": entry}
+
+    async def _log_moral(self, data, params):
+        entry = self._log_entry("moral", data)
+        await self._durable()
+        return {"entry": entry}
+
+    async def _log_batch(self, data, params):
+        entries = data.get("entries")
+        if not isinstance(entries, list):
+            raise ServiceError(400, "Batch body needs an 'entries' list")
+
+        # Validate everything up front so a bad entry does not leave a half-applied batch
+        validated = []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict) or entry.get("frequency") not in ("cognitive", "kinetic", "moral"):
+                raise ServiceError(400, f"Entry {index} needs a frequency of cognitive, kinetic or moral")
+            try:
+                validated.append((entry["frequency"], _entry_arguments(entry["frequency"], entry)))
+            except ServiceError as error:
+                raise ServiceError(400, f"Entry {index}: {error.message}")
+
+        for frequency, arguments in validated:
+            self._log_arguments(frequency, arguments)
+        await self._durable()
+        return {"logged": len(entries)}
+
+    async def _scores(self, data, params):
+        tracker = self.dashboard.tracker
+        start = _parse_date(params.get("start", tracker.current_date))
+        end = _parse_date(params.get("end", params.get("start", tracker.current_date)))
+        if end < start:
+            raise ServiceError(400, "Range end is before range start")
+
+        # Only days with logs are scored (and returned); absent dates score zero.
+        # Scores come from the published snapshot, like /report, so the group-commit
+        # writer can keep applying batches meanwhile.
+        snapshot = tracker.snapshot()
+        return {"scores": {date: tracker.calculate_daily_scores(date, snapshot) for date in tracker.active_days(start, end)}}
+
+    async def _report(self, data, params):
+        # A request shares the report being built only if that report was started
+        # at or after the versions this request sees; otherwise entries the client
+        # already had acknowledged could be missing from its report
+        versions = (self.dashboard.tracker.version, self.dashboard.profile.version)
+        inflight = self._report_inflight
+        if inflight is None or inflight[0] < versions[0] or inflight[1] < versions[1]:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.report_pool, self.dashboard.generate_daily_report)
+            inflight = self._report_inflight = (*versions, future)
+            future.add_done_callback(self._clear_report_inflight)
+        return {"report": await asyncio.shield(inflight[2])}
+
+    def _clear_report_inflight(self, future):
+        # A newer report may have replaced this one meanwhile
+        if self._report_inflight is not None and self._report_inflight[2] is future:
+            self._report_inflight = None
+
+    async def _health(self, data, params):
+        return {"status": "ok", "date": self.dashboard.tracker.current_date}
+
+    async def _metrics(self, data, params):
+        return TextResponse(_active_metrics().to_prometheus())
+
+    async def _metrics_json(self, data, params):
+        return _active_metrics().to_dict()
+
+
+def _active_metrics():
+    # Whichever registry instrumentation.enable() was given, not necessarily the global one
+    registry = instrumentation.active_registry()
+    if registry is None:
+        raise ServiceError(404, "Instrumentation is disabled (start the service with --metrics)")
+    return registry
+
+
+def _settle(future, error):
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(ServiceError(500, error))
+
+
+def _number(data, field, default=None):
+    value = data.get(field, default)
+    if value is None:
+        raise ServiceError(400, f"Missing required field: {field}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ServiceError(400, f"Field {field} must be a number")
+    if not math.isfinite(value):
+        raise ServiceError(400, f"Field {field} must be a finite number")
+    return value
+
+
+def _flag(data, field, default):
+    # bool("false") is True, so only real JSON booleans are accepted
+    value = data.get(field, default)
+    if not isinstance(value, bool):
+        raise ServiceError(400, f"Field {field} must be true or false")
+    return value
+
+
+def _text(data, field, default):
+    # Labels feed the scoring tables' lookups, so they must be strings
+    value = data.get(field, default)
+    if not isinstance(value, str):
+        raise ServiceError(400, f"Field {field} must be a string")
+    return value
+
+
+def _entry_arguments(frequency, data):
+    """Validated positional arguments for the log_* method of a frequency"""
+    timestamp = _parse_timestamp(data.get("timestamp"))
+    notes = _text(data, "notes", "")
+    if frequency == "cognitive":
+        return _number(data, "hours"), _text(data, "activity_type", "study"), notes, timestamp
+    elif frequency == "kinetic":
+        return _text(data, "activity_type", "development"), _flag(data, "progress_made", True), notes, timestamp
+    elif frequency == "moral":
+        return _text(data, "topic_area", "ethics_study"), _number(data, "time_spent", 0), notes, timestamp
+    raise ServiceError(400, f"Unknown frequency: {frequency!r}")
+
+
+def _parse_timestamp(value):
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"Invalid ISO timestamp: {value!r}")
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"Invalid date (expected YYYY-MM-DD): {value!r}")
+
+
+class MirrorClient:
+    """
+    Minimal blocking client for the Mirror Service
+
+    Reuses one keep-alive connection for every call, which is what local
+    scripts (commit hooks, timers) should do when pushing many entries.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=10):
+        self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        data = json.loads(response.read() or b"{}")
+        if response.status != 200:
+            raise ServiceError(response.status, data.get("error", "Request failed"))
+        return data
+
+    def log_cognitive_effort(self, hours, activity_type="study", notes="", timestamp=None):
+        return self.request("POST", "/log/cognitive", _entry_payload(
+            hours=hours, activity_type=activity_type, notes=notes, timestamp=timestamp))["entry"]
+
+    def log_kinetic_effort(self, activity_type="development", progress_made=True, notes="", timestamp=None):
+        return self.request("POST", "/log/kinetic", _entry_payload(
+            activity_type=activity_type, progress_made=progress_made, notes=notes, timestamp=timestamp))["entry"]
+
+    def log_moral_effort(self, topic_area="ethics_study", time_spent=0, notes="", timestamp=None):
+        return self.request("POST", "/log/moral", _entry_payload(
+            topic_area=topic_area, time_spent=time_spent, notes=notes, timestamp=timestamp))["entry"]
+
+    def log_batch(self, entries):
+        return self.request("POST", "/log/batch", {"entries": entries})["logged"]
+
+    def get_scores(self, start=None, end=None):
+        query = "&".join(f"{key}={value}" for key, value in (("start", start), ("end", end)) if value)
+        return self.request("GET", "/scores" + (f"?{query}" if query else ""))["scores"]
+
+    def generate_daily_report(self):
+        return self.request("GET", "/report")["report"]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _entry_payload(timestamp=None, **fields):
+    if timestamp is not None:
+        fields["timestamp"] = timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+    return fields
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve The Mirror over local HTTP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--report-workers", type=int, default=2)
+    parser.add_argument("--metrics", action="store_true", help="Time hot paths and serve them at /metrics")
+    parser.add_argument("--journal", help="Group-commit log requests to this journal (replayed at start-up)")
+    args = parser.parse_args()
+
+    if args.metrics:
+        instrumentation.enable()
+
+    dashboard = MirrorDashboard()
+    ingest = None
+    if args.journal:
+        from ingest_queue import GroupCommitQueue, replay_journal
+        replayed = replay_journal(args.journal, dashboard.tracker)
+        print(f"Replayed {replayed} journal entries from {args.journal}")
+        ingest = GroupCommitQueue(dashboard.tracker, args.journal)
+
+    service = MirrorService(dashboard, host=args.host, port=args.port, report_workers=args.report_workers, ingest=ingest)
+    print(f"The Mirror is listening on http://{service.host}:{service.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        if ingest is not None:
+            ingest.close()
+        print("\nThe Mirror service has stopped.")
@@ -0,0 +1,230 @@
+# Mirror Snapshot Module - Versioned binary snapshot of the full dashboard state
+# Saves the profile, tracker history and tracker aggregates in one file that is
+# written atomically and restored through mmap without decoding the history.
+
+import json
+import mmap
+import os
+import struct
+import traceback
+import zlib
+
+from day_bucketing import DayBucketer
+from durable_files import align, write_atomically
+from tracker_archive import ColdArchive
+
+SNAPSHOT_MAGIC = b"MRSN"
+SNAPSHOT_VERSION = 1
+
+HEADER = struct.Struct("<4sHH")        # magic, version, section count
+DIRECTORY_ENTRY = struct.Struct("<4sQQI")  # tag, offset, length, crc32
+
+SECTION_PROFILE = b"PROF"   # Pillars, shadow archive, Sunday dreams and profile health (JSON)
+SECTION_TRACKER = b"TRKM"   # Tracker aggregates and settings (JSON)
+SECTION_HISTORY = b"HIST"   # Every logged day, in the cold archive block format
+
+# Sections that are small enough to checksum on every load
+VERIFIED_SECTIONS = (SECTION_PROFILE, SECTION_TRACKER)
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or from an unknown version"""
+
+
+def save_snapshot(dashboard, path):
+    """
+    Write the dashboard state to `path` atomically
+
+    The snapshot is written to a temporary file, fsynced and then renamed over
+    the old one, so a crash mid-write never leaves a truncated snapshot behind.
+    Returns the number of bytes written.
+    """
+    profile = dashboard.profile
+    tracker = dashboard.tracker
+
+    # Hot days go through the archive encoder too; restoring then only needs the
+    # block directory, and days are decoded on first read.
+    history = ColdArchive.from_buffer(tracker.archive.to_bytes())
+    history.archive_days(tracker.daily_logs)
+
+    sections = [
+        (SECTION_PROFILE, _dump_json({
+            "identity_pillars": profile.identity_pillars,
+            "shadow_archive": profile.shadow_archive,
+            "sunday_dreams": profile.sunday_dreams,
+            "profile_health": profile.profile_health
+        })),
+        (SECTION_TRACKER, _dump_json({
+            "current_date": tracker.current_date,
+            "weekly_average": tracker.weekly_average,
+            "archive_after_days": tracker.archive_after_days,
+            "archive_cache_size": tracker.archive.cache_size,
+            "timezone": tracker.bucketer.tz_name,
+            "day_start_hour": tracker.bucketer.day_start_hour,
+            "journal_seq": tracker.journal_seq
+        })),
+        (SECTION_HISTORY, history.to_bytes())
+    ]
+
+    directory_size = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    offset = align(directory_size)
+    directory = bytearray(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections)))
+    layout = []
+    for tag, data in sections:
+        directory += DIRECTORY_ENTRY.pack(tag, offset, len(data), zlib.crc32(data))
+        layout.append((offset, data))
+        offset = align(offset + len(data))
+
+    def chunks():
+        position = len(directory)
+        yield directory
+        for section_offset, data in layout:
+            yield b"\0" * (section_offset - position)
+            yield data
+            position = section_offset + len(data)
+
+    return write_atomically(path, chunks())
+
+
+def load_snapshot(path, dashboard=None, verify=False):
+    """
+    Restore dashboard state from a snapshot written by save_snapshot()
+
+    - dashboard: Dashboard to restore into (a new MirrorDashboard by default)
+    - verify: Also checksum the history section (the small sections are always checked)
+
+    The file is memory-mapped and the history's compressed blocks stay in the
+    mapping, so load time depends on the number of months, not entries. The
+    restored tracker.archive owns the mapping (ColdArchive.close() releases it);
+    the archive it replaces is closed. The dashboard is only changed once the
+    whole file has been read, and a failed load unmaps the file.
+
+    Without verify, a corrupt history block is only found when a day in it is
+    first read, and that read raises ValueError.
+    """
+    if dashboard is None:
+        from triad_tracker import MirrorDashboard
+        dashboard = MirrorDashboard()
+
+    with open(path, "rb") as handle:
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise SnapshotError(f"Snapshot file is empty: {path}")
+
+    try:
+        return _restore(mapped, dashboard, verify)
+    except BaseException as error:
+        # Views into the mapping live on in the frames of the traceback (and of any
+        # exception it was raised from); drop them so the mapping can be unmapped
+        chained = error
+        while chained is not None:
+            traceback.clear_frames(chained.__traceback__)
+            chained = chained.__context__
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # Still referenced elsewhere; unmapped when that goes
+        raise
+
+
+def _restore(mapped, dashboard, verify):
+    sections = _read_directory(mapped, verify)
+    state = json.loads(bytes(sections[SECTION_PROFILE]))
+    meta = json.loads(bytes(sections[SECTION_TRACKER]))
+    tracker = dashboard.tracker
+    bucketer = tracker.bucketer
+    if (meta.get("timezone"), meta.get("day_start_hour", 0)) != (bucketer.tz_name, bucketer.day_start_hour):
+        bucketer = DayBucketer(meta.get("timezone"), meta.get("day_start_hour", 0))
+    try:
+        archive = ColdArchive.from_buffer(sections[SECTION_HISTORY], cache_size=meta["archive_cache_size"], mapping=mapped)
+    except (ValueError, IndexError) as error:
+        raise SnapshotError(f"Corrupt history section: {error}")
+
+    profile = dashboard.profile
+    profile.identity_pillars = state["identity_pillars"]
+    profile.shadow_archive = state["shadow_archive"]
+    profile.sunday_dreams = state["sunday_dreams"]
+    profile.profile_health = state["profile_health"]
+    profile.publish_snapshot()
+
+    tracker.bucketer = bucketer
+    tracker.current_date = meta["current_date"]
+    tracker.weekly_average = meta["weekly_average"]
+    tracker.archive_after_days = meta["archive_after_days"]
+    tracker.journal_seq = meta.get("journal_seq", 0)
+    replaced, tracker.archive = tracker.archive, archive
+    # Every day starts out archived; writing to one thaws it back into daily_logs
+    tracker.daily_logs = {}
+    tracker.rebuild_day_index()
+    # Closed once the published snapshot no longer holds a view of it
+    replaced.close()
+    return dashboard
+
+
+def _read_directory(mapped, verify):
+    if len(mapped) < HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version, count = HEADER.unpack_from(mapped, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a Mirror snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version: {version}")
+    if HEADER.size + count * DIRECTORY_ENTRY.size > len(mapped):
+        raise SnapshotError("Snapshot is truncated")
+
+    view = memoryview(mapped)
+    sections = {}
+    for index in range(count):
+        tag, offset, length, checksum = DIRECTORY_ENTRY.unpack_from(mapped, HEADER.size + index * DIRECTORY_ENTRY.size)
+        if offset + length > len(mapped):
+            raise SnapshotError(f"Section {tag.decode('ascii', 'replace')} runs past the end of the file")
+        data = view[offset:offset + length]
+        if (verify or tag in VERIFIED_SECTIONS) and zlib.crc32(data) != checksum:
+            raise SnapshotError(f"Checksum mismatch in section {tag.decode('ascii', 'replace')}")
+        sections[tag] = data
+
+    for tag in (SECTION_PROFILE, SECTION_TRACKER, SECTION_HISTORY):
+        if tag not in sections:
+            raise SnapshotError(f"Snapshot is missing section {tag.decode('ascii')}")
+    return sections
+
+
+def _dump_json(data):
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+if __name__ == "__main__":
+    # Load-path benchmark: build a synthetic multi-year history and time save/restore
+    import argparse
+    import tempfile
+    import time
+
+    from workload import WorkloadGenerator
+
+    parser = argparse.ArgumentParser(description="Benchmark Mirror snapshot save and restore")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--entries-per-day", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    generator = WorkloadGenerator(seed=2026, years=args.years, entries_per_day=args.entries_per_day)
+    dashboard = generator.build_dashboards(archive_after_days=30)[generator.user_ids()[0]]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "mirror.snapshot")
+        began = time.perf_counter()
+        size = save_snapshot(dashboard, path)
+        save_ms = (time.perf_counter() - began) * 1000
+
+        load_times = []
+        for _ in range(args.runs):
+            began = time.perf_counter()
+            restored = load_snapshot(path)
+            restored.tracker.calculate_daily_scores()
+            load_times.append((time.perf_counter() - began) * 1000)
+            restored.tracker.archive.close()
+
+    print(f"History: {args.years} years, {len(dashboard.tracker.archive)} archived days, snapshot {size / 1024:.1f} KiB")
+    print(f"Save: {save_ms:.1f} ms")
+    print(f"Load: best {min(load_times):.2f} ms, median {sorted(load_times)[len(load_times) // 2]:.2f} ms")
@@ -1,6 +1,29 @@
 # The Profile of X - Personalized Data Layer
 # Contains the Pillar Synthesis, Shadow Archive, and Sunday Dreams
 
+from frozen_views import FrozenDict, freeze
+
+PROFILE_SECTIONS = ("identity_pillars", "shadow_archive", "sunday_dreams")
+
+
+class ProfileSnapshot(FrozenDict):
+    """
+    Immutable, versioned profile summary (what get_profile_summary returns)
+
+    Maps each section to a FrozenDict of frozen items plus "profile_health".
+    Consecutive versions share every item that did not change.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, sections, version):
+        super().__init__(sections)
+        self.version = version
+
+    def __reduce__(self):
+        return (type(self), (dict(self), self.version))
+
+
 class ProfileOfX:
     """
     The Personalized Data Layer (The Profile of X)
@@ -102,6 +125,11 @@ class ProfileOfX:
             "shadow_risk_level": 0.0,
             "dream_progress_rate": 0.0
         }
+        
+        # Published read-only view; replaced (never mutated) on every change
+        self.version = 0
+        self._snapshot = None
+        self.publish_snapshot()
     
     def update_identity_pillar(self, pillar_name, status, note=""):
         """Update the status of an identity pillar"""
@@ -110,6 +138,7 @@ class ProfileOfX:
             if note:
                 self.identity_pillars[pillar_name]["progress_notes"].append(note)
             self._update_profile_health()
+            self.publish_snapshot("identity_pillars", pillar_name)
     
     def trigger_shadow_warning(self, shadow_name):
         """Trigger a warning in the shadow archive"""
@@ -118,18 +147,21 @@ class ProfileOfX:
             self.shadow_archive[shadow_name]["active"] = True
             self.shadow_archive[shadow_name]["last_triggered"] = datetime.now().isoformat()
             self._update_profile_health()
+            self.publish_snapshot("shadow_archive", shadow_name)
     
     def clear_shadow_warning(self, shadow_name):
         """Clear a warning in the shadow archive"""
         if shadow_name in self.shadow_archive:
             self.shadow_archive[shadow_name]["active"] = False
             self._update_profile_health()
+            self.publish_snapshot("shadow_archive", shadow_name)
     
     def update_sunday_dream_progress(self, dream_name, progress):
         """Update progress toward a Sunday Dream"""
         if dream_name in self.sunday_dreams:
             self.sunday_dreams[dream_name]["current_progress"] = max(0.0, min(1.0, progress))
             self._update_profile_health()
+            self.publish_snapshot("sunday_dreams", dream_name)
     
     def _update_profile_health(self):
         """Update the overall profile health metrics"""
@@ -149,41 +181,72 @@ class ProfileOfX:
         )
         self.profile_health["dream_progress_rate"] = total_dream_progress / len(self.sunday_dreams)
     
+    def publish_snapshot(self, section=None, item=None):
+        """
+        Publish a new immutable summary after a change
+        - section, item: The one changed item (e.g. "sunday_dreams", "Sovereignty");
+          only it is re-frozen and every other item is shared with the previous
+          version. Without them every section is rebuilt (e.g. after a restore).
+        """
+        previous = self._snapshot
+        if previous is None or section is None:
+            sections = {
+                name: FrozenDict((key, freeze(value)) for key, value in getattr(self, name).items())
+                for name in PROFILE_SECTIONS
+            }
+        else:
+            sections = dict(previous)
+            items = dict(previous[section])
+            live = getattr(self, section)
+            if item in live:
+                items[item] = freeze(live[item])
+            else:
+                items.pop(item, None)
+            sections[section] = FrozenDict(items)
+        sections["profile_health"] = FrozenDict(self.profile_health)
+        self.version += 1
+        # A single reference swap, so readers on other threads see either version, never a mix
+        self._snapshot = ProfileSnapshot(sections, self.version)
+        return self._snapshot
+    
     def get_profile_summary(self):
-        """Get a comprehensive summary of the profile"""
-        return {
-            "identity_pillars": self.identity_pillars,
-            "shadow_archive": self.shadow_archive,
-            "sunday_dreams": self.sunday_dreams,
-            "profile_health": self.profile_health
-        }
+        """Get a comprehensive summary of the profile (an immutable, versioned snapshot)"""
+        return self._snapshot
     
-    def get_risk_assessment(self):
-        """Get a risk assessment based on shadow archive activity"""
-        active_shadows = [name for name, data in self.shadow_archive.items() if data["active"]]
+    def get_risk_assessment(self, summary=None):
+        """
+        Get a risk assessment based on shadow archive activity
+        - summary: Profile snapshot to assess (defaults to the latest published one)
+        """
+        summary = summary if summary is not None else self._snapshot
+        active_shadows = [name for name, data in summary["shadow_archive"].items() if data["active"]]
         
         if not active_shadows:
             return "Profile is healthy. No shadow risks detected."
         else:
             return f"Warning: Active shadow risks detected - {', '.join(active_shadows)}. Address these immediately."
     
-    def get_priority_actions(self):
-        """Get priority actions based on profile status"""
+    def get_priority_actions(self, summary=None):
+        """
+        Get priority actions based on profile status
+        - summary: Profile snapshot to read (defaults to the latest published one)
+        """
+        summary = summary if summary is not None else self._snapshot
         actions = []
         
         # Check for low pillar status
-        for pillar_name, pillar_data in self.identity_pillars.items():
+        for pillar_name, pillar_data in summary["identity_pillars"].items():
             if pillar_data["current_status"] < 5:  # Below average
                 actions.append(f"URGENT: {pillar_name.title()} pillar needs immediate attention. Current status: {pillar_data['current_status']}/10")
         
         # Check for unmet milestones
-        for dream_name, dream_data in self.sunday_dreams.items():
+        for dream_name, dream_data in summary["sunday_dreams"].items():
             for milestone in dream_data["milestones"]:
                 if not milestone["achieved"]:
                     actions.append(f"MILESTONE DUE: {milestone['target']} in {dream_name.replace('_', ' ').title()}. Deadline: {milestone['deadline']}")
         
         # Check for active shadows
-        for shadow_name, shadow_data in self.shadow_archive.items():
+        for shadow_name, shadow_data in summary["shadow_archive"].items():
             if shadow_data["active"]:
                 actions.append(f"SHADOW ALERT: Address {shadow_name.replace('_', ' ').title()} trap immediately.")
         
@@ -0,0 +1,281 @@
+# Scoring Rules Module - Declarative triad scoring compiled into lookup tables
+# The weights behind calculate_daily_scores live in a config file (scoring_rules.json)
+# and are compiled once per load into a scoring function whose per-entry work is
+# a branch on the frequency and one weight-table lookup.
+
+import json
+import os
+import threading
+import weakref
+
+DEFAULT_RULES_PATH = os.environ.get(
+    "MIRROR_SCORING_RULES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_rules.json")
+)
+
+# Used when the config file is missing; matches the shipped scoring_rules.json
+DEFAULT_RULES = {
+    "version": 1,
+    "score_cap": 10,
+    "frequencies": {
+        "cognitive": {
+            "value_field": "hours",
+            "match_field": "activity_type",
+            "match": "exact",
+            "weights": {"derivation": 1.5, "first_principles": 1.5, "problem_solving": 1.2},
+            "default_weight": 1
+        },
+        "kinetic": {
+            "value": 1,
+            "require_field": "progress_made",
+            "match_field": "activity_type",
+            "match": "exact",
+            "weights": {"coding": 3, "design": 2},
+            "default_weight": 1
+        },
+        "moral": {
+            "value_field": "time_spent",
+            "match_field": "topic_area",
+            "match": "contains",
+            "weights": {"Islamic_Ethics": 1.2},
+            "default_weight": 1
+        }
+    }
+}
+
+MATCH_MODES = ("exact", "contains")
+REQUIRED_FREQUENCIES = ("cognitive", "kinetic", "moral")  # Every score dict the tracker reads has these keys
+MAX_MEMOIZED_LABELS = 4096  # Bound on the per-label cache for "contains" rules
+
+
+class ScoringRulesError(ValueError):
+    """Raised when a scoring rule set is malformed"""
+
+
+class FrequencyRule:
+    """
+    Compiled scoring rule for one frequency
+
+    entry score = base value x weight, where
+    - base value is entry[value_field] (or a constant `value`)
+    - weight is looked up by entry[match_field] in a precomputed table
+    - entries whose require_field is falsy score nothing
+    """
+
+    __slots__ = ("value_field", "value", "require_field", "match_field", "weights", "default_weight")
+
+    def __init__(self, name, spec):
+        if not isinstance(spec, dict):
+            raise ScoringRulesError(f"Rule for {name!r} must be an object")
+        self.value_field = spec.get("value_field")
+        self.value = spec.get("value")
+        if (self.value_field is None) == (self.value is None):
+            raise ScoringRulesError(f"Rule for {name!r} needs exactly one of value_field or value")
+        if self.value is not None and not _is_number(self.value):
+            raise ScoringRulesError(f"Rule for {name!r} has a non-numeric value")
+        self.require_field = spec.get("require_field")
+        self.match_field = spec.get("match_field")
+        for field in ("value_field", "require_field", "match_field"):
+            if getattr(self, field) is not None and not isinstance(getattr(self, field), str):
+                raise ScoringRulesError(f"Rule for {name!r} needs a string {field}")
+
+        match = spec.get("match", "exact")
+        if match not in MATCH_MODES:
+            raise ScoringRulesError(f"Rule for {name!r} has unknown match mode {match!r}")
+        weights = spec.get("weights", {})
+        if not isinstance(weights, dict) or not all(_is_number(weight) for weight in weights.values()):
+            raise ScoringRulesError(f"Rule for {name!r} needs a mapping of label -> numeric weight")
+        self.default_weight = spec.get("default_weight", 1)
+        if not _is_number(self.default_weight):
+            raise ScoringRulesError(f"Rule for {name!r} has a non-numeric default_weight")
+
+        # Exact labels are the table itself; "contains" patterns are resolved per label
+        # on first sight (first declared pattern wins) and memoized into the same table
+        patterns = tuple(weights.items()) if match == "contains" else ()
+        self.weights = WeightTable(weights if match == "exact" else {}, patterns, self.default_weight)
+
+    def compile(self, index, namespace):
+        """
+        Source lines that add one entry's score to the local total_<index>, for
+        the generated scoring loop; this rule's weight table (and constant value)
+        are added to its namespace
+        """
+        namespace[f"weights_{index}"] = self.weights
+        namespace[f"value_{index}"] = self.value
+        base = f"entry[{self.value_field!r}]" if self.value_field is not None else f"value_{index}"
+        # Without a match field every entry gets the default weight; keying the (empty)
+        # table on the frequency gives exactly that
+        label = f"entry[{self.match_field!r}]" if self.match_field is not None else "frequency"
+        line = f"total_{index} += {base} * weights_{index}[{label}]"
+        if self.require_field is None:
+            return [line]
+        return [f"if entry[{self.require_field!r}]:", "    " + line]
+
+
+class WeightTable(dict):
+    """
+    Label -> weight lookup table
+
+    Labels missing from the table are resolved once (first matching "contains"
+    pattern, else the default weight) and memoized, up to MAX_MEMOIZED_LABELS.
+    """
+
+    def __init__(self, weights, patterns, default_weight):
+        super().__init__(weights)
+        self.patterns = patterns
+        self.default_weight = default_weight
+
+    def __missing__(self, label):
+        if not isinstance(label, str):
+            return self.default_weight  # Patterns only match text labels
+        weight = next((w for pattern, w in self.patterns if pattern in label), self.default_weight)
+        if len(self) < MAX_MEMOIZED_LABELS:
+            self[label] = weight
+        return weight
+
+
+class CompiledRules:
+    """A compiled rule set: frequency -> FrequencyRule plus the score cap"""
+
+    def __init__(self, config):
+        if not isinstance(config, dict) or not isinstance(config.get("frequencies"), dict):
+            raise ScoringRulesError("Scoring rules need a 'frequencies' object")
+        self.version = config.get("version", 1)
+        self.score_cap = config.get("score_cap")
+        if self.score_cap is not None and not _is_number(self.score_cap):
+            raise ScoringRulesError("score_cap must be a number")
+        missing = [name for name in REQUIRED_FREQUENCIES if name not in config["frequencies"]]
+        if missing:
+            raise ScoringRulesError(f"Scoring rules are missing frequencies: {', '.join(missing)}")
+        self.rules = {name: FrequencyRule(name, spec) for name, spec in config["frequencies"].items()}
+        self.score_entries = self._build_scorer()
+
+    def _build_scorer(self):
+        """
+        Generate score_entries(entries) -> {frequency: capped score}
+
+        The rule set is unrolled into one function: an if/elif on the frequency,
+        each rule's fields and constants inlined, and one local total per
+        frequency, so per entry there is a branch, a weight lookup and a multiply.
+        Config strings only reach the source through repr().
+        """
+        namespace = {"cap": self.score_cap}
+        lines = ["def score_entries(entries):"]
+        totals = [f"total_{index}" for index in range(len(self.rules))]
+        if totals:
+            lines.append(f"    {' = '.join(totals)} = 0")
+        lines.append("    for entry in entries:")
+        lines.append('        frequency = entry["frequency"]')
+        for index, (name, rule) in enumerate(self.rules.items()):
+            lines.append(f"        {'if' if index == 0 else 'elif'} frequency == {name!r}:")
+            lines.extend("            " + line for line in rule.compile(index, namespace))
+        if not totals:
+            lines.append("        pass")
+
+        results = [
+            f"{name!r}: {total}" if self.score_cap is None else f"{name!r}: cap if {total} > cap else {total}"
+            for name, total in zip(self.rules, totals)
+        ]
+        lines.append(f"    return {{{', '.join(results)}}}")
+        exec("\n".join(lines), namespace)
+        return namespace["score_entries"]
+
+
+class ScoringRules:
+    """
+    A hot-reloadable rule set backed by a config file
+
+    current() returns the compiled rules. A watcher thread re-reads the file
+    when its modification time or size changes (checked every check_interval
+    seconds), so reading the rules costs nothing per call. A broken edit keeps
+    the previous rules and is reported in last_error.
+    """
+
+    def __init__(self, path=None, config=None, check_interval=1.0):
+        """
+        - path: JSON rule file to load and watch
+        - config: Rule dict to use instead of a file (never reloaded)
+        - check_interval: Seconds between file change checks (None: no watcher;
+          call reload_if_changed() yourself)
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._stop_watching = threading.Event()
+        if path is None:
+            self.compiled = CompiledRules(config if config is not None else DEFAULT_RULES)
+        else:
+            self.compiled = self._load()
+            if check_interval is not None:
+                threading.Thread(
+                    target=_watch, args=(weakref.ref(self), self._stop_watching, check_interval),
+                    name="mirror-scoring-rules", daemon=True
+                ).start()
+
+    def current(self):
+        """The compiled rules in force"""
+        return self.compiled
+
+    def stop_watching(self):
+        """Stop the watcher thread (the rules in force stay as they are)"""
+        self._stop_watching.set()
+
+    def reload_if_changed(self):
+        """Reload the rule file if it changed on disk; returns True if new rules were loaded"""
+        with self._lock:
+            if self._file_signature() == self._signature:
+                return False
+            try:
+                self.compiled = self._load()
+            except (OSError, ScoringRulesError, json.JSONDecodeError) as error:
+                self.last_error = f"{type(error).__name__}: {error}"
+                return False
+            return True
+
+    def score_entries(self, entries):
+        return self.compiled.score_entries(entries)
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        signature = self._file_signature()
+        with open(self.path) as handle:
+            compiled = CompiledRules(json.load(handle))
+        self._signature = signature
+        self.last_error = None
+        return compiled
+
+
+def _watch(rules_ref, stopped, interval):
+    # Holds only a weak reference, so a rule set nobody uses any more ends its watcher
+    while not stopped.wait(interval):
+        rules = rules_ref()
+        if rules is None:
+            return
+        rules.reload_if_changed()
+        del rules
+
+
+_default_rules = None
+
+
+def default_scoring_rules():
+    """The process-wide rule set (scoring_rules.json, or the built-in defaults if it is missing)"""
+    global _default_rules
+    if _default_rules is None:
+        if os.path.exists(DEFAULT_RULES_PATH):
+            _default_rules = ScoringRules(DEFAULT_RULES_PATH)
+        else:
+            _default_rules = ScoringRules(config=DEFAULT_RULES)
+    return _default_rules
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,147 @@
+# Tests for the columnar export - writer and reader round trips
+# Every entry and every day's scores must read back from the columns as they were exported.
+
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from columnar_export import NO_PROGRESS_FLAG, ColumnarError, ColumnarReader, export_columnar
+from day_bucketing import DayBucketer
+from triad_tracker import TriadTracker
+
+START = datetime(2026, 3, 2, 9, 0)
+PLUS_FIVE = timezone(timedelta(hours=5, minutes=30))
+
+
+@pytest.fixture(scope="module")
+def tracker():
+    """Two months of mixed entries, some with aware timestamps; all but the last 20 days archived"""
+    built = TriadTracker(bucketer=DayBucketer("UTC"), archive_after_days=20)
+    built.current_date = "2026-04-30"
+    for offset in range(0, 60, 2):
+        moment = START + timedelta(days=offset)
+        built.log_cognitive_effort(1 + offset % 3, ("derivation", "reading")[offset // 2 % 2], f"day {offset}", timestamp=moment)
+        built.log_kinetic_effort("coding", offset % 4 == 0, "", timestamp=moment.replace(tzinfo=PLUS_FIVE))
+        built.log_moral_effort("Islamic_Ethics", 0.5, "ünïcode", timestamp=moment + timedelta(hours=2))
+    built.compact_history()
+    assert len(built.archive) and built.daily_logs
+    return built
+
+
+@pytest.fixture
+def exported(tmp_path, tracker):
+    path = str(tmp_path / "history.mrcl")
+    footer = export_columnar(tracker, path)
+    with ColumnarReader(path) as reader:
+        yield reader, footer
+
+
+def all_entries(tracker):
+    return [(day, entry) for day in tracker.active_day_ordinals() for entry in tracker.get_day_entries(day)]
+
+
+def values(reader, name, table="entries"):
+    column = reader.column(name, table)
+    try:
+        return list(column)
+    finally:
+        column.release()
+
+
+def test_entries_round_trip(exported, tracker):
+    reader, _ = exported
+    expected = all_entries(tracker)
+
+    assert reader.rows() == len(expected)
+    assert values(reader, "day") == [day for day, _ in expected]
+    assert reader.strings("frequency") == [entry["frequency"] for _, entry in expected]
+    assert reader.strings("label") == [entry.get("activity_type", entry.get("topic_area")) for _, entry in expected]
+    assert reader.strings("notes") == [entry["notes"] for _, entry in expected]
+    for value, (_, entry) in zip(values(reader, "value"), expected):
+        number = entry.get("hours", entry.get("time_spent"))
+        assert math.isnan(value) if number is None else value == number
+    assert values(reader, "progress_made") == [
+        int(entry["progress_made"]) if "progress_made" in entry else NO_PROGRESS_FLAG for _, entry in expected
+    ]
+    for micros, suffix, (_, entry) in zip(values(reader, "timestamp"), reader.strings("tz"), expected):
+        wall = datetime(1970, 1, 1) + timedelta(microseconds=micros)
+        assert wall.isoformat() + suffix == entry["timestamp"]
+
+
+def test_days_table_holds_the_daily_scores(exported, tracker):
+    reader, _ = exported
+    days = tracker.active_day_ordinals()
+
+    assert reader.rows("days") == len(days)
+    assert [day.toordinal() for day in reader.dates()] == days
+    first_entries, counts = values(reader, "first_entry", "days"), values(reader, "entry_count", "days")
+    assert counts == [len(tracker.get_day_entries(day)) for day in days]
+    assert first_entries == [sum(counts[:index]) for index in range(len(days))]
+    for frequency in ("cognitive", "kinetic", "moral"):
+        assert values(reader, frequency, "days") == [tracker.calculate_daily_scores(day)[frequency] for day in days]
+
+
+def test_footer_statistics(exported, tracker):
+    reader, footer = exported
+    days = tracker.active_day_ordinals()
+    expected = all_entries(tracker)
+
+    assert reader.stats == footer["stats"]
+    assert reader.stats["first_day"] == tracker.first_active_day()
+    assert reader.stats["last_day"] == tracker.last_active_day()
+    assert reader.stats["span_days"] == days[-1] - days[0] + 1
+    assert reader.stats["entries"] == len(expected)
+    assert reader.column_stats("day") == {"min": days[0], "max": days[-1]}
+    numbers = [entry.get("hours", entry.get("time_spent")) for _, entry in expected]
+    numbers = [number for number in numbers if number is not None]
+    assert reader.column_stats("value") == {"min": min(numbers), "max": max(numbers)}
+    labels = {entry.get("activity_type", entry.get("topic_area")) for _, entry in expected}
+    assert reader.column_stats("label") == {"distinct": len(labels), "min": min(labels), "max": max(labels)}
+
+
+def test_labels_are_dictionary_encoded(exported):
+    reader, _ = exported
+    dictionary = reader.dictionary("label")
+    codes = values(reader, "label")
+
+    assert sorted(dictionary) == sorted(set(dictionary)) == ["Islamic_Ethics", "coding", "derivation", "reading"]
+    assert set(codes) == set(range(len(dictionary)))
+    assert dictionary[codes[0]] == reader.strings("label")[0]
+    with pytest.raises(ColumnarError):
+        reader.dictionary("value")
+    with pytest.raises(ColumnarError):
+        reader.column("missing")
+
+
+def test_empty_export(tmp_path, tracker):
+    for source, start in ((TriadTracker(), None), (tracker, "2030-01-01")):
+        path = str(tmp_path / "empty.mrcl")
+        footer = export_columnar(source, path, start=start)
+        assert footer["stats"] == {"first_day": None, "last_day": None, "days": 0, "span_days": 0, "entries": 0}
+        with ColumnarReader(path) as reader:
+            assert reader.rows() == reader.rows("days") == 0
+            assert values(reader, "value") == [] and reader.strings("label") == []
+            assert reader.column_stats("day") == {}
+
+
+def test_range_export(tmp_path, tracker):
+    path = str(tmp_path / "march.mrcl")
+    export_columnar(tracker, path, start="2026-03-10", end="2026-03-20")
+    with ColumnarReader(path) as reader:
+        assert [day.isoformat() for day in reader.dates()] == tracker.active_days("2026-03-10", "2026-03-20")
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:10],
+    lambda data: data[:-1],
+    lambda data: data[:-12] + (10 ** 9).to_bytes(8, "little") + data[-4:],
+])
+def test_damaged_files_raise_columnar_error(exported, tmp_path, damage):
+    reader, _ = exported
+    with open(reader.path, "rb") as handle:
+        data = handle.read()
+    path = tmp_path / "damaged.mrcl"
+    path.write_bytes(damage(data))
+    with pytest.raises(ColumnarError):
+        ColumnarReader(str(path))
@@ -0,0 +1,136 @@
+# Tests for day bucketing - DST days, custom day-start hours, rebucketing and range edges
+# Every bucketed day is checked against plain wall-clock arithmetic in the user's timezone.
+
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from day_bucketing import MAX_TABLE_DAYS, DayBucketer
+from triad_tracker import TriadTracker
+
+NEW_YORK = ZoneInfo("America/New_York")
+UTC = timezone.utc
+HOUR = 3600
+
+
+def expected_day(seconds, tz, day_start_hour):
+    """Reference answer: the local date of the moment, shifted back by the day-start hour"""
+    local = datetime.fromtimestamp(seconds, tz).replace(tzinfo=None)
+    return (local - timedelta(hours=day_start_hour)).date().toordinal()
+
+
+def test_spring_forward_day_is_23_hours():
+    bucketer = DayBucketer("America/New_York")
+    day = date(2026, 3, 8).toordinal()
+
+    assert bucketer.day_start(day + 1) - bucketer.day_start(day) == 23 * HOUR
+    before = datetime(2026, 3, 8, 1, 59, tzinfo=NEW_YORK)   # EST, just before the clocks jump
+    after = datetime(2026, 3, 8, 3, 0, tzinfo=NEW_YORK)     # EDT, one real minute later
+    assert after.timestamp() - before.timestamp() == 60
+    assert bucketer.day_of(before) == bucketer.day_of(after) == day
+    assert bucketer.day_of(datetime(2026, 3, 8, 23, 59, tzinfo=NEW_YORK)) == day
+    assert bucketer.day_of(datetime(2026, 3, 9, 0, 0, tzinfo=NEW_YORK)) == day + 1
+
+
+def test_fall_back_day_is_25_hours():
+    bucketer = DayBucketer("America/New_York")
+    day = date(2026, 11, 1).toordinal()
+
+    assert bucketer.day_start(day + 1) - bucketer.day_start(day) == 25 * HOUR
+    first = datetime(2026, 11, 1, 1, 30, tzinfo=NEW_YORK)           # EDT
+    second = datetime(2026, 11, 1, 1, 30, fold=1, tzinfo=NEW_YORK)  # EST, an hour later
+    assert second.timestamp() - first.timestamp() == HOUR
+    assert bucketer.day_of(first) == bucketer.day_of(second) == day
+    assert bucketer.day_of(datetime(2026, 11, 1, 23, 59, tzinfo=NEW_YORK)) == day
+
+
+def test_day_start_hour_moves_the_boundary():
+    bucketer = DayBucketer("America/New_York", day_start_hour=4)
+    day = date(2026, 3, 2).toordinal()
+
+    # Naive stamps are wall-clock time in the user's timezone; aware ones are converted
+    assert bucketer.day_of(datetime(2026, 3, 3, 3, 59)) == day
+    assert bucketer.day_of(datetime(2026, 3, 3, 4, 0)) == day + 1
+    assert bucketer.day_of(datetime(2026, 3, 3, 8, 59, tzinfo=UTC)) == day       # 03:59 EST
+    assert bucketer.day_of(datetime(2026, 3, 3, 9, 0, tzinfo=UTC)) == day + 1    # 04:00 EST
+    assert bucketer.day_start(day + 1) == datetime(2026, 3, 3, 4, 0, tzinfo=NEW_YORK).timestamp()
+    # The 2am clock change on March 8 falls before that day's 4am start, so the
+    # 23-hour day is March 7 (04:00 EST to 04:00 EDT)
+    march_7 = date(2026, 3, 7).toordinal()
+    assert bucketer.day_start(march_7 + 1) - bucketer.day_start(march_7) == 23 * HOUR
+    assert bucketer.day_start(march_7 + 2) - bucketer.day_start(march_7 + 1) == 24 * HOUR
+
+    with pytest.raises(ValueError):
+        DayBucketer("UTC", day_start_hour=24)
+
+
+@pytest.mark.parametrize("tz_name, day_start_hour", [
+    ("America/New_York", 0), ("Asia/Kolkata", 4), ("Pacific/Kiritimati", 5), ("Etc/GMT+12", 23),
+])
+def test_matches_wall_clock_arithmetic(tz_name, day_start_hour):
+    bucketer = DayBucketer(tz_name, day_start_hour)
+    tz = ZoneInfo(tz_name)
+    pick = random.Random(tz_name)
+    near = [time.time() + pick.uniform(-5, 5) * 365 * 86400 for _ in range(2000)]
+    far = [pick.uniform(-6.0e10, 2.5e11) for _ in range(200)]  # Outside the table's window
+
+    for seconds in near + far:
+        assert bucketer.day_of_epoch(seconds) == expected_day(seconds, tz, day_start_hour)
+        day = bucketer.day_of_epoch(seconds)
+        assert bucketer.day_start(day) <= seconds < bucketer.day_start(day + 1)
+
+
+def test_outliers_do_not_grow_the_table():
+    bucketer = DayBucketer("America/New_York", 4)
+    bucketer.today()
+
+    began = time.perf_counter()
+    bucketer.day_of(datetime(9998, 1, 1, tzinfo=UTC))
+    bucketer.day_of(datetime(1, 1, 2, tzinfo=UTC))
+    bucketer.day_start(date(5000, 6, 1).toordinal())
+    assert time.perf_counter() - began < 0.1
+    assert len(bucketer._table[1]) <= MAX_TABLE_DAYS + 1
+    assert bucketer.day_of(datetime(9998, 1, 1, tzinfo=UTC)) == date(9997, 12, 31).toordinal()
+
+
+@pytest.mark.parametrize("tz_name", [None, "UTC", "Pacific/Kiritimati", "Etc/GMT+12"])
+def test_edges_of_the_calendar(tz_name):
+    bucketer = DayBucketer(tz_name, 4)
+
+    assert bucketer.day_of(datetime(1, 1, 1, 0, 30, tzinfo=UTC)) == 1
+    assert bucketer.day_of(datetime(1, 1, 1, 2, 0)) == 1   # Naive, before the first day-start
+    assert bucketer.day_of(datetime(9999, 12, 31, 23, 59, tzinfo=UTC)) == date.max.toordinal()
+    with pytest.raises(ValueError):
+        bucketer.day_of_epoch(1e15)
+
+
+def test_logging_near_year_one_with_the_default_bucketer():
+    tracker = TriadTracker()
+    tracker.log_cognitive_effort(1, timestamp=datetime(1, 1, 2, tzinfo=UTC))
+    tracker.log_moral_effort(time_spent=1, timestamp=datetime(1, 1, 1, 0, 5, tzinfo=timezone(timedelta(hours=5))))
+
+    assert tracker.active_days()[0] in ("0001-01-01", "0001-01-02")
+    assert len(tracker.active_days()) <= 2
+
+
+def test_rebucket_refiles_an_existing_history():
+    tracker = TriadTracker(bucketer=DayBucketer("UTC"), archive_after_days=30)
+    tracker.current_date = "2026-06-29"
+    stamps = [datetime(2026, 3, 2, 2, 30, tzinfo=UTC) + timedelta(days=offset) for offset in range(0, 120, 3)]
+    for stamp in stamps:
+        tracker.log_cognitive_effort(1, timestamp=stamp)
+        tracker.log_moral_effort(time_spent=1, timestamp=stamp + timedelta(hours=12))
+    tracker.compact_history()
+    assert len(tracker.archive) and tracker.daily_logs
+
+    # 02:30 UTC is before a 04:00 day start, so those entries move to the previous day
+    moved = tracker.rebucket(DayBucketer("UTC", day_start_hour=4))
+    assert moved == len(stamps)
+    for stamp in stamps:
+        previous = (stamp - timedelta(days=1)).date().isoformat()
+        assert [entry["frequency"] for entry in tracker.get_day_entries(previous)] == ["cognitive"]
+        assert [entry["frequency"] for entry in tracker.get_day_entries(stamp.date().isoformat())] == ["moral"]
+    assert tracker.rebucket() == 0  # Already filed by the current bucketer
@@ -0,0 +1,225 @@
+# Tests for delta sync - wire format, transports and convergence
+# Devices that have exchanged the same operations must hold the same state,
+# and a bad batch from a peer must be rejected without changing anything.
+
+import socket
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from delta_sync import (
+    SyncDevice, SyncError, _recv_frame, _send_frame, decode_delta, encode_delta, read_delta_file,
+    serve_sync, sync_devices, sync_over_socket, write_delta_file, write_vector_file,
+)
+from triad_tracker import MirrorDashboard
+
+START = datetime(2026, 3, 2, 8, 0)
+MISSING = object()  # Marks a field to drop from an entry
+
+
+def device(device_id):
+    return SyncDevice(device_id, MirrorDashboard())
+
+
+def log_some(target, count, offset_hours=0):
+    for index in range(count):
+        moment = START + timedelta(hours=offset_hours + 7 * index)
+        target.log_cognitive_effort(1 + index % 3, "Physics_Fundamentals", f"{target.device_id} {index}", timestamp=moment)
+        target.log_moral_effort("Islamic_Ethics", 0.5, timestamp=moment + timedelta(minutes=30))
+
+
+def state(sync_device):
+    tracker = sync_device.dashboard.tracker
+    return (
+        {day: tracker.get_day_entries(day) for day in tracker.active_days()},
+        sync_device.dashboard.profile.get_profile_summary(),
+    )
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def serve_once(sync_device, port):
+    """Run one serve_sync session in a thread; returns (thread, list collecting any exception)"""
+    errors = []
+
+    def run():
+        try:
+            serve_sync(sync_device, port=port, once=True)
+        except Exception as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, errors
+
+
+def once_listening(call, *args, **kwargs):
+    """Call a client function, retrying while the server thread is still starting up"""
+    for _ in range(100):
+        try:
+            return call(*args, **kwargs)
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    raise RuntimeError("serve_sync did not start listening")
+
+
+def test_delta_encoding_round_trips():
+    laptop = device("laptop")
+    log_some(laptop, 5)
+    laptop.update_identity_pillar("innovator", 6, "Prototype demo")
+    operations = laptop.changes_since({})
+
+    decoded, vector = decode_delta(encode_delta(operations, laptop.version_vector()))
+    assert decoded == operations
+    assert vector == {"laptop": 11}
+
+
+@pytest.mark.parametrize("data", [
+    b"not zlib at all",
+    zlib.compress(b"{not json"),
+    zlib.compress(b"[1, 2, 3]"),
+    zlib.compress(b'{"version": 99, "operations": []}'),
+    zlib.compress(b'{"version": 1, "operations": [], "vector": ["laptop", 3]}'),
+    zlib.compress(b'{"version": 1, "operations": [], "vector": {"laptop": "3"}}'),
+])
+def test_bad_deltas_raise_sync_error(data):
+    with pytest.raises(SyncError):
+        decode_delta(data)
+
+
+def test_devices_converge_whatever_the_sync_order():
+    devices = [device(name) for name in ("laptop", "phone", "tablet")]
+    for offset, member in enumerate(devices):
+        log_some(member, 4, offset_hours=offset)
+    devices[0].update_sunday_dream_progress("sovereignty", 0.2)
+    devices[1].update_sunday_dream_progress("sovereignty", 0.4)
+    devices[2].trigger_shadow_warning("polymath_trap")
+    devices[1].update_identity_pillar("polymath", 8, "Olympiad mock")
+
+    laptop, phone, tablet = devices
+    sync_devices(laptop, phone)
+    sync_devices(tablet, laptop)
+    sync_devices(phone, tablet)
+
+    assert state(laptop) == state(phone) == state(tablet)
+    assert laptop.version_vector() == {"laptop": 9, "phone": 10, "tablet": 9}
+    assert sync_devices(laptop, phone) == (0, 0)
+
+
+def test_file_transport(tmp_path):
+    laptop, phone = device("laptop"), device("phone")
+    log_some(laptop, 3)
+    log_some(phone, 2, offset_hours=2)
+    sync_devices(laptop, phone)
+    log_some(phone, 2, offset_hours=40)
+
+    write_vector_file(laptop, tmp_path / "laptop.vec")
+    size = write_delta_file(phone, tmp_path / "phone.delta", tmp_path / "laptop.vec")
+    assert size == (tmp_path / "phone.delta").stat().st_size
+    assert read_delta_file(laptop, tmp_path / "phone.delta") == 4  # Only what the laptop lacked
+    assert state(laptop) == state(phone)
+
+
+def test_socket_transport():
+    laptop, phone = device("laptop"), device("phone")
+    log_some(laptop, 3)
+    log_some(phone, 2, offset_hours=2)
+    port = free_port()
+    thread, errors = serve_once(phone, port)
+
+    received, applied, transferred = once_listening(sync_over_socket, laptop, port=port)
+    thread.join(5)
+
+    assert (received, applied) == (4, 6)
+    assert transferred > 0
+    assert not errors
+    assert state(laptop) == state(phone)
+
+
+@pytest.mark.parametrize("operations", [
+    [{"type": "entry"}],
+    [{"device": "phone", "seq": 1, "clock": 1, "type": "teleport"}],
+    [{"device": "phone", "seq": "1", "clock": 1, "type": "dream", "name": "sovereignty", "progress": 0.5}],
+    "not a list",
+])
+def test_server_survives_malformed_sessions(operations):
+    phone = device("phone")
+    port = free_port()
+    thread, errors = serve_once(phone, port)
+
+    with once_listening(socket.create_connection, ("127.0.0.1", port), timeout=5) as connection:
+        _send_frame(connection, encode_delta([], {}))
+        _recv_frame(connection)
+        _send_frame(connection, encode_delta(operations))
+        with pytest.raises(ConnectionError):
+            _recv_frame(connection)  # Session dropped without a reply
+    thread.join(5)
+
+    assert not errors and not thread.is_alive()
+    assert phone.version_vector() == {}
+
+
+def test_rejected_batch_changes_nothing():
+    laptop, phone = device("laptop"), device("phone")
+    log_some(laptop, 3)
+    log_some(phone, 2, offset_hours=2)
+    before = state(phone)
+    operations = laptop.changes_since({})
+
+    gapped = operations[:2] + operations[3:]
+    malformed = operations + [dict(operations[0], seq=7, clock=None)]
+    for batch in (gapped, malformed):
+        with pytest.raises(SyncError):
+            phone.apply_changes(batch)
+        assert state(phone) == before
+        assert phone.version_vector() == {"phone": 4}
+
+    assert phone.apply_changes(operations) == 6
+
+
+@pytest.mark.parametrize("index, change", [
+    (0, {"hours": "3"}),
+    (0, {"hours": float("nan")}),
+    (0, {"activity_type": None}),
+    (1, {"topic_area": ["Islamic_Ethics"]}),
+    (1, {"time_spent": True}),
+    (1, {"notes": None}),
+    (1, {"timestamp": "yesterday"}),
+    (1, {"frequency": "meditation"}),
+    (2, {"progress_made": "false"}),
+    (2, {"activity_type": MISSING}),
+])
+def test_malformed_entries_are_rejected(index, change):
+    laptop, phone = device("laptop"), device("phone")
+    log_some(laptop, 1)
+    laptop.log_kinetic_effort("Quaspace_MVP", True, "", timestamp=START)
+    operations = laptop.changes_since({})
+    entry = {key: value for key, value in dict(operations[index]["entry"], **change).items() if value is not MISSING}
+    operations[index] = dict(operations[index], entry=entry)
+
+    with pytest.raises(SyncError):
+        phone.apply_changes(operations)
+    assert phone.version_vector() == {}
+
+
+def test_change_log_save_and_load(tmp_path):
+    laptop, phone = device("laptop"), device("phone")
+    log_some(laptop, 3)
+    laptop.update_identity_pillar("ethical_leader", 5, "Reflection")
+    log_some(phone, 2, offset_hours=2)
+    sync_devices(laptop, phone)
+    path = tmp_path / "laptop.sync"
+    laptop.save(path)
+
+    restored = SyncDevice.load(path)
+    assert restored.device_id == "laptop"
+    assert restored.clock == laptop.clock
+    assert restored.version_vector() == laptop.version_vector()
+    assert state(restored) == state(laptop)
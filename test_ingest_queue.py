@@ -0,0 +1,154 @@
+# Tests for the group-commit queue and its journal
+# Whatever the queue acknowledged must replay into an identical tracker after a restart.
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from ingest_queue import GroupCommitQueue, IngestError, append_journal, replay_journal
+from triad_tracker import TriadTracker
+
+START = datetime(2026, 3, 2, 7, 30)
+
+
+def log_mixed(target, count):
+    """Log `count` entries of every frequency, spread over a few days"""
+    for index in range(count):
+        moment = START + timedelta(hours=5 * index)
+        if index % 3 == 0:
+            target.log_cognitive_effort(1 + index % 4, "NEET_Chemistry", f"set {index}", timestamp=moment)
+        elif index % 3 == 1:
+            target.log_kinetic_effort("Quaspace_MVP", index % 2 == 0, "", timestamp=moment)
+        else:
+            target.log_moral_effort("Governance", 0.5, "ünïcode", timestamp=moment)
+
+
+def history(tracker):
+    return {day: tracker.get_day_entries(day) for day in tracker.active_days()}
+
+
+def test_journal_replays_into_an_identical_tracker(tmp_path):
+    journal = str(tmp_path / "mirror.journal")
+    tracker = TriadTracker()
+    with GroupCommitQueue(tracker, journal, max_latency=0.01) as queue:
+        log_mixed(queue, 60)
+
+    expected = TriadTracker()
+    log_mixed(expected, 60)
+    recovered = TriadTracker()
+    assert replay_journal(journal, recovered) == 60
+    assert history(recovered) == history(tracker) == history(expected)
+
+
+def test_entries_are_grouped_into_batches(tmp_path):
+    tracker = TriadTracker()
+    with GroupCommitQueue(tracker, str(tmp_path / "mirror.journal"), max_batch=16, max_latency=5) as queue:
+        log_mixed(queue, 100)
+        assert queue.flush(timeout=10)
+        # Full batches go out without waiting for max_latency; the remainder on flush
+        assert 100 / 16 <= queue.batches_committed <= 100 / 16 + 1
+    assert sum(len(entries) for entries in history(tracker).values()) == 100
+
+
+def test_pending_entries_are_visible_through_the_queue(tmp_path):
+    tracker = TriadTracker()
+    with GroupCommitQueue(tracker, str(tmp_path / "mirror.journal"), max_latency=5) as queue:
+        queue.log_cognitive_effort(3, timestamp=START)
+        day = START.date().isoformat()
+
+        assert queue.pending_count() == 1
+        assert tracker.get_day_entries(day) is None
+        assert len(queue.get_day_entries(day)) == 1
+        assert queue.active_days() == [day]
+        assert queue.calculate_daily_scores(day)["cognitive"] > 0
+
+        assert queue.flush(timeout=10)
+        assert queue.pending_count() == 0
+        assert queue.calculate_daily_scores(day) == tracker.calculate_daily_scores(day)
+
+
+def test_when_durable_fires_after_the_commit(tmp_path):
+    journal = str(tmp_path / "mirror.journal")
+    fired = threading.Event()
+    results = []
+
+    def callback(error):
+        # Runs once the entry is in the journal and applied
+        results.append((error, replay_journal(journal, TriadTracker())))
+        fired.set()
+
+    with GroupCommitQueue(TriadTracker(), journal, max_latency=0.05) as queue:
+        queue.log_moral_effort(time_spent=1, timestamp=START)
+        queue.when_durable(callback)
+        assert fired.wait(10)
+        assert results == [(None, 1)]
+
+        # Nothing pending: the callback runs right away
+        queue.when_durable(results.append)
+        assert results[-1] is None
+
+
+def test_journal_write_failure_is_reported(tmp_path):
+    queue = GroupCommitQueue(TriadTracker(), str(tmp_path / "mirror.journal"), max_latency=0.01)
+    errors = []
+    queue.submit({"frequency": "cognitive", "hours": 1, "notes": object(), "timestamp": START.isoformat()})
+    queue.when_durable(errors.append)
+
+    with pytest.raises(IngestError):
+        queue.flush(timeout=10)
+    assert errors and errors[0].startswith("Journal write failed")
+    with pytest.raises(IngestError):
+        queue.log_cognitive_effort(1)
+    with pytest.raises(IngestError):
+        queue.close()
+
+
+def test_entries_behind_a_failed_batch_are_dropped(tmp_path):
+    tracker = TriadTracker()
+    queue = GroupCommitQueue(tracker, str(tmp_path / "mirror.journal"), max_batch=1, max_latency=0)
+    writing = threading.Event()
+    release = threading.Event()
+
+    def failing_write(batch):
+        writing.set()
+        release.wait(10)
+        raise OSError("disk full")
+
+    queue._write_batch = failing_write
+    queue.log_cognitive_effort(1, timestamp=START)
+    assert writing.wait(10)
+    queue.log_moral_effort(time_spent=1, timestamp=START)  # Queued behind the failing batch
+    queue.log_kinetic_effort(timestamp=START + timedelta(days=1))
+    errors = []
+    queue.when_durable(errors.append)
+    assert queue.get_day_entries(START.date()) and len(queue.active_days()) == 2
+    release.set()
+
+    with pytest.raises(IngestError, match="disk full"):
+        queue.flush(timeout=10)
+    assert errors == ["Journal write failed: disk full"]
+    assert queue.get_day_entries(START.date()) is None and queue.active_days() == []
+    assert tracker.get_day_entries(START.date()) is None
+    with pytest.raises(IngestError, match="disk full"):
+        queue.flush(timeout=10)  # Fails straight away rather than waiting on a dead writer
+    queue.when_durable(errors.append)
+    assert errors[-1] == errors[0]
+    with pytest.raises(IngestError, match="disk full"):
+        queue.log_cognitive_effort(1)
+    with pytest.raises(IngestError):
+        queue.close()
+
+
+def test_replay_ignores_a_torn_final_line(tmp_path):
+    journal = str(tmp_path / "mirror.journal")
+    tracker = TriadTracker()
+    log_mixed(tracker, 9)
+    records = [(day, entry) for day in tracker.day_index for entry in tracker.get_day_entries(day)]
+    append_journal(journal, records[:-1])
+    with open(journal, "ab") as handle:
+        handle.write(b'{"day": 739000, "entry": {"frequency": "cogn')
+
+    recovered = TriadTracker()
+    assert replay_journal(journal, recovered) == len(records) - 1
+    assert replay_journal(str(tmp_path / "missing.journal"), TriadTracker()) == 0
@@ -0,0 +1,126 @@
+# Tests for instrumentation - timing hooks, report sections and metrics export
+# Enabling must time the listed methods; disabling must leave the classes untouched.
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import instrumentation
+from instrumentation import INSTRUMENTED_METHODS, REPORT_SECTIONS, Histogram, MetricsRegistry, instrumented
+from mirror_system import MirrorSystem
+from profile_of_x import ProfileOfX
+from triad_tracker import MirrorDashboard, TriadTracker
+
+OWNERS = {"TriadTracker": TriadTracker, "MirrorSystem": MirrorSystem, "ProfileOfX": ProfileOfX, "MirrorDashboard": MirrorDashboard}
+
+
+@pytest.fixture(autouse=True)
+def disabled_afterwards():
+    yield
+    instrumentation.disable()
+
+
+def dashboard_with_a_week():
+    dashboard = MirrorDashboard()
+    tracker = dashboard.tracker
+    for days_ago in range(5):
+        moment = datetime.fromisoformat(tracker.current_date) - timedelta(days=days_ago) + timedelta(hours=9)
+        tracker.log_cognitive_effort(2, "derivation", timestamp=moment)
+        tracker.log_kinetic_effort("coding", True, timestamp=moment)
+    return dashboard
+
+
+def test_disable_restores_the_original_methods():
+    originals = {(owner, method): OWNERS[owner].__dict__[method] for _, owner, method in INSTRUMENTED_METHODS}
+
+    registry = instrumentation.enable(MetricsRegistry())
+    assert instrumentation.is_enabled() and instrumentation.active_registry() is registry
+    assert all(OWNERS[owner].__dict__[method] is not original for (owner, method), original in originals.items())
+    other = instrumentation.enable(MetricsRegistry())  # Swaps the registry without wrapping twice
+    assert OWNERS["TriadTracker"].__dict__["calculate_daily_scores"].__wrapped__ is originals["TriadTracker", "calculate_daily_scores"]
+
+    instrumentation.disable()
+    assert not instrumentation.is_enabled() and instrumentation.active_registry() is None
+    assert all(OWNERS[owner].__dict__[method] is original for (owner, method), original in originals.items())
+    TriadTracker().calculate_daily_scores()
+    assert not other.calls
+
+
+def test_calls_and_errors_are_counted():
+    tracker = TriadTracker()
+    with instrumented(MetricsRegistry()) as registry:
+        for _ in range(3):
+            tracker.log_moral_effort(time_spent=1)
+        with pytest.raises(ValueError):
+            tracker.calculate_daily_scores("not a date")
+
+    assert registry.calls["TriadTracker.log_moral_effort"].count == 3
+    assert registry.calls["TriadTracker.calculate_daily_scores"].count == 1
+    assert registry.errors == {"TriadTracker.calculate_daily_scores": 1}
+    assert not registry.sections  # No report was built
+    assert not instrumentation.is_enabled()
+
+
+def test_each_report_section_is_attributed_once():
+    dashboard = dashboard_with_a_week()
+    with instrumented(MetricsRegistry()) as registry:
+        dashboard.generate_daily_report()
+        dashboard.tracker.calculate_daily_scores()  # Outside the report: a call, not a section
+
+    assert set(registry.sections) == set(REPORT_SECTIONS.values())
+    assert all(histogram.count == 1 for histogram in registry.sections.values())
+    # get_weekly_average scores every logged day of the week, but only the top-level call is a section
+    assert registry.calls["TriadTracker.calculate_daily_scores"].count == 1 + 5 + 1
+    assert registry.calls["MirrorDashboard.generate_daily_report"].count == 1
+    report = registry.calls["MirrorDashboard.generate_daily_report"].sum
+    assert sum(histogram.sum for histogram in registry.sections.values()) <= report
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(0.001, 0.01, 0.1))
+    for value in [0.0005] * 50 + [0.005] * 45 + [0.05] * 4 + [5]:
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(0.95) == 0.01
+    assert histogram.quantile(0.99) == 0.1
+    assert histogram.quantile(1) == float("inf")
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_output():
+    registry = MetricsRegistry(buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.002, 0.5):
+        registry.observe_call("TriadTracker.log_cognitive_effort", seconds)
+    registry.observe_section("triad_scores", 0.002)
+    registry.count_error("TriadTracker.log_cognitive_effort")
+
+    lines = registry.to_prometheus().splitlines()
+    assert "# TYPE mirror_call_seconds histogram" in lines
+    assert "# TYPE mirror_report_section_seconds histogram" in lines
+    assert "# TYPE mirror_call_errors_total counter" in lines
+    method = 'method="TriadTracker.log_cognitive_effort"'
+    assert [line.rsplit(" ", 1)[1] for line in lines if line.startswith(f"mirror_call_seconds_bucket{{{method}")] == ["1", "2", "3"]
+    assert f'mirror_call_seconds_bucket{{{method},le="+Inf"}} 3' in lines
+    assert f"mirror_call_seconds_count{{{method}}} 3" in lines
+    assert f"mirror_call_seconds_sum{{{method}}} {0.0005 + 0.002 + 0.5}" in lines
+    assert 'mirror_report_section_seconds_count{section="triad_scores"} 1' in lines
+    assert f"mirror_call_errors_total{{{method}}} 1" in lines
+
+
+def test_json_output(tmp_path):
+    registry = MetricsRegistry(buckets=(0.001, 0.01))
+    registry.observe_call("ProfileOfX.get_profile_summary", 0.004)
+    registry.observe_section("priority_actions", 0.02)
+    path = tmp_path / "metrics.json"
+    registry.dump_json(path)
+
+    data = json.loads(path.read_text())
+    assert data == json.loads(registry.to_json())
+    call = data["calls"]["ProfileOfX.get_profile_summary"]
+    assert (call["count"], call["p50"], call["buckets"]) == (1, 0.01, {"0.001": 0, "0.01": 1, "+Inf": 0})
+    assert data["report_sections"]["priority_actions"]["buckets"]["+Inf"] == 1
+    assert data["errors"] == {}
+    registry.reset()
+    assert registry.to_dict() == {"calls": {}, "report_sections": {}, "errors": {}}
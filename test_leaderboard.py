@@ -0,0 +1,122 @@
+# Tests for the leaderboard - incremental boards, the quantile sketch and pruning
+# Totals must always equal a fresh sum over the recorded days, however they were fed.
+
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from leaderboard import Leaderboard, QuantileSketch, period_end, period_of, period_start
+
+MONDAY = date(2026, 3, 2)
+
+
+def board():
+    return Leaderboard()
+
+
+def scores(kinetic=0, cognitive=0, moral=0):
+    return {"cognitive": cognitive, "kinetic": kinetic, "moral": moral}
+
+
+def test_rank_percentile_and_top():
+    leaderboard = board()
+    for user_id, kinetic in (("ana", 3), ("ben", 7), ("cy", 3), ("dee", 1)):
+        leaderboard.update_user_day(user_id, MONDAY, scores(kinetic))
+
+    assert leaderboard.rank("ben", "kinetic", "day", MONDAY) == (1, 4)
+    assert leaderboard.rank("ana", "kinetic", "day", MONDAY) == leaderboard.rank("cy", "kinetic", "day", MONDAY) == (2, 4)
+    assert leaderboard.rank("dee", "kinetic", "day", MONDAY) == (4, 4)
+    assert leaderboard.percentile("ana", "kinetic", "day", MONDAY) == 75.0
+    assert leaderboard.top("kinetic", "day", MONDAY, k=2) == [("ben", 7), ("cy", 3)]
+    assert leaderboard.rank("eve", "kinetic", "day", MONDAY) is None
+    assert leaderboard.cohort_summary("ben", "kinetic", "month", MONDAY)["cohort_size"] == 4
+
+
+def test_windows_sum_the_days_and_updates_replace_them():
+    leaderboard = board()
+    pick = random.Random(38)
+    recorded = {}
+    for _ in range(500):
+        user_id = pick.choice(["ana", "ben", "cy"])
+        day = MONDAY + timedelta(days=pick.randrange(0, 90))
+        kinetic = pick.choice([0, 1, 2.5, 3])
+        leaderboard.update_user_day(user_id, day, scores(kinetic))
+        recorded[user_id, day] = kinetic
+
+    for window in ("day", "week", "month", "year"):
+        expected = {}
+        for (user_id, day), kinetic in recorded.items():
+            key = (period_of(window, day.toordinal()), user_id)
+            expected[key] = expected.get(key, 0) + kinetic
+        for (period, user_id), total in expected.items():
+            totals = leaderboard.boards["kinetic", window, period].totals
+            assert totals[user_id] == pytest.approx(total)
+
+
+def test_periods():
+    day = date(2026, 2, 18).toordinal()
+    assert date.fromordinal(period_start("week", period_of("week", day))) == date(2026, 2, 16)
+    assert date.fromordinal(period_end("month", period_of("month", day))) == date(2026, 2, 28)
+    assert date.fromordinal(period_end("year", period_of("year", day))) == date(2026, 12, 31)
+
+
+def test_sketch_quantiles_are_within_the_relative_accuracy():
+    pick = random.Random(7)
+    values = [pick.lognormvariate(1, 1.5) for _ in range(5000)] + [0] * 300
+    sketch = QuantileSketch(0.01)
+    for value in values:
+        sketch.add(value)
+    values.sort()
+
+    for q in (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1):
+        actual = values[math.floor(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(actual, rel=0.01 + 1e-9, abs=1e-9)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_sketches_merge_and_forget():
+    pick = random.Random(8)
+    first, second, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for index in range(2000):
+        value = pick.uniform(0.1, 50)
+        (first if index % 2 else second).add(value)
+        combined.add(value)
+    assert first.merge(second).buckets == combined.buckets
+    assert first.count == combined.count == 2000
+
+    extra = QuantileSketch()
+    extra.add(3)
+    extra.remove(3)
+    assert extra.count == 0 and not extra.buckets
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(0.05))
+
+
+def test_a_pruned_day_updated_later_is_not_double_counted():
+    leaderboard = board()
+    day = date(2026, 2, 10)
+    leaderboard.update_user_day("ana", day, scores(5))
+    leaderboard.prune("2026-02-15")
+    assert leaderboard.rank("ana", "kinetic", "day", day) is None  # Its day board is gone
+
+    leaderboard.update_user_day("ana", day, scores(6))
+    assert leaderboard.cohort_summary("ana", "kinetic", "month", day)["total"] == 6
+    assert leaderboard.cohort_summary("ana", "kinetic", "year", day)["total"] == 6
+    assert leaderboard.rank("ana", "kinetic", "day", day) is None  # Not recreated from the change alone
+
+
+def test_prune_forgets_days_once_all_their_periods_are_gone():
+    leaderboard = Leaderboard(windows=("day", "month"))
+    january, february = date(2026, 1, 20), date(2026, 2, 10)
+    leaderboard.update_user_day("ana", january, scores(4))
+    leaderboard.update_user_day("ana", february, scores(2))
+    leaderboard.prune("2026-02-15")
+
+    assert set(leaderboard._user_days["ana"]) == {february.toordinal()}
+    assert {key[2] for key in leaderboard.boards} == {period_of("month", february.toordinal())}
+    leaderboard.update_user_day("ben", january, scores(9))  # Every period of that day is pruned
+    assert "ben" not in leaderboard._user_days
+    assert {key[2] for key in leaderboard.boards} == {period_of("month", february.toordinal())}
+    assert leaderboard.top("kinetic", "month", february) == [("ana", 2)]
@@ -0,0 +1,32 @@
+# Tests for the command-line entry points
+# Building an app and logging from the command line stay quiet; only the menu prints the banner.
+
+import main
+from ingest_queue import replay_journal
+from triad_tracker import TriadTracker
+
+
+def test_building_an_app_prints_nothing(tmp_path, capsys):
+    main.MirrorApp.from_state_dir(str(tmp_path))
+    main.MirrorApp()
+
+    assert capsys.readouterr().out == ""
+
+
+def test_log_command_prints_only_its_confirmation(tmp_path, capsys):
+    assert main.main(["log", "cognitive", "2", "--type", "derivation", "--state-dir", str(tmp_path)]) == 0
+
+    journal = tmp_path / main.JOURNAL_FILE
+    assert capsys.readouterr().out == f"✓ Cognitive effort logged to {journal}\n"
+    tracker = TriadTracker()
+    assert replay_journal(str(journal), tracker) == 1
+    assert tracker.get_day_entries()[0]["activity_type"] == "derivation"
+
+
+def test_menu_prints_the_banner(monkeypatch, capsys):
+    monkeypatch.setattr("builtins.input", lambda prompt="": "4")
+    main.MirrorApp().run()
+
+    out = capsys.readouterr().out
+    assert out.startswith("Initializing The Mirror - Systems Architect Edition\n")
+    assert "MAIN MENU" in out
@@ -0,0 +1,286 @@
+# Tests for the Mirror Service - endpoints, batching, keep-alive and error statuses
+# Each test runs a real MirrorService on an ephemeral port (an event loop in a
+# background thread) and talks to it through MirrorClient.
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+import instrumentation
+from ingest_queue import GroupCommitQueue, replay_journal
+from mirror_service import MAX_BODY_BYTES, MirrorClient, MirrorService, ServiceError
+from triad_tracker import MirrorDashboard, TriadTracker
+
+DAY = "2026-03-02"
+MORNING = f"{DAY}T09:00:00"
+
+
+@contextmanager
+def running(service):
+    """Serve `service` on an event loop in a background thread for the duration of the block"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(service.start(), loop).result(5)
+        yield service
+    finally:
+        asyncio.run_coroutine_threadsafe(service.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+@pytest.fixture
+def service():
+    with running(MirrorService(port=0)) as started:
+        yield started
+
+
+@pytest.fixture
+def client(service):
+    with MirrorClient(port=service.port) as connected:
+        yield connected
+
+
+def raw_request(client, method, path, body=b""):
+    """Send a request body as-is and return (status, decoded JSON)"""
+    client.connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = client.connection.getresponse()
+    return response.status, json.loads(response.read() or b"{}")
+
+
+def error_status(call, *args, **kwargs):
+    with pytest.raises(ServiceError) as caught:
+        call(*args, **kwargs)
+    return caught.value.status
+
+
+def test_log_endpoints_file_entries_and_score_them(client):
+    cognitive = client.log_cognitive_effort(2.5, "NEET_Biology", "cell cycle", timestamp=MORNING)
+    kinetic = client.log_kinetic_effort("Quaspace_MVP", True, "api", timestamp=f"{DAY}T10:00:00")
+    moral = client.log_moral_effort("Islamic_Ethics", 1.0, "reading", timestamp=f"{DAY}T11:00:00")
+
+    assert cognitive["hours"] == 2.5 and cognitive["activity_type"] == "NEET_Biology"
+    assert kinetic["progress_made"] is True
+    assert moral["topic_area"] == "Islamic_Ethics"
+
+    scores = client.get_scores(DAY)
+    assert list(scores) == [DAY]
+    assert scores[DAY]["cognitive"] > 0 and scores[DAY]["kinetic"] > 0 and scores[DAY]["moral"] > 0
+
+
+def test_scores_cover_only_logged_days_in_range(client):
+    client.log_cognitive_effort(1, timestamp=MORNING)
+    client.log_cognitive_effort(1, timestamp="2026-03-05T09:00:00")
+
+    assert list(client.get_scores("2026-03-01", "2026-03-04")) == [DAY]
+    assert sorted(client.get_scores("2026-03-01", "2026-03-31")) == [DAY, "2026-03-05"]
+    assert client.get_scores("2026-04-01") == {}
+
+
+def test_batch_logs_every_entry(client):
+    logged = client.log_batch([
+        {"frequency": "cognitive", "hours": 1, "timestamp": MORNING},
+        {"frequency": "kinetic", "activity_type": "Quaspace_MVP", "timestamp": MORNING},
+        {"frequency": "moral", "time_spent": 0.5, "timestamp": MORNING},
+    ])
+
+    assert logged == 3
+    assert client.get_scores(DAY)[DAY]["moral"] > 0
+
+
+def test_rejected_batch_logs_nothing(client):
+    batch = [
+        {"frequency": "cognitive", "hours": 1, "timestamp": MORNING},
+        {"frequency": "moral", "topic_area": 5, "timestamp": MORNING},
+    ]
+
+    with pytest.raises(ServiceError) as caught:
+        client.log_batch(batch)
+    assert caught.value.status == 400
+    assert caught.value.message.startswith("Entry 1:")
+    assert client.get_scores(DAY) == {}
+
+
+def test_report_requests_share_one_computation(service):
+    calls = []
+    original = service.dashboard.generate_daily_report
+
+    def slow_report():
+        calls.append(threading.get_ident())
+        time.sleep(0.5)
+        return original()
+
+    service.dashboard.generate_daily_report = slow_report
+    barrier = threading.Barrier(4)
+    reports = []
+
+    def fetch():
+        with MirrorClient(port=service.port) as client:
+            barrier.wait()
+            reports.append(client.generate_daily_report())
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(reports) == 4
+    assert len(calls) == 1
+    assert all(report == reports[0] for report in reports)
+
+
+def test_report_requests_after_a_change_start_a_new_computation(service, client):
+    calls = []
+    started = threading.Event()
+    original = service.dashboard.generate_daily_report
+
+    def slow_report():
+        calls.append(service.dashboard.tracker.version)
+        started.set()
+        time.sleep(0.3)
+        return original()
+
+    service.dashboard.generate_daily_report = slow_report
+    reports = []
+
+    def fetch():
+        with MirrorClient(port=service.port) as other:
+            reports.append(other.generate_daily_report())
+
+    first = threading.Thread(target=fetch)
+    first.start()
+    assert started.wait(5)
+    client.log_cognitive_effort(2)  # Acknowledged before the next report request
+    second = threading.Thread(target=fetch)
+    second.start()
+    first.join(10)
+    second.join(10)
+
+    assert len(reports) == 2
+    assert len(calls) == 2 and calls[1] > calls[0]
+
+
+def test_client_reuses_one_keep_alive_connection(client):
+    client.log_cognitive_effort(1, timestamp=MORNING)
+    connection = client.connection.sock
+
+    client.get_scores(DAY)
+    error_status(client.log_cognitive_effort, "many")  # An error response keeps the connection too
+    client.log_moral_effort(time_spent=1, timestamp=MORNING)
+
+    assert client.connection.sock is connection
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/log/cognitive", {}),                                        # Missing hours
+    ("/log/cognitive", {"hours": "two"}),
+    ("/log/cognitive", {"hours": 1, "activity_type": ["study"]}),
+    ("/log/kinetic", {"notes": 7}),
+    ("/log/kinetic", {"progress_made": "false"}),
+    ("/log/kinetic", {"progress_made": 0}),
+    ("/log/moral", {"topic_area": {"name": "ethics"}}),
+    ("/log/moral", {"timestamp": "yesterday"}),
+    ("/log/batch", {"entries": "all of them"}),
+    ("/log/batch", {"entries": [{"frequency": "spiritual"}]}),
+    ("/log/batch", {"entries": [{"frequency": "kinetic", "activity_type": 3}]}),
+])
+def test_invalid_fields_are_rejected(client, path, payload):
+    assert error_status(client.request, "POST", path, payload) == 400
+
+
+def test_malformed_bodies_and_queries_are_rejected(client):
+    assert raw_request(client, "POST", "/log/cognitive", b"{not json")[0] == 400
+    assert raw_request(client, "POST", "/log/cognitive", b"[1, 2]")[0] == 400
+    for number in (b"NaN", b"Infinity", b"-Infinity", b"1e999"):
+        assert raw_request(client, "POST", "/log/cognitive", b'{"hours": ' + number + b"}")[0] == 400
+        assert raw_request(client, "POST", "/log/moral", b'{"time_spent": ' + number + b"}")[0] == 400
+    assert client.get_scores() == {}
+    assert error_status(client.get_scores, "03/02/2026") == 400
+    assert error_status(client.get_scores, "2026-03-05", "2026-03-01") == 400
+
+
+def test_unknown_paths_and_methods(client):
+    assert error_status(client.request, "GET", "/nothing-here") == 404
+    assert error_status(client.request, "GET", "/log/cognitive") == 405
+    assert error_status(client.request, "POST", "/scores", {}) == 405
+
+
+def test_metrics_come_from_the_enabled_registry(client):
+    assert error_status(client.request, "GET", "/metrics.json") == 404
+
+    registry = instrumentation.enable(instrumentation.MetricsRegistry())
+    try:
+        client.log_cognitive_effort(1, timestamp=MORNING)
+        client.get_scores(DAY)
+        metrics = client.request("GET", "/metrics.json")
+        client.connection.request("GET", "/metrics")
+        response = client.connection.getresponse()
+        text = response.read().decode("utf-8")
+    finally:
+        instrumentation.disable()
+
+    assert metrics["calls"]["TriadTracker.log_cognitive_effort"]["count"] == 1
+    assert metrics["calls"]["TriadTracker.calculate_daily_scores"]["count"] == 1
+    assert not instrumentation.metrics.calls  # The global registry was never enabled
+    assert response.status == 200
+    assert 'mirror_call_seconds_count{method="TriadTracker.log_cognitive_effort"} 1' in text.splitlines()
+
+
+def test_kinetic_progress_flag_is_kept(client):
+    assert client.log_kinetic_effort("Quaspace_MVP", False, timestamp=MORNING)["progress_made"] is False
+    assert client.get_scores(DAY)[DAY]["kinetic"] == 0
+
+
+@pytest.mark.parametrize("framing, status", [
+    (b"Transfer-Encoding: chunked\r\n", 501),
+    (b"Content-Length: -5\r\n", 400),
+])
+def test_unsupported_body_framing_is_refused(service, framing, status):
+    with socket.create_connection(("127.0.0.1", service.port), timeout=5) as connection:
+        connection.sendall(b"POST /log/cognitive HTTP/1.1\r\nHost: localhost\r\n" + framing + b"\r\n"
+                           b'd\r\n{"hours": 1}\r\n0\r\n\r\n')
+        reply = b""
+        while chunk := connection.recv(4096):
+            reply += chunk  # The server closes the connection after refusing
+
+    assert reply.startswith(f"HTTP/1.1 {status} ".encode())
+    assert b"Connection: close" in reply
+    assert service.dashboard.tracker.get_day_entries() is None
+
+
+def test_oversized_body_is_refused(service):
+    head = (
+        f"POST /log/batch HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {MAX_BODY_BYTES + 1}\r\n\r\n"
+    )
+    with socket.create_connection(("127.0.0.1", service.port), timeout=5) as connection:
+        connection.sendall(head.encode("latin-1"))
+        response = connection.recv(65536)
+
+    assert response.startswith(b"HTTP/1.1 413 ")
+    assert b"Connection: close" in response
+
+
+def test_log_replies_only_after_group_commit(tmp_path):
+    journal = tmp_path / "mirror.journal"
+    dashboard = MirrorDashboard()
+    queue = GroupCommitQueue(dashboard.tracker, str(journal), max_latency=0.05)
+
+    with running(MirrorService(dashboard, port=0, ingest=queue)) as service:
+        with MirrorClient(port=service.port) as client:
+            client.log_cognitive_effort(2, timestamp=MORNING)
+            # Answered, so already in the journal and applied to the tracker
+            recovered = TriadTracker()
+            assert replay_journal(str(journal), recovered) == 1
+            assert client.get_scores(DAY) == {DAY: recovered.calculate_daily_scores(DAY)}
+
+            assert client.log_batch([{"frequency": "moral", "time_spent": 1, "timestamp": MORNING}]) == 1
+            assert replay_journal(str(journal), TriadTracker()) == 2
@@ -0,0 +1,185 @@
+# Tests for the binary snapshot - save/restore round trips and corruption handling
+# A restored dashboard must read back the same history, aggregates and profile.
+
+import json
+import mmap
+import os
+from datetime import datetime
+
+import pytest
+
+import mirror_snapshot
+from day_bucketing import DayBucketer
+from mirror_snapshot import SECTION_TRACKER, SnapshotError, _read_directory, load_snapshot, save_snapshot
+from triad_tracker import MirrorDashboard
+from workload import WorkloadGenerator
+
+END_DATE = "2026-06-29"
+
+
+@pytest.fixture(scope="module")
+def dashboard():
+    generator = WorkloadGenerator(seed=11, years=1, end_date=datetime.fromisoformat(END_DATE))
+    built = generator.build_dashboards(archive_after_days=30)[generator.user_ids()[0]]
+    built.profile.update_identity_pillar("polymath", 7, "Finished the genetics unit")
+    built.profile.trigger_shadow_warning("dreamer_delay")
+    built.tracker.journal_seq = 4
+    return built
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, dashboard):
+    path = str(tmp_path / "mirror.snapshot")
+    save_snapshot(dashboard, path)
+    return path
+
+
+def history(tracker):
+    return {day: tracker.get_day_entries(day) for day in tracker.active_days()}
+
+
+def test_save_returns_the_file_size(tmp_path, dashboard):
+    path = str(tmp_path / "mirror.snapshot")
+    assert save_snapshot(dashboard, path) == os.path.getsize(path)
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_restore_round_trips_history_and_profile(snapshot_path, dashboard):
+    restored = load_snapshot(snapshot_path, verify=True)
+    tracker = restored.tracker
+
+    assert dashboard.tracker.daily_logs and len(dashboard.tracker.archive)  # Both tiers are exercised
+    assert history(tracker) == history(dashboard.tracker)
+    assert tracker.current_date == END_DATE
+    assert tracker.calculate_daily_scores(END_DATE) == dashboard.tracker.calculate_daily_scores(END_DATE)
+    assert tracker.weekly_average == dashboard.tracker.weekly_average
+    assert tracker.journal_seq == 4
+    assert restored.profile.get_profile_summary() == dashboard.profile.get_profile_summary()
+    restored.tracker.archive.close()
+
+
+def test_resaving_a_restored_dashboard_is_stable(tmp_path, snapshot_path, dashboard):
+    restored = load_snapshot(snapshot_path)
+    copy_path = str(tmp_path / "copy.snapshot")
+    save_snapshot(restored, copy_path)
+
+    assert history(load_snapshot(copy_path).tracker) == history(dashboard.tracker)
+
+
+def test_logging_into_a_restored_archived_day_thaws_it(snapshot_path, dashboard):
+    restored = load_snapshot(snapshot_path)
+    day = restored.tracker.archive.days()[0]
+    before = len(restored.tracker.get_day_entries(day))
+
+    restored.tracker.log_moral_effort(time_spent=1, timestamp=datetime.fromisoformat(f"{day}T21:00:00"))
+    assert len(restored.tracker.get_day_entries(day)) == before + 1
+    assert day not in restored.tracker.archive
+
+
+def test_day_boundaries_are_restored(tmp_path):
+    generator = WorkloadGenerator(seed=3, years=1, end_date=datetime.fromisoformat(END_DATE))
+    dashboard = generator.build_dashboards()[generator.user_ids()[0]]
+    dashboard.tracker.rebucket(DayBucketer("Asia/Kolkata", 4))
+    path = str(tmp_path / "mirror.snapshot")
+    save_snapshot(dashboard, path)
+
+    bucketer = load_snapshot(path).tracker.bucketer
+    assert (bucketer.tz_name, bucketer.day_start_hour) == ("Asia/Kolkata", 4)
+
+
+def test_archive_owns_and_releases_the_mapping(snapshot_path, dashboard):
+    restored = load_snapshot(snapshot_path)
+    archive = restored.tracker.archive
+    mapping = archive._mapping
+    assert mapping is not None and not mapping.closed
+
+    # Restoring again into the same dashboard closes the archive it replaces
+    load_snapshot(snapshot_path, restored)
+    assert mapping.closed
+    assert archive.get_day(archive.days()[0]) == dashboard.tracker.get_day_entries(archive.days()[0])
+
+    current = restored.tracker.archive
+    current.close()
+    assert history(restored.tracker) == history(dashboard.tracker)
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: b"",
+    lambda data: data[:10],
+    lambda data: b"XXXX" + data[4:],
+    lambda data: data[:-1],
+])
+def test_damaged_snapshots_raise_snapshot_error(snapshot_path, damage):
+    with open(snapshot_path, "rb") as handle:
+        data = handle.read()
+    with open(snapshot_path, "wb") as handle:
+        handle.write(damage(data))
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(snapshot_path)
+
+
+def flip_byte(path, offset):
+    with open(path, "r+b") as handle:
+        handle.seek(offset, os.SEEK_END if offset < 0 else os.SEEK_SET)
+        byte = handle.read(1)
+        handle.seek(-1, os.SEEK_CUR)
+        handle.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_corrupt_history_is_caught_when_verifying(snapshot_path):
+    flip_byte(snapshot_path, -3)
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(snapshot_path, verify=True)
+
+
+def test_corrupt_block_without_verify_fails_on_first_read(snapshot_path, dashboard):
+    flip_byte(snapshot_path, -3)
+    tracker = load_snapshot(snapshot_path).tracker
+
+    with pytest.raises(ValueError, match="Corrupt archive block"):
+        for day in tracker.active_days():
+            tracker.get_day_entries(day)
+    tracker.archive.close()
+
+
+@pytest.fixture
+def mappings(monkeypatch):
+    """Every mmap load_snapshot opens"""
+    opened = []
+
+    class RecordingMap(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+
+    monkeypatch.setattr(mirror_snapshot.mmap, "mmap", RecordingMap)
+    return opened
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:30],                                          # Directory runs past the end
+    lambda data: data.replace(b"MRAR", b"XXXX"),                     # History is not an archive
+    lambda data: data.replace(b'"archive_cache_size"', b'"archive_cache_sizX"'),  # Tracker section checksum
+])
+def test_failed_load_unmaps_the_file_and_changes_nothing(tmp_path, snapshot_path, mappings, damage):
+    with open(snapshot_path, "rb") as handle:
+        data = handle.read()
+    path = tmp_path / "damaged.snapshot"
+    path.write_bytes(damage(data))
+    target = MirrorDashboard()
+    target.profile.update_identity_pillar("polymath", 2, "before")
+    before = target.profile.get_profile_summary()
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(path), target, verify=False)
+    assert len(mappings) == 1 and mappings[0].closed
+    assert target.profile.get_profile_summary() == before
+    assert target.tracker.journal_seq == 0
+
+
+def test_tracker_metadata_holds_only_what_restore_reads(snapshot_path):
+    with open(snapshot_path, "rb") as handle:
+        data = handle.read()
+    meta = json.loads(bytes(_read_directory(data, verify=False)[SECTION_TRACKER]))
+    assert "hot_days" not in meta
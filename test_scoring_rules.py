@@ -0,0 +1,162 @@
+# Tests for the scoring rules - the generated scorer and hot reloading
+# The compiled rules must score exactly like the hand-written chain they replaced,
+# and a broken edit to the rule file must never replace working rules.
+
+import copy
+import json
+import random
+import time
+
+import pytest
+
+from scoring_rules import DEFAULT_RULES, CompiledRules, ScoringRules, ScoringRulesError
+
+LABELS = ["derivation", "first_principles", "problem_solving", "reading", "coding", "design", "meeting",
+          "Islamic_Ethics", "Islamic_Ethics_Seminar", "World_History", "Governance", ""]
+
+
+def rule_chain_scores(entries):
+    """The scoring chain calculate_daily_scores used before the rules were compiled"""
+    cognitive_score = kinetic_score = moral_score = 0
+    for entry in entries:
+        if entry["frequency"] == "cognitive":
+            base_score = entry["hours"]
+            if entry["activity_type"] in ["derivation", "first_principles"]:
+                base_score *= 1.5
+            elif entry["activity_type"] == "problem_solving":
+                base_score *= 1.2
+            cognitive_score += base_score
+        elif entry["frequency"] == "kinetic":
+            if entry["progress_made"]:
+                if entry["activity_type"] == "coding":
+                    kinetic_score += 3
+                elif entry["activity_type"] == "design":
+                    kinetic_score += 2
+                else:
+                    kinetic_score += 1
+        elif entry["frequency"] == "moral":
+            base_score = entry["time_spent"]
+            if "Islamic_Ethics" in entry["topic_area"]:
+                base_score *= 1.2
+            moral_score += base_score
+    return {"cognitive": min(cognitive_score, 10), "kinetic": min(kinetic_score, 10), "moral": min(moral_score, 10)}
+
+
+def random_day(pick):
+    entries = []
+    for _ in range(pick.randrange(0, 12)):
+        frequency = pick.choice(["cognitive", "kinetic", "moral"])
+        if frequency == "cognitive":
+            entries.append({"frequency": frequency, "hours": pick.choice([pick.randrange(0, 5), pick.uniform(0, 4)]),
+                            "activity_type": pick.choice(LABELS)})
+        elif frequency == "kinetic":
+            entries.append({"frequency": frequency, "activity_type": pick.choice(LABELS), "progress_made": pick.random() < 0.7})
+        else:
+            entries.append({"frequency": frequency, "time_spent": pick.uniform(0, 2), "topic_area": pick.choice(LABELS)})
+    return entries
+
+
+def rules_with(**changes):
+    config = copy.deepcopy(DEFAULT_RULES)
+    config.update(changes)
+    return config
+
+
+def write_rules(path, config):
+    path.write_text(json.dumps(config))
+
+
+def test_compiled_scorer_matches_the_old_rule_chain():
+    score_entries = CompiledRules(DEFAULT_RULES).score_entries
+    pick = random.Random(31)
+    for _ in range(2000):
+        entries = random_day(pick)
+        assert score_entries(entries) == rule_chain_scores(entries)
+
+
+def test_contains_rules_use_the_first_declared_pattern():
+    config = rules_with()
+    config["frequencies"]["moral"]["weights"] = {"Ethics": 2, "Islamic": 3}
+    score_entries = CompiledRules(config).score_entries
+    entry = {"frequency": "moral", "time_spent": 1, "topic_area": "Islamic_Ethics"}
+
+    assert score_entries([entry])["moral"] == 2
+    assert score_entries([dict(entry, topic_area="Islamic_Law")])["moral"] == 3
+    assert score_entries([dict(entry, topic_area="History")])["moral"] == 1
+    config["frequencies"]["moral"]["weights"] = {"Islamic": 3, "Ethics": 2}
+    assert CompiledRules(config).score_entries([entry])["moral"] == 3
+
+
+def test_score_cap():
+    entries = [{"frequency": "cognitive", "hours": 4, "activity_type": "derivation"}] * 3
+    assert CompiledRules(rules_with(score_cap=5)).score_entries(entries)["cognitive"] == 5
+    assert CompiledRules(rules_with(score_cap=None)).score_entries(entries)["cognitive"] == 18
+    with pytest.raises(ScoringRulesError):
+        CompiledRules(rules_with(score_cap="10"))
+
+
+def test_generated_scorer_handles_any_config_strings():
+    config = rules_with()
+    config["frequencies"]["it's \"odd\"\n"] = {"value": 2, "match_field": "label'", "weights": {"a\\b": 5}}
+    score_entries = CompiledRules(config).score_entries
+
+    scores = score_entries([{"frequency": "it's \"odd\"\n", "label'": "a\\b"}, {"frequency": "meditation"}])
+    assert scores["it's \"odd\"\n"] == 10  # 2 x 5, at the cap
+    assert scores["cognitive"] == 0
+
+
+@pytest.mark.parametrize("frequencies", [
+    {},
+    {name: spec for name, spec in DEFAULT_RULES["frequencies"].items() if name != "moral"},
+    dict(DEFAULT_RULES["frequencies"], kinetic={"value_field": "x", "value": 1}),
+    dict(DEFAULT_RULES["frequencies"], moral={"value": 1, "match": "regex"}),
+])
+def test_malformed_rule_sets_are_rejected(frequencies):
+    with pytest.raises(ScoringRulesError):
+        CompiledRules(rules_with(frequencies=frequencies))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_watcher_picks_up_an_edit(tmp_path):
+    path = tmp_path / "rules.json"
+    write_rules(path, DEFAULT_RULES)
+    rules = ScoringRules(str(path), check_interval=0.02)
+    entry = {"frequency": "kinetic", "activity_type": "coding", "progress_made": True}
+    assert rules.score_entries([entry])["kinetic"] == 3
+
+    config = rules_with()
+    config["frequencies"]["kinetic"]["weights"]["coding"] = 4.5
+    write_rules(path, config)
+    assert wait_for(lambda: rules.score_entries([entry])["kinetic"] == 4.5)
+    assert rules.last_error is None
+    rules.stop_watching()
+
+
+@pytest.mark.parametrize("edit", [
+    "{ not json",
+    json.dumps(rules_with(frequencies={name: spec for name, spec in DEFAULT_RULES["frequencies"].items() if name != "moral"})),
+    json.dumps(rules_with(score_cap=[10])),
+])
+def test_a_broken_edit_keeps_the_previous_rules(tmp_path, edit):
+    path = tmp_path / "rules.json"
+    write_rules(path, DEFAULT_RULES)
+    rules = ScoringRules(str(path), check_interval=None)
+    compiled = rules.current()
+
+    path.write_text(edit)
+    assert rules.reload_if_changed() is False
+    assert rules.current() is compiled
+    assert rules.last_error
+    assert rules.score_entries([{"frequency": "moral", "time_spent": 1, "topic_area": "x"}]) == {"cognitive": 0, "kinetic": 0, "moral": 1}
+
+    write_rules(path, rules_with(score_cap=3))
+    assert rules.reload_if_changed() is True
+    assert rules.current().score_cap == 3 and rules.last_error is None
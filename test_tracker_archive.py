@@ -0,0 +1,182 @@
+# Tests for the cold archive - block encoding, serialization and the LRU
+# Every archived day must come back exactly as it went in, whatever its schema.
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from tracker_archive import ColdArchive, to_ordinal
+from triad_tracker import TriadTracker
+
+
+def sample_month(year=2025, month=3):
+    """A month of entries covering every frequency, aware and naive stamps, and raw entries"""
+    build = TriadTracker.build_entry
+    plus_five = timezone(timedelta(hours=5, minutes=30))
+    days = {}
+    for day_number in range(1, 29):
+        moment = datetime(year, month, day_number, 8, 15, 30, 250000)
+        days[date(year, month, day_number).isoformat()] = [
+            build("cognitive", moment, hours=2.5, activity_type="NEET_Biology", notes="cell cycle"),
+            build("cognitive", moment + timedelta(hours=1), hours=3, activity_type="UPSC_Governance", notes=""),
+            build("kinetic", moment.replace(tzinfo=plus_five), activity_type="Quaspace_MVP",
+                  progress_made=day_number % 2 == 0, notes="shipped ✓"),
+            build("moral", moment.replace(tzinfo=timezone.utc), topic_area="Islamic_Ethics", time_spent=0.75, notes="notes"),
+        ]
+    # Entries outside the schema are stored verbatim
+    days[date(year, month, 1).isoformat()] += [
+        {"frequency": "cognitive", "hours": 1, "activity_type": "study", "notes": "", "timestamp": "not a time"},
+        {"frequency": "kinetic", "activity_type": "x", "progress_made": "yes", "notes": "", "timestamp": "2025-03-01T09:00:00"},
+        {"frequency": "meditation", "minutes": 20, "timestamp": "2025-03-01T06:00:00"},
+        {"frequency": "moral", "topic_area": "ethics", "time_spent": 1, "notes": "", "timestamp": "2025-03-01T10:00:00", "extra": [1, 2]},
+    ]
+    return days
+
+
+def test_days_round_trip_through_blocks():
+    days = sample_month()
+    archive = ColdArchive()
+    archive.archive_days(days)
+
+    assert archive.days() == sorted(days)
+    for target_date, entries in days.items():
+        assert archive.get_day(target_date) == entries
+    assert archive.get_day("2025-04-01") is None
+
+
+def test_serialized_archive_round_trips():
+    days = {**sample_month(2025, 3), **sample_month(2025, 4)}
+    archive = ColdArchive()
+    archive.archive_days(days)
+
+    restored = ColdArchive.from_buffer(archive.to_bytes())
+    assert restored.days() == archive.days()
+    assert restored.compressed_size() == archive.compressed_size()
+    for target_date, entries in days.items():
+        assert restored.get_day(target_date) == entries
+    assert restored.to_bytes() == archive.to_bytes()
+
+
+def test_save_and_load(tmp_path):
+    days = sample_month()
+    archive = ColdArchive()
+    archive.archive_days(days)
+    path = tmp_path / "history.archive"
+    archive.save(path)
+
+    restored = ColdArchive.load(path)
+    assert {target_date: restored.get_day(target_date) for target_date in days} == days
+
+
+@pytest.mark.parametrize("cache_size", [0, 1, 2, 32])
+def test_any_cache_size_returns_the_requested_day(cache_size):
+    days = sample_month()
+    archive = ColdArchive(cache_size=cache_size)
+    archive.archive_days(days)
+
+    # Read out of order so requested days are not always the first decoded
+    for target_date in sorted(days, reverse=True) + sorted(days):
+        assert archive.get_day(target_date) == days[target_date]
+    assert len(archive._cache) <= cache_size
+
+
+def test_thaw_removes_a_day_and_keeps_its_neighbours():
+    days = sample_month()
+    archive = ColdArchive()
+    archive.archive_days(days)
+    archive.get_day("2025-03-02")  # Fill the cache from the block being rewritten
+
+    assert archive.thaw_day("2025-03-02") == days["2025-03-02"]
+    assert "2025-03-02" not in archive
+    assert archive.get_day("2025-03-02") is None
+    assert archive.thaw_day("2025-03-02") is None
+    assert archive.get_day("2025-03-03") == days["2025-03-03"]
+
+
+def test_day_count_follows_archiving_thawing_and_loading():
+    days = {**sample_month(2025, 3), **sample_month(2025, 4)}
+    archive = ColdArchive()
+    archive.archive_days(days)
+    archive.thaw_day("2025-03-05")
+    for day_number in range(1, 29):
+        archive.thaw_day(f"2025-04-{day_number:02d}")  # Empties the April block
+
+    expected = sorted(target_date for target_date in days if target_date.startswith("2025-03") and target_date != "2025-03-05")
+    assert len(archive) == len(expected) and list(archive.blocks) == [2025 * 12 + 2]
+    assert archive.days() == expected
+    assert archive.day_ordinals() == [to_ordinal(target_date) for target_date in expected]
+    assert len(ColdArchive.from_buffer(archive.to_bytes())) == len(expected)
+    assert len(archive.view()) == len(expected)
+    assert 0 not in archive and date.max not in archive.view()
+
+
+def test_archiving_more_days_into_a_month_merges_the_block():
+    days = sample_month()
+    first_half = {target_date: entries for target_date, entries in days.items() if target_date < "2025-03-15"}
+    second_half = {target_date: entries for target_date, entries in days.items() if target_date >= "2025-03-15"}
+    archive = ColdArchive()
+    archive.archive_days(first_half)
+    archive.get_day("2025-03-01")
+    archive.archive_days(second_half)
+
+    assert len(archive.blocks) == 1
+    assert len(archive) == len(days)
+    assert all(archive.get_day(target_date) == entries for target_date, entries in days.items())
+
+
+def test_dates_ordinals_and_date_objects_are_interchangeable():
+    archive = ColdArchive()
+    archive.archive_days({date(2025, 3, 1): [{"frequency": "meditation"}]})
+
+    assert to_ordinal("2025-03-01") == date(2025, 3, 1).toordinal()
+    assert archive.get_day(date(2025, 3, 1).toordinal()) == [{"frequency": "meditation"}]
+    assert date(2025, 3, 1) in archive
+
+
+def test_foreign_data_is_rejected():
+    with pytest.raises(ValueError):
+        ColdArchive.from_buffer(b"JUNK" + bytes(16))
+
+
+def test_view_is_unaffected_by_later_writes():
+    days = sample_month()
+    archive = ColdArchive()
+    archive.archive_days(days)
+    view = archive.view()
+    assert archive.view() is view  # Reused until the archive changes
+
+    archive.thaw_day("2025-03-05")
+    archive.archive_days({"2025-03-05": [{"frequency": "meditation"}], "2025-05-01": [{"frequency": "meditation"}]})
+    assert archive.view() is not view
+
+    assert view.days() == sorted(days)
+    assert len(view) == len(days) and "2025-05-01" not in view
+    assert all(view.get_day(target_date) == entries for target_date, entries in days.items())
+    assert archive.get_day("2025-03-05") == [{"frequency": "meditation"}]
+    with pytest.raises(TypeError):
+        view.thaw_day("2025-03-01")
+
+
+def test_concurrent_reads_share_the_lru():
+    days = {**sample_month(2025, 3), **sample_month(2025, 4)}
+    archive = ColdArchive(cache_size=3)
+    archive.archive_days(days)
+    view = archive.view()
+    order = sorted(days)
+    failures = []
+
+    def read(offset):
+        for index in range(100):
+            target_date = order[(offset + index * 7) % len(order)]
+            for source in (archive, view):
+                if source.get_day(target_date) != days[target_date]:
+                    failures.append(target_date)
+
+    threads = [threading.Thread(target=read, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not failures
+    assert len(archive._cache) <= 3 and len(view._cache) <= 3
@@ -0,0 +1,118 @@
+# Tests for the tracker - published snapshots and the day index
+# A snapshot must keep answering exactly as it did when it was taken, for hot and
+# archived days alike, whatever the tracker does afterwards.
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from day_bucketing import DayBucketer
+from triad_tracker import TriadTracker
+
+END_DATE = "2026-06-29"
+START = datetime(2026, 3, 2, 9, 0)
+
+
+@pytest.fixture
+def tracker():
+    """Four months of cognitive and moral logs, every third day; all but the last 30 days archived"""
+    built = TriadTracker(bucketer=DayBucketer("UTC"), archive_after_days=30)
+    built.current_date = END_DATE
+    for offset in range(0, 120, 3):
+        moment = START + timedelta(days=offset)
+        built.log_cognitive_effort(2, "Physics_Fundamentals", timestamp=moment)
+        built.log_moral_effort("Islamic_Ethics", 1, timestamp=moment + timedelta(hours=3))
+    built.compact_history()
+    assert len(built.archive) and built.daily_logs
+    return built
+
+
+def test_snapshot_keeps_archived_days_after_a_back_fill(tracker):
+    day = tracker.archive.days()[0]
+    snapshot = tracker.snapshot()
+    before = tracker.calculate_daily_scores(day, snapshot)
+    assert before["cognitive"] > 0
+
+    tracker.log_kinetic_effort("Quaspace_MVP", True, timestamp=datetime.fromisoformat(f"{day}T20:00:00"))
+    assert day not in tracker.archive  # Thawed back into daily_logs
+
+    assert tracker.calculate_daily_scores(day, snapshot) == before
+    assert len(tracker.get_day_entries(day, snapshot)) == 2
+    assert len(tracker.get_day_entries(day)) == 3
+    assert tracker.calculate_daily_scores(day, tracker.snapshot())["kinetic"] > 0
+
+
+def test_snapshot_of_a_restored_tracker_is_isolated(tmp_path, tracker):
+    from mirror_snapshot import load_snapshot, save_snapshot
+    from triad_tracker import MirrorDashboard
+
+    path = str(tmp_path / "mirror.snapshot")
+    save_snapshot(MirrorDashboard(tracker=tracker), path)
+    restored = load_snapshot(path).tracker
+    snapshot = restored.snapshot()
+    assert not restored.daily_logs  # Every day is archived after a restore
+
+    days = restored.active_days()
+    expected = {day: restored.get_day_entries(day, snapshot) for day in days}
+    for day in days:
+        restored.log_moral_effort(time_spent=1, timestamp=datetime.fromisoformat(f"{day}T22:00:00"))
+    restored.compact_history(max_age_days=0)
+
+    assert {day: restored.get_day_entries(day, snapshot) for day in days} == expected
+    restored.archive.close()
+
+
+def test_snapshot_keeps_its_current_day(tracker):
+    snapshot = tracker.snapshot()
+    trends = tracker.get_weekly_trends(7, snapshot)
+    assert trends["dates"][-1] == END_DATE
+
+    tracker.current_date = "2026-07-15"
+    assert tracker.get_weekly_trends(7, snapshot) == trends
+    assert tracker.get_day_entries(None, snapshot) == tracker.get_day_entries(END_DATE)
+    assert tracker.get_weekly_trends(7, tracker.snapshot())["dates"][-1] == "2026-07-15"
+    assert tracker.snapshot().version > snapshot.version
+
+
+def test_active_days_and_their_bounds(tracker):
+    logged = [(START + timedelta(days=offset)).date().isoformat() for offset in range(0, 120, 3)]
+
+    assert tracker.active_days() == logged  # Hot and archived days alike
+    assert tracker.active_days("2026-03-04", "2026-03-11") == ["2026-03-05", "2026-03-08", "2026-03-11"]
+    assert tracker.active_days(start="2026-06-27") == logged[-1:]
+    assert tracker.active_days(end="2026-03-02") == logged[:1]
+    assert tracker.active_days("2026-03-09", "2026-03-10") == []
+    assert tracker.active_days("2026-03-11", "2026-03-05") == []
+    assert tracker.active_day_ordinals("2026-03-02", "2026-03-05") == [START.toordinal(), START.toordinal() + 3]
+    assert (tracker.first_active_day(), tracker.last_active_day()) == (logged[0], logged[-1])
+
+    empty = TriadTracker()
+    assert empty.active_days() == [] and empty.gaps() == []
+    assert empty.first_active_day() is None and empty.last_active_day() is None
+
+
+def test_gaps(tracker):
+    assert tracker.gaps("2026-03-02", "2026-03-08") == [("2026-03-03", "2026-03-04"), ("2026-03-06", "2026-03-07")]
+    assert len(tracker.gaps()) == len(tracker.active_days()) - 1
+    assert tracker.gaps(min_length=3) == []
+    assert tracker.gaps("2026-03-02", "2026-03-08", min_length=0) == tracker.gaps("2026-03-02", "2026-03-08")
+    # Bounds need not be active days; missing days at either end count as gaps
+    assert tracker.gaps("2026-02-27", "2026-03-03") == [("2026-02-27", "2026-03-01"), ("2026-03-03", "2026-03-03")]
+    assert tracker.gaps("2026-03-09", "2026-03-10") == [("2026-03-09", "2026-03-10")]
+    assert tracker.gaps("2026-03-05", "2026-03-05") == []
+    # A reversed range has no days, so no gaps
+    assert tracker.gaps("2026-03-08", "2026-03-02") == []
+
+
+def test_rebucket_closes_the_archive_it_replaces(tmp_path, tracker):
+    from mirror_snapshot import load_snapshot, save_snapshot
+    from triad_tracker import MirrorDashboard
+
+    path = str(tmp_path / "mirror.snapshot")
+    save_snapshot(MirrorDashboard(tracker=tracker), path)
+    restored = load_snapshot(path).tracker
+    mapping = restored.archive._mapping
+
+    restored.rebucket(DayBucketer("UTC", day_start_hour=4))
+    assert mapping.closed
+    assert restored.active_days() == tracker.active_days()  # Every entry is logged after 04:00
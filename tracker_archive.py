@@ -0,0 +1,495 @@
+# Cold Archive Module - Compressed storage for old tracker days
+# Keeps multi-year histories cheap: old days live as compressed monthly blocks
+# and are only decoded (into a small LRU) when someone actually reads them.
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, datetime
+import json
+import struct
+import threading
+import zlib
+
+ARCHIVE_MAGIC = b"MRAR"
+ARCHIVE_VERSION = 1
+
+MICROS_PER_DAY = 86400 * 1000000
+LAST_DAY = date.max.toordinal()
+
+# Per-entry flag bits
+FLAG_RAW = 1          # Entry did not fit the known schema; stored as JSON
+FLAG_INT_VALUE = 2    # hours/time_spent was an int rather than a float
+FLAG_PROGRESS = 4     # kinetic progress_made was True
+
+# The field that carries each frequency's label and (optional) numeric value
+ENTRY_SCHEMA = {
+    "cognitive": ("activity_type", "hours"),
+    "kinetic": ("activity_type", None),
+    "moral": ("topic_area", "time_spent")
+}
+
+
+def write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buf, pos):
+    """Read an unsigned LEB128 varint, returning (value, new_position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def zigzag(value):
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+
+def unzigzag(value):
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def write_bytes(out, data):
+    write_varint(out, len(data))
+    out += data
+
+
+def read_bytes(buf, pos):
+    length, pos = read_varint(buf, pos)
+    return buf[pos:pos + length], pos + length
+
+
+def _wall_micros(moment):
+    """Microseconds since 0001-01-01 on the wall clock (timezone offset ignored)"""
+    seconds = moment.toordinal() * 86400 + moment.hour * 3600 + moment.minute * 60 + moment.second
+    return seconds * 1000000 + moment.microsecond
+
+
+def _from_wall_micros(micros):
+    days, remainder = divmod(micros, MICROS_PER_DAY)
+    seconds, microsecond = divmod(remainder, 1000000)
+    hour, seconds = divmod(seconds, 3600)
+    minute, second = divmod(seconds, 60)
+    return datetime.fromordinal(days).replace(hour=hour, minute=minute, second=second, microsecond=microsecond)
+
+
+class ColdArchive:
+    """
+    Tiered storage for tracker days that are no longer being written to
+
+    - Days are grouped into one compressed block per calendar month.
+    - Timestamps are delta-encoded varints; frequency, activity/topic labels and
+      timezone suffixes are dictionary-encoded against an archive-wide string table.
+    - Blocks are decoded lazily; the most recently read days are kept in a small LRU.
+
+    Entries that do not match the tracker's schema are stored verbatim as JSON, so
+    archiving is always lossless. Reads are safe from any thread; writes
+    (archive_days, thaw_day, close) belong to the thread that owns the tracker,
+    and other threads should read through view().
+    """
+
+    def __init__(self, cache_size=32):
+        self.cache_size = cache_size
+        self.strings = []          # Dictionary of repeated string values
+        self._string_ids = {}
+        self.blocks = {}           # month key -> compressed block bytes
+        self.block_days = {}       # month key -> sorted day ordinals in the block (array of ints)
+        self._size = 0             # Number of archived days
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()  # Guards the LRU, which reads update
+        self._view = None          # ArchiveView handed out since the last write (see view)
+        self._mapping = None       # mmap the blocks are slices of (see from_buffer), owned by the archive
+
+    # ------------------------------------------------------------------
+    # Public interface (dates are "%Y-%m-%d" strings, date objects or day ordinals)
+    # ------------------------------------------------------------------
+
+    def __contains__(self, target_date):
+        return self._block_of(to_ordinal(target_date)) is not None
+
+    def __len__(self):
+        return self._size
+
+    def days(self):
+        """All archived dates, oldest first"""
+        return [date.fromordinal(day).isoformat() for day in self.day_ordinals()]
+
+    def day_ordinals(self):
+        """All archived day ordinals, oldest first"""
+        return [day for key in sorted(self.block_days) for day in self.block_days[key]]
+
+    def get_day(self, target_date):
+        """Return the entries for an archived date, or None if it is not archived"""
+        day = to_ordinal(target_date)
+        key = self._block_of(day)
+        if key is None:
+            return None
+
+        with self._lock:
+            entries = self._cache.get(day)
+            if entries is not None:
+                self._cache.move_to_end(day)
+                return entries
+
+            month_days = self._decode_block(key)
+            entries = month_days.pop(day)
+            # Neighbouring days are likely read next; cache only as many as fit next to this one
+            for decoded_day in list(month_days)[:max(self.cache_size - 1, 0)]:
+                self._remember(decoded_day, month_days[decoded_day])
+            self._remember(day, entries)
+            return entries
+
+    def view(self):
+        """
+        A read-only ArchiveView of the archive as it is now
+
+        Blocks are never modified in place, so the view shares them and copies only
+        the per-month directory. The same view is returned until the next write.
+        """
+        view = self._view
+        if view is None:
+            view = self._view = ArchiveView(self)
+        return view
+
+    def archive_days(self, days):
+        """
+        Move whole days into the archive
+        - days: Mapping of date (string, date or day ordinal) -> list of entries
+        """
+        by_month = {}
+        for target_date, entries in days.items():
+            day = to_ordinal(target_date)
+            by_month.setdefault(_month_key(day), {})[day] = entries
+
+        for key, new_days in by_month.items():
+            month_days = self._decode_block(key) if key in self.blocks else {}
+            month_days.update(new_days)
+            self._write_block(key, month_days)
+            with self._lock:
+                for day in new_days:
+                    self._cache.pop(day, None)
+
+    def thaw_day(self, target_date):
+        """Remove a day from the archive and return its entries (None if not archived)"""
+        day = to_ordinal(target_date)
+        key = self._block_of(day)
+        if key is None:
+            return None
+
+        month_days = self._decode_block(key)
+        entries = month_days.pop(day)
+        with self._lock:
+            self._cache.pop(day, None)
+        self._view = None
+        if month_days:
+            self._write_block(key, month_days)
+        else:
+            del self.blocks[key]
+            del self.block_days[key]
+            self._size -= 1
+        return entries
+
+    def compressed_size(self):
+        """Total bytes held in compressed blocks"""
+        return sum(len(block) for block in self.blocks.values())
+
+    def close(self):
+        """
+        Release the mapping the archive was loaded from, if it owns one
+        Blocks still in the mapping are copied out first, so the archive stays usable.
+        """
+        mapping, self._mapping = self._mapping, None
+        if mapping is None:
+            return
+        # Dropping the old dict releases the views into the mapping, so it can be closed
+        self.blocks = {key: bytes(block) for key, block in self.blocks.items()}
+        self._view = None
+        try:
+            mapping.close()
+        except BufferError:
+            # A TrackerSnapshot still holds an ArchiveView of the mapped blocks;
+            # the mapping is unmapped when the last of them is released
+            pass
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_bytes(self):
+        """Serialize the whole archive (string table, block directory and blocks)"""
+        out = bytearray(ARCHIVE_MAGIC)
+        write_varint(out, ARCHIVE_VERSION)
+        write_varint(out, len(self.strings))
+        for value in self.strings:
+            write_bytes(out, value.encode("utf-8"))
+        write_varint(out, len(self.blocks))
+        for key in sorted(self.blocks):
+            write_varint(out, key)
+            days = self.block_days[key]
+            write_varint(out, len(days))
+            previous = 0
+            for day in days:
+                write_varint(out, day - previous)
+                previous = day
+            write_bytes(out, self.blocks[key])
+        return bytes(out)
+
+    @classmethod
+    def from_buffer(cls, buf, cache_size=32, mapping=None):
+        """
+        Rebuild an archive from to_bytes() output
+
+        Blocks are kept as slices of `buf`, so passing a memoryview over an mmap
+        loads the directory without copying or decompressing any block.
+        - mapping: The mmap `buf` points into; the archive takes ownership of it
+          and close() releases it
+        """
+        buf = memoryview(buf)
+        if bytes(buf[:4]) != ARCHIVE_MAGIC:
+            raise ValueError("Not a Mirror cold archive")
+        version, pos = read_varint(buf, 4)
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version: {version}")
+
+        archive = cls(cache_size=cache_size)
+        archive._mapping = mapping
+        count, pos = read_varint(buf, pos)
+        for _ in range(count):
+            raw, pos = read_bytes(buf, pos)
+            archive._intern(bytes(raw).decode("utf-8"))
+
+        block_count, pos = read_varint(buf, pos)
+        for _ in range(block_count):
+            key, pos = read_varint(buf, pos)
+            day_count, pos = read_varint(buf, pos)
+            days = array("i")
+            day = 0
+            for _ in range(day_count):
+                delta, pos = read_varint(buf, pos)
+                day += delta
+                days.append(day)
+            archive.block_days[key] = days
+            archive._size += day_count
+            archive.blocks[key], pos = read_bytes(buf, pos)
+        return archive
+
+    def save(self, path):
+        with open(path, "wb") as handle:
+            handle.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path, cache_size=32):
+        with open(path, "rb") as handle:
+            return cls.from_buffer(handle.read(), cache_size=cache_size)
+
+    # ------------------------------------------------------------------
+    # Block encoding
+    # ------------------------------------------------------------------
+
+    def _intern(self, value):
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _block_of(self, day):
+        """Month key of the block holding an archived day, or None"""
+        if not 1 <= day <= LAST_DAY:
+            return None
+        key = _month_key(day)
+        days = self.block_days.get(key)
+        if days is None:
+            return None
+        index = bisect_left(days, day)
+        return key if index < len(days) and days[index] == day else None
+
+    def _remember(self, day, entries):
+        self._cache[day] = entries
+        self._cache.move_to_end(day)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _write_block(self, key, month_days):
+        days = sorted(month_days)
+        out = bytearray()
+        write_varint(out, len(days))
+        previous_time = 0
+        for day in days:
+            entries = month_days[day]
+            write_varint(out, len(entries))
+            for entry in entries:
+                previous_time = self._encode_entry(out, entry, previous_time)
+
+        self.blocks[key] = zlib.compress(bytes(out), 9)
+        self._size += len(days) - len(self.block_days.get(key, ()))
+        # An array keeps the day list to 4 bytes a day, with no int object per day
+        self.block_days[key] = array("i", days)
+        self._view = None
+
+    def _encode_entry(self, out, entry, previous_time):
+        encoded = self._encode_known(entry, previous_time)
+        if encoded is None:
+            write_varint(out, FLAG_RAW)
+            write_bytes(out, json.dumps(entry).encode("utf-8"))
+            return previous_time
+        out += encoded[0]
+        return encoded[1]
+
+    def _encode_known(self, entry, previous_time):
+        """Compact encoding for schema-conforming entries; None means store raw"""
+        schema = ENTRY_SCHEMA.get(entry.get("frequency"))
+        if schema is None:
+            return None
+        label_field, value_field = schema
+        expected = {"frequency", label_field, "notes", "timestamp"}
+        expected.add(value_field if value_field else "progress_made")
+        if set(entry) != expected:
+            return None
+
+        label, notes, stamp = entry[label_field], entry["notes"], entry["timestamp"]
+        if not (isinstance(label, str) and isinstance(notes, str) and isinstance(stamp, str)):
+            return None
+        try:
+            moment = datetime.fromisoformat(stamp)
+        except ValueError:
+            return None
+        naive = moment.replace(tzinfo=None).isoformat()
+        if not stamp.startswith(naive):
+            return None
+        suffix = stamp[len(naive):]
+
+        flags = 0
+        value = None
+        if value_field:
+            value = entry[value_field]
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None
+            if isinstance(value, int):
+                flags |= FLAG_INT_VALUE
+        else:
+            if not isinstance(entry["progress_made"], bool):
+                return None
+            if entry["progress_made"]:
+                flags |= FLAG_PROGRESS
+
+        wall = _wall_micros(moment)
+        out = bytearray()
+        write_varint(out, flags)
+        write_varint(out, self._intern(entry["frequency"]))
+        write_varint(out, zigzag(wall - previous_time))
+        write_varint(out, self._intern(suffix))
+        write_varint(out, self._intern(label))
+        if value_field:
+            if flags & FLAG_INT_VALUE:
+                write_varint(out, zigzag(value))
+            else:
+                out += struct.pack("<d", value)
+        write_bytes(out, notes.encode("utf-8"))
+        return out, wall
+
+    def _decode_block(self, key):
+        try:
+            buf = zlib.decompress(self.blocks[key])
+        except zlib.error as error:
+            raise ValueError(f"Corrupt archive block for {key // 12:04d}-{key % 12 + 1:02d}: {error}")
+        strings = self.strings
+        month_days = {}
+        pos = 0
+        previous_time = 0
+        day_count, pos = read_varint(buf, pos)
+        for day in self.block_days[key][:day_count]:
+            entry_count, pos = read_varint(buf, pos)
+            entries = []
+            for _ in range(entry_count):
+                flags, pos = read_varint(buf, pos)
+                if flags & FLAG_RAW:
+                    raw, pos = read_bytes(buf, pos)
+                    entries.append(json.loads(raw))
+                    continue
+
+                frequency_id, pos = read_varint(buf, pos)
+                delta, pos = read_varint(buf, pos)
+                suffix_id, pos = read_varint(buf, pos)
+                label_id, pos = read_varint(buf, pos)
+                previous_time += unzigzag(delta)
+
+                frequency = strings[frequency_id]
+                label_field, value_field = ENTRY_SCHEMA[frequency]
+                entry = {"frequency": frequency}
+                if value_field:
+                    if flags & FLAG_INT_VALUE:
+                        raw_value, pos = read_varint(buf, pos)
+                        value = unzigzag(raw_value)
+                    else:
+                        value = struct.unpack_from("<d", buf, pos)[0]
+                        pos += 8
+                    # Keep the key order the tracker's log_* methods produce
+                    if frequency == "cognitive":
+                        entry[value_field] = value
+                        entry[label_field] = strings[label_id]
+                    else:
+                        entry[label_field] = strings[label_id]
+                        entry[value_field] = value
+                else:
+                    entry[label_field] = strings[label_id]
+                    entry["progress_made"] = bool(flags & FLAG_PROGRESS)
+                notes, pos = read_bytes(buf, pos)
+                entry["notes"] = notes.decode("utf-8")
+                entry["timestamp"] = _from_wall_micros(previous_time).isoformat() + strings[suffix_id]
+                entries.append(entry)
+            month_days[day] = entries
+        return month_days
+
+
+class ArchiveView(ColdArchive):
+    """
+    Read-only copy of a ColdArchive as it was when ColdArchive.view() was called
+
+    TrackerSnapshot holds one, so archived days read from a snapshot do not change
+    when the live archive thaws or archives days. The string table and blocks are
+    shared with the archive; days are looked up in the copied per-month directory,
+    and the view keeps its own LRU.
+    """
+
+    def __init__(self, archive=None):
+        super().__init__(cache_size=archive.cache_size if archive is not None else 32)
+        if archive is not None:
+            self.strings = archive.strings  # Only ever appended to
+            self.blocks = dict(archive.blocks)
+            self.block_days = dict(archive.block_days)  # Replaced, never changed, on write
+            self._size = archive._size
+
+    def view(self):
+        return self
+
+    def archive_days(self, days):
+        raise TypeError("ArchiveView is read-only")
+
+    def thaw_day(self, target_date):
+        raise TypeError("ArchiveView is read-only")
+
+
+def to_ordinal(target_date):
+    """Day ordinal for a "%Y-%m-%d" string, date/datetime or an ordinal already"""
+    if isinstance(target_date, int):
+        return target_date
+    if isinstance(target_date, date):
+        return target_date.toordinal()
+    return date.fromisoformat(target_date).toordinal()
+
+
+def _month_key(day):
+    moment = date.fromordinal(day)
+    return moment.year * 12 + moment.month - 1
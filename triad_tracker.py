@@ -1,8 +1,86 @@
 # Daily Tracking Module - The Triad Metrics
 # Tracks three distinct "frequencies" of effort: Cognitive, Kinetic, and Moral
 
-from datetime import datetime, timedelta
-import json
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from datetime import date, datetime
+
+from day_bucketing import default_day_bucketer
+from frozen_views import FrozenDict
+from scoring_rules import default_scoring_rules
+from tracker_archive import ArchiveView, ColdArchive, to_ordinal
+
+BUCKET_BITS = 5  # TrackerSnapshot groups days in runs of 32 ordinals
+LABEL_FIELDS = ("activity_type", "topic_area")  # Looked up in the scoring rules' weight tables
+
+
+class TrackerSnapshot(Mapping):
+    """
+    Immutable, versioned view of the tracker's days
+
+    Maps day ordinals (lookups also accept dates and "%Y-%m-%d" strings) to tuples
+    of frozen entries. Days are grouped in buckets of 32 consecutive ordinals:
+    publishing a changed day copies that day, its bucket and the bucket index, and
+    shares every other day with the previous version. The mapping holds the
+    in-memory days; `archive` is a read-only ArchiveView of the cold archive and
+    `current_day` the tracker's day, both as of this version. Read a day from
+    either tier with TriadTracker.get_day_entries(day, snapshot).
+    """
+
+    __slots__ = ("version", "archive", "current_day", "_buckets", "_size")
+
+    def __init__(self, buckets=None, version=0, size=0, archive=None, current_day=None):
+        self.version = version
+        self.archive = archive if archive is not None else ArchiveView()
+        self.current_day = current_day
+        self._buckets = buckets if buckets is not None else {}  # day >> BUCKET_BITS -> {day: entries}
+        self._size = size
+
+    def __getitem__(self, target_date):
+        day = to_ordinal(target_date)
+        bucket = self._buckets.get(day >> BUCKET_BITS)
+        if bucket is None or day not in bucket:
+            raise KeyError(target_date)
+        return bucket[day]
+
+    def __iter__(self):
+        for key in sorted(self._buckets):
+            yield from sorted(self._buckets[key])
+
+    def __len__(self):
+        return self._size
+
+    def with_day(self, day, entries, version, archive, current_day):
+        """A new snapshot with one day replaced (or removed when entries is empty)"""
+        key = day >> BUCKET_BITS
+        buckets = self._buckets.copy()
+        bucket = buckets.get(key)
+        bucket = bucket.copy() if bucket is not None else {}
+        size = self._size - (day in bucket)
+        if entries:
+            bucket[day] = tuple(entries)
+            size += 1
+        else:
+            bucket.pop(day, None)
+        if bucket:
+            buckets[key] = bucket
+        else:
+            buckets.pop(key, None)
+        return TrackerSnapshot(buckets, version, size, archive, current_day)
+
+    def with_state(self, version, archive, current_day):
+        """A new snapshot sharing every day, with a new archive view and current day"""
+        return TrackerSnapshot(self._buckets, version, self._size, archive, current_day)
+
+    @classmethod
+    def from_days(cls, daily_logs, version, archive, current_day):
+        buckets = {}
+        for day, entries in daily_logs.items():
+            if entries:
+                buckets.setdefault(day >> BUCKET_BITS, {})[day] = tuple(entries)
+        return cls(buckets, version, sum(len(bucket) for bucket in buckets.values()), archive, current_day)
+
 
 class TriadTracker:
     """
@@ -23,132 +101,182 @@ class TriadTracker:
     - Islamic Ethics Alignment: Did today's pursuit of power remain ethical?
     """
     
-    def __init__(self):
-        self.daily_logs = {}  # Store logs by date
+    def __init__(self, archive_after_days=None, archive_cache_size=32, scoring_rules=None, bucketer=None):
+        """
+        - archive_after_days: Days older than this many days are compacted into the
+          cold archive on each day rollover (None keeps every day in memory)
+        - archive_cache_size: Number of decoded archived days kept in memory
+        - scoring_rules: ScoringRules used by calculate_daily_scores (defaults to scoring_rules.json)
+        - bucketer: DayBucketer deciding which day a timestamp belongs to (timezone and
+          day-start hour; defaults to MIRROR_TIMEZONE / MIRROR_DAY_START_HOUR or local midnight)
+        """
+        self.daily_logs = {}  # Store logs by day ordinal (date.toordinal())
+        self.day_index = array("i")  # Sorted ordinals of every day with logs, hot or archived
+        self.scoring_rules = scoring_rules if scoring_rules is not None else default_scoring_rules()
+        self.archive = ColdArchive(cache_size=archive_cache_size)  # Compressed older days
+        self.archive_after_days = archive_after_days
         self.weekly_average = {
             "cognitive": 0,
             "kinetic": 0,
             "moral": 0
         }
-        self.current_date = datetime.now().strftime("%Y-%m-%d")
+        self.bucketer = bucketer if bucketer is not None else default_day_bucketer()
+        self._current_day = self.bucketer.today()
+        self.version = 0
+        self.journal_seq = 0  # Highest rotated journal segment already applied (ingest_queue.replay_segments)
+        # Published read-only view of daily_logs, the archive and current_day
+        self._snapshot = TrackerSnapshot(archive=self.archive.view(), current_day=self._current_day)
+    
+    @property
+    def current_day(self):
+        """Ordinal of the day entries without a timestamp are filed under"""
+        return self._current_day
+    
+    @current_day.setter
+    def current_day(self, day):
+        self._current_day = day
+        self.publish_state()
+    
+    @property
+    def current_date(self):
+        """Today's date as "%Y-%m-%d" (the tracker keys days by current_day ordinals)"""
+        return date.fromordinal(self.current_day).isoformat()
+    
+    @current_date.setter
+    def current_date(self, value):
+        self.current_day = to_ordinal(value)
         
-    def log_cognitive_effort(self, hours, activity_type="study", notes=""):
+    def log_cognitive_effort(self, hours, activity_type="study", notes="", timestamp=None):
         """
         Log cognitive effort (Academics)
         - hours: Time spent in hours
         - activity_type: "derivation", "problem_solving", "reading", etc.
         - notes: Specific details about the study
+        - timestamp: Optional datetime for back-filled entries (defaults to now)
         """
-        log_entry = {
-            "frequency": "cognitive",
-            "hours": hours,
-            "activity_type": activity_type,
-            "notes": notes,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if self.current_date not in self.daily_logs:
-            self.daily_logs[self.current_date] = []
-        
-        self.daily_logs[self.current_date].append(log_entry)
-        return log_entry
+        log_entry = self.build_entry("cognitive", timestamp or self.bucketer.now(), hours=hours, activity_type=activity_type, notes=notes)
+        return self.add_entry(log_entry, self.day_for(timestamp))
     
-    def log_kinetic_effort(self, activity_type="development", progress_made=True, notes=""):
+    def log_kinetic_effort(self, activity_type="development", progress_made=True, notes="", timestamp=None):
         """
         Log kinetic effort (Innovation/Quaspace)
         - activity_type: "coding", "design", "research", "meeting", etc.
         - progress_made: Boolean indicating if actual progress was made
         - notes: Details about the Quaspace work
+        - timestamp: Optional datetime for back-filled entries (defaults to now)
         """
-        log_entry = {
-            "frequency": "kinetic",
-            "activity_type": activity_type,
-            "progress_made": progress_made,
-            "notes": notes,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if self.current_date not in self.daily_logs:
-            self.daily_logs[self.current_date] = []
-        
-        self.daily_logs[self.current_date].append(log_entry)
-        return log_entry
+        log_entry = self.build_entry("kinetic", timestamp or self.bucketer.now(), activity_type=activity_type, progress_made=progress_made, notes=notes)
+        return self.add_entry(log_entry, self.day_for(timestamp))
     
-    def log_moral_effort(self, topic_area="ethics_study", time_spent=0, notes=""):
+    def log_moral_effort(self, topic_area="ethics_study", time_spent=0, notes="", timestamp=None):
         """
         Log moral effort (Ethics/Governance)
         - topic_area: "Islamic_Ethics", "World_History", "Governance", etc.
         - time_spent: Time in hours
         - notes: Specific content studied
+        - timestamp: Optional datetime for back-filled entries (defaults to now)
         """
-        log_entry = {
-            "frequency": "moral",
-            "topic_area": topic_area,
-            "time_spent": time_spent,
-            "notes": notes,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if self.current_date not in self.daily_logs:
-            self.daily_logs[self.current_date] = []
+        log_entry = self.build_entry("moral", timestamp or self.bucketer.now(), topic_area=topic_area, time_spent=time_spent, notes=notes)
+        return self.add_entry(log_entry, self.day_for(timestamp))
+    
+    def day_for(self, timestamp=None):
+        """Day ordinal an entry logged at `timestamp` is filed under (current_day when None)"""
+        return self.current_day if timestamp is None else self.bucketer.day_of(timestamp)
+    
+    @staticmethod
+    def build_entry(frequency, timestamp=None, **fields):
+        """
+        Build a log entry dict: frequency, the given fields (in order), then the ISO timestamp
+        Labels must be strings, since scoring looks them up in the weight tables.
+        """
+        for field in LABEL_FIELDS:
+            if field in fields and not isinstance(fields[field], str):
+                raise TypeError(f"{field} must be a string, not {type(fields[field]).__name__}")
+        log_entry = {"frequency": frequency}
+        log_entry.update(fields)
+        log_entry["timestamp"] = (timestamp or datetime.now()).isoformat()
+        return log_entry
+    
+    def add_entry(self, log_entry, day=None):
+        """
+        File a built entry under a day ordinal (defaults to today)
+        """
+        if day is None:
+            day = self.current_day
+        log_entry = self._file_entry(log_entry, day)
+        self.publish_day(day)
+        return log_entry
+    
+    def add_entries(self, records):
+        """
+        File many (day, entry) pairs, publishing each touched day once
+        Returns the number of entries filed.
+        """
+        touched = set()
+        for day, log_entry in records:
+            self._file_entry(log_entry, day)
+            touched.add(day)
+        for day in touched:
+            self.publish_day(day)
+        return len(records)
+    
+    def _file_entry(self, log_entry, day):
+        entries = self.daily_logs.get(day)
+        if entries is None:
+            # Back-filling an archived day brings it back into the hot tier
+            thawed = self.archive.thaw_day(day)
+            if thawed is None:
+                entries = []
+                insort(self.day_index, day)
+            else:
+                entries = [_frozen(entry) for entry in thawed]
+            self.daily_logs[day] = entries
         
-        self.daily_logs[self.current_date].append(log_entry)
+        # Entries are immutable once filed, so snapshots can share them
+        log_entry = _frozen(log_entry)
+        entries.append(log_entry)
         return log_entry
     
-    def calculate_daily_scores(self, target_date=None):
+    def snapshot(self):
+        """
+        The current TrackerSnapshot: a consistent, immutable view of every day
+        Safe to hold and read from any thread while logging continues.
+        """
+        return self._snapshot
+    
+    def publish_day(self, day):
+        """Republish one day after its entry list changed (only that day is copied)"""
+        self.version += 1
+        self._snapshot = self._snapshot.with_day(day, self.daily_logs.get(day), self.version, self.archive.view(), self._current_day)
+    
+    def publish_all(self):
+        """Republish every in-memory day, e.g. after daily_logs was replaced wholesale"""
+        self.version += 1
+        self._snapshot = TrackerSnapshot.from_days(self.daily_logs, self.version, self.archive.view(), self._current_day)
+    
+    def publish_state(self):
+        """Republish the archive and current day when no in-memory day changed"""
+        self.version += 1
+        self._snapshot = self._snapshot.with_state(self.version, self.archive.view(), self._current_day)
+    
+    def calculate_daily_scores(self, target_date=None, snapshot=None):
         """
         Calculate scores for each frequency for a given date
         Returns a dictionary with cognitive, kinetic, and moral scores
+        - snapshot: Optional TrackerSnapshot to read the day from instead of the live logs
         """
-        if target_date is None:
-            target_date = self.current_date
-            
-        if target_date not in self.daily_logs:
+        daily_entries = self.get_day_entries(target_date, snapshot)
+        if daily_entries is None:
             return {"cognitive": 0, "kinetic": 0, "moral": 0}
         
-        daily_entries = self.daily_logs[target_date]
-        
-        cognitive_score = 0
-        kinetic_score = 0
-        moral_score = 0
-        
-        for entry in daily_entries:
-            if entry["frequency"] == "cognitive":
-                # Weight based on activity type and hours
-                base_score = entry["hours"]
-                if entry["activity_type"] in ["derivation", "first_principles"]:
-                    base_score *= 1.5  # Bonus for deep thinking
-                elif entry["activity_type"] == "problem_solving":
-                    base_score *= 1.2  # Bonus for problem solving
-                cognitive_score += base_score
-                
-            elif entry["frequency"] == "kinetic":
-                # Score based on progress made and activity type
-                if entry["progress_made"]:
-                    if entry["activity_type"] == "coding":
-                        kinetic_score += 3
-                    elif entry["activity_type"] == "design":
-                        kinetic_score += 2
-                    else:
-                        kinetic_score += 1
-                        
-            elif entry["frequency"] == "moral":
-                # Score based on time spent and topic area
-                base_score = entry["time_spent"]
-                if "Islamic_Ethics" in entry["topic_area"]:
-                    base_score *= 1.2  # Bonus for ethics focus
-                moral_score += base_score
-        
-        # Cap scores to reasonable ranges
-        return {
-            "cognitive": min(cognitive_score, 10),
-            "kinetic": min(kinetic_score, 10),
-            "moral": min(moral_score, 10)
-        }
+        # Weights (activity bonuses, kinetic points, score cap) come from the
+        # compiled scoring rules; see scoring_rules.json
+        return self.scoring_rules.current().score_entries(daily_entries)
     
-    def get_weekly_trends(self, days_back=7):
+    def get_weekly_trends(self, days_back=7, snapshot=None):
         """
         Get weekly trends for the triad metrics
+        - snapshot: Optional TrackerSnapshot to read the days from instead of the live logs
         """
         trends = {
             "dates": [],
@@ -157,28 +285,34 @@ class TriadTracker:
             "moral": []
         }
         
-        for i in range(days_back):
-            date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            trends["dates"].append(date)
-            
-            daily_scores = self.calculate_daily_scores(date)
+        # The window ends on the tracker's current day, where today's entries are filed
+        today = self.current_day if snapshot is None else snapshot.current_day
+        first = today - days_back + 1
+        
+        # Only days with logs need scoring; the rest of the window is zeros
+        if snapshot is None:
+            days = self.active_day_ordinals(first, today)
+        else:
+            days = [day for day in range(first, today + 1) if day in snapshot or day in snapshot.archive]
+        active = {day: self.calculate_daily_scores(day, snapshot) for day in days}
+        empty = {"cognitive": 0, "kinetic": 0, "moral": 0}
+        
+        # Oldest first
+        for day in range(first, today + 1):
+            daily_scores = active.get(day, empty)
+            trends["dates"].append(date.fromordinal(day).isoformat())
             trends["cognitive"].append(daily_scores["cognitive"])
             trends["kinetic"].append(daily_scores["kinetic"])
             trends["moral"].append(daily_scores["moral"])
         
-        # Reverse to show oldest first
-        trends["dates"].reverse()
-        trends["cognitive"].reverse()
-        trends["kinetic"].reverse()
-        trends["moral"].reverse()
-        
         return trends
     
-    def get_weekly_average(self):
+    def get_weekly_average(self, snapshot=None):
         """
         Calculate the weekly average for each frequency
+        - snapshot: Optional TrackerSnapshot to read the days from instead of the live logs
         """
-        trends = self.get_weekly_trends(7)
+        trends = self.get_weekly_trends(7, snapshot)
         
         cognitive_avg = sum(trends["cognitive"]) / len(trends["cognitive"])
         kinetic_avg = sum(trends["kinetic"]) / len(trends["kinetic"])
@@ -196,28 +330,32 @@ class TriadTracker:
         """
         Export the daily log for analysis or review
         """
-        if target_date is None:
-            target_date = self.current_date
-            
-        if target_date not in self.daily_logs:
-            return f"No logs found for {target_date}"
+        # Export from one published version so entries and scores always agree
+        snapshot = self._snapshot
+        day = snapshot.current_day if target_date is None else to_ordinal(target_date)
+        daily_entries = snapshot.get(day)
+        if daily_entries is None:
+            archived = snapshot.archive.get_day(day)
+            if archived is None:
+                return f"No logs found for {date.fromordinal(day).isoformat()}"
+            daily_entries = tuple(_frozen(entry) for entry in archived)
         
-        daily_scores = self.calculate_daily_scores(target_date)
+        daily_scores = self.scoring_rules.current().score_entries(daily_entries)
         
         export_data = {
-            "date": target_date,
+            "date": date.fromordinal(day).isoformat(),
             "scores": daily_scores,
-            "entries": self.daily_logs[target_date],
+            "entries": daily_entries,
             "summary": {
-                "total_entries": len(self.daily_logs[target_date]),
+                "total_entries": len(daily_entries),
                 "has_kinetic_progress": any(
                     entry["frequency"] == "kinetic" and entry["progress_made"] 
-                    for entry in self.daily_logs[target_date]
+                    for entry in daily_entries
                 ),
                 "focus_distribution": {
-                    "cognitive": sum(1 for e in self.daily_logs[target_date] if e["frequency"] == "cognitive"),
-                    "kinetic": sum(1 for e in self.daily_logs[target_date] if e["frequency"] == "kinetic"),
-                    "moral": sum(1 for e in self.daily_logs[target_date] if e["frequency"] == "moral")
+                    "cognitive": sum(1 for e in daily_entries if e["frequency"] == "cognitive"),
+                    "kinetic": sum(1 for e in daily_entries if e["frequency"] == "kinetic"),
+                    "moral": sum(1 for e in daily_entries if e["frequency"] == "moral")
                 }
             }
         }
@@ -228,24 +366,193 @@ class TriadTracker:
         """
         Reset or move to the new day
         """
-        self.current_date = datetime.now().strftime("%Y-%m-%d")
+        self.current_day = self.bucketer.today()
+        if self.archive_after_days is not None:
+            self.compact_history()
+    
+    def rebucket(self, bucketer=None):
+        """
+        Re-file every entry, hot and archived, by its timestamp under `bucketer`
+        (default: the tracker's own, e.g. after changing its timezone or day-start hour)
+
+        Runs as one bulk pass: all days are read once, regrouped, and the hot tier
+        and archive rebuilt. Entries whose timestamp cannot be parsed stay on their
+        day. Returns the number of entries that moved to a different day.
+        """
+        if bucketer is not None:
+            self.bucketer = bucketer
+        day_of_stamp = self.bucketer.day_of_stamp
+        regrouped = {}
+        moved = 0
+        for day in self.day_index:
+            for entry in self.get_day_entries(day):
+                new_day = day_of_stamp(entry.get("timestamp"))
+                if new_day is None:
+                    new_day = day
+                elif new_day != day:
+                    moved += 1
+                regrouped.setdefault(new_day, []).append(_frozen(entry))
+        
+        self.daily_logs = regrouped
+        replaced, self.archive = self.archive, ColdArchive(cache_size=self.archive.cache_size)
+        self.current_day = self.bucketer.today()
+        self.rebuild_day_index()
+        # Releases a snapshot mapping the old archive may own (see mirror_snapshot)
+        replaced.close()
+        if self.archive_after_days is not None:
+            self.compact_history()
+        return moved
+    
+    def get_day_entries(self, target_date=None, snapshot=None):
+        """
+        Return the entries logged on a date, from memory or the cold archive (None if no logs)
+        - target_date: "%Y-%m-%d" string, date or day ordinal (defaults to today)
+        - snapshot: Optional TrackerSnapshot to read from (its days, archive and
+          current day) instead of the live tracker
+        """
+        if snapshot is None:
+            logs, archive, today = self.daily_logs, self.archive, self.current_day
+        else:
+            logs, archive, today = snapshot, snapshot.archive, snapshot.current_day
+        day = today if target_date is None else to_ordinal(target_date)
+        entries = logs.get(day)
+        if entries is not None:
+            return entries
+        return archive.get_day(day)
+    
+    def active_days(self, start=None, end=None):
+        """
+        Dates ("%Y-%m-%d") that have logs between start and end inclusive, oldest first
+        Either bound may be omitted; cost is proportional to the number of matching days
+        """
+        return [date.fromordinal(day).isoformat() for day in self.active_day_ordinals(start, end)]
+    
+    def first_active_day(self):
+        """The earliest date with logs, or None"""
+        return date.fromordinal(self.day_index[0]).isoformat() if self.day_index else None
+    
+    def last_active_day(self):
+        """The latest date with logs, or None"""
+        return date.fromordinal(self.day_index[-1]).isoformat() if self.day_index else None
+    
+    def gaps(self, start=None, end=None, min_length=1):
+        """
+        Runs of days without logs between start and end (default: first to last active day)
+        Returns a list of (first_missing_date, last_missing_date) tuples; none if end < start
+        """
+        if not self.day_index:
+            return []
+        low = self.day_index[0] if start is None else to_ordinal(start)
+        high = self.day_index[-1] if end is None else to_ordinal(end)
+        if high < low:
+            return []
+        min_length = max(min_length, 1)
+        
+        gaps = []
+        previous = low - 1
+        for day in self.active_day_ordinals(low, high) + [high + 1]:
+            if day - previous - 1 >= min_length:
+                gaps.append((date.fromordinal(previous + 1).isoformat(), date.fromordinal(day - 1).isoformat()))
+            previous = day
+        return gaps
+    
+    def rebuild_day_index(self):
+        """Rebuild day_index after daily_logs or the archive were replaced wholesale"""
+        self.day_index = array("i", sorted(set(self.daily_logs).union(self.archive.day_ordinals())))
+        self.publish_all()
+    
+    def active_day_ordinals(self, start=None, end=None):
+        """
+        Day ordinals with logs between start and end inclusive, oldest first
+        The same days as active_days(), without formatting them; found by bisecting day_index
+        """
+        low = 0 if start is None else bisect_left(self.day_index, to_ordinal(start))
+        high = len(self.day_index) if end is None else bisect_right(self.day_index, to_ordinal(end))
+        return self.day_index[low:high].tolist()
+    
+    def compact_history(self, max_age_days=None):
+        """
+        Move days older than max_age_days (default: archive_after_days) into the cold archive
+        Returns the number of days archived
+        """
+        if max_age_days is None:
+            max_age_days = self.archive_after_days
+        if max_age_days is None:
+            return 0
+        
+        cutoff = self.current_day - max_age_days
+        old_days = {day: entries for day, entries in self.daily_logs.items() if day < cutoff}
+        if old_days:
+            self.archive.archive_days(old_days)
+            # A fresh dict: deleting keys never shrinks one sized for the whole history
+            self.daily_logs = {day: entries for day, entries in self.daily_logs.items() if day >= cutoff}
+            self.publish_all()
+        return len(old_days)
+
+def _frozen(entry):
+    return entry if type(entry) is FrozenDict else FrozenDict(entry)
 
 # Example usage class that combines all components
 class MirrorDashboard:
     """
     The Mirror Dashboard - Combining all components
     """
-    def __init__(self):
-        self.profile = ProfileOfX()
-        self.tracker = TriadTracker()
-        self.mirror_system = MirrorSystem()
+    def __init__(self, profile=None, tracker=None, mirror_system=None):
+        """
+        Components that are not supplied are built (and their modules imported)
+        on first access, so creating a dashboard costs nothing until it is used.
+        """
+        self._profile = profile
+        self._tracker = tracker
+        self._mirror_system = mirror_system
+
+    @property
+    def profile(self):
+        if self._profile is None:
+            from profile_of_x import ProfileOfX
+            self._profile = ProfileOfX()
+        return self._profile
+
+    @profile.setter
+    def profile(self, value):
+        self._profile = value
+
+    @property
+    def tracker(self):
+        if self._tracker is None:
+            self._tracker = TriadTracker()
+        return self._tracker
+
+    @tracker.setter
+    def tracker(self, value):
+        self._tracker = value
+
+    @property
+    def mirror_system(self):
+        if self._mirror_system is None:
+            from mirror_system import MirrorSystem
+            self._mirror_system = MirrorSystem()
+        return self._mirror_system
+
+    @mirror_system.setter
+    def mirror_system(self, value):
+        self._mirror_system = value
     
     def generate_daily_report(self):
         """
         Generate a comprehensive daily report combining all elements
+
+        Every section is computed from one tracker snapshot and one profile
+        snapshot taken up front, so a report built while entries are being logged
+        (e.g. on the service's worker pool) never mixes versions.
         """
+        tracker = self.tracker
+        snapshot = tracker.snapshot()
+        summary = self.profile.get_profile_summary()
+        day = snapshot.current_day
+        
         # Get today's scores
-        daily_scores = self.tracker.calculate_daily_scores()
+        daily_scores = tracker.calculate_daily_scores(day, snapshot)
         
         # Create daily logs for mirror system
         daily_logs = {
@@ -278,37 +585,15 @@ class MirrorDashboard:
         
         # Combine everything into a daily report
         report = {
-            "date": self.tracker.current_date,
+            "date": date.fromordinal(day).isoformat(),
             "audit_result": audit_result,
             "first_principles_feedback": fp_feedback,
             "quaspace_status": quaspace_progress,
             "shadow_warnings": shadow_warnings,
             "triad_scores": daily_scores,
-            "weekly_average": self.tracker.get_weekly_average(),
-            "priority_actions": self.profile.get_priority_actions(),
-            "risk_assessment": self.profile.get_risk_assessment()
+            "weekly_average": tracker.get_weekly_average(snapshot),
+            "priority_actions": self.profile.get_priority_actions(summary),
+            "risk_assessment": self.profile.get_risk_assessment(summary)
         }
         
         return report
-
-# Import required classes for the dashboard to work properly
-try:
-    from profile_of_x import ProfileOfX
-    from mirror_system import MirrorSystem
-except ImportError:
-    # Define placeholder classes if imports fail during creation
-    class ProfileOfX:
-        def get_priority_actions(self):
-            return ["Placeholder: ProfileOfX module needed"]
-        def get_risk_assessment(self):
-            return "Placeholder: ProfileOfX module needed"
-    
-    class MirrorSystem:
-        def generate_daily_audit(self, daily_logs):
-            return {"placeholder": "MirrorSystem module needed"}
-        def check_first_principles_thinking(self, subject_area, approach_type):
-            return "Placeholder: MirrorSystem module needed"
-        def quaspace_reality_check(self, progress_made):
-            return "Placeholder: MirrorSystem module needed"
-        def shadow_archive_warning(self, failure_modes_active):
-            return ["Placeholder: MirrorSystem module needed"]
\ No newline at end of file
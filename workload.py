@@ -0,0 +1,182 @@
+# Synthetic Workload Module - Seeded generator for realistic tracker histories
+# Produces reproducible multi-year, multi-user activity logs and profile mutations
+# for benchmarks and load testing. The same seed and end date always yield the same
+# workload.
+
+from datetime import datetime, timedelta
+import random
+
+COGNITIVE_ACTIVITIES = [("derivation", 3), ("problem_solving", 4), ("reading", 5), ("first_principles", 1), ("study", 2)]
+KINETIC_ACTIVITIES = [("coding", 5), ("design", 2), ("research", 2), ("meeting", 1)]
+MORAL_TOPICS = [("Islamic_Ethics", 4), ("World_History", 3), ("Governance", 2), ("ethics_study", 1)]
+
+NOTES = [
+    "", "", "",
+    "Derived the result from first principles",
+    "Worked through past Olympiad problems",
+    "Refactored the Quaspace data pipeline",
+    "Read two chapters on civilizational decline",
+    "Reviewed yesterday's mistakes"
+]
+
+PILLARS = ["polymath", "innovator", "ethical_leader"]
+SHADOWS = ["polymath_trap", "dreamer_delay", "ethical_drift"]
+DREAMS = ["rank_dominance", "institutional_entry", "sovereignty"]
+
+
+class WorkloadGenerator:
+    """
+    Seeded generator for tracker histories
+
+    Each synthetic user gets a persona (discipline, frequency mix, preferred study
+    hours) that shapes their history: weekday/weekend rhythm, occasional multi-day
+    breaks, and bursts of entries on good days. Profile mutations follow the user's
+    recent activity so pillar status and shadow warnings look plausible.
+    """
+
+    def __init__(self, seed=0, users=1, years=1, entries_per_day=6, end_date=None):
+        """
+        - seed: Master seed; every user's stream is derived from it
+        - users: Number of synthetic users
+        - years: Length of each history
+        - entries_per_day: Average entries on an active day for a fully disciplined user
+        - end_date: Last day of the history (defaults to today, so "today" queries see data;
+          pass a fixed date for a workload that does not change from day to day)
+        """
+        self.seed = seed
+        self.users = users
+        self.years = years
+        self.entries_per_day = entries_per_day
+        end = end_date or datetime.now()
+        self.end_date = datetime(end.year, end.month, end.day)
+        self.start_date = self.end_date - timedelta(days=int(365 * years) - 1)
+
+    def user_ids(self):
+        return [f"user-{index:04d}" for index in range(self.users)]
+
+    def persona(self, user_id):
+        """The stable traits that shape one user's history"""
+        rng = random.Random(f"{self.seed}:{user_id}:persona")
+        return {
+            "discipline": rng.uniform(0.35, 0.95),
+            "mix": {"cognitive": rng.uniform(0.3, 0.6), "kinetic": rng.uniform(0.15, 0.4), "moral": rng.uniform(0.1, 0.3)},
+            "first_hour": rng.choice([5, 6, 7, 8, 9]),
+            "break_rate": rng.uniform(0.005, 0.02)
+        }
+
+    def entries(self, user_id):
+        """
+        Yield (frequency, kwargs) pairs in timestamp order for one user
+        kwargs can be passed straight to the matching TriadTracker.log_* method
+        """
+        persona = self.persona(user_id)
+        rng = random.Random(f"{self.seed}:{user_id}:entries")
+        frequencies = list(persona["mix"])
+        weights = list(persona["mix"].values())
+        break_days = 0
+
+        day = self.start_date
+        while day <= self.end_date:
+            if break_days:
+                break_days -= 1
+            elif rng.random() < persona["break_rate"]:
+                break_days = rng.randint(2, 10)
+            else:
+                activity = persona["discipline"] * (0.6 if day.weekday() >= 5 else 1.0)
+                if rng.random() < activity:
+                    count = max(1, int(rng.gauss(self.entries_per_day * activity, 1.5)))
+                    minutes = sorted(rng.randint(0, 16 * 60) for _ in range(count))
+                    for minute in minutes:
+                        timestamp = day + timedelta(hours=persona["first_hour"], minutes=minute, seconds=rng.randint(0, 59))
+                        frequency = rng.choices(frequencies, weights)[0]
+                        yield frequency, self._entry_fields(rng, frequency, timestamp)
+            day += timedelta(days=1)
+
+    def profile_mutations(self, user_id):
+        """
+        Yield (timestamp, method_name, args) profile updates, roughly one review per week
+        Apply them with getattr(profile, method_name)(*args)
+        """
+        persona = self.persona(user_id)
+        rng = random.Random(f"{self.seed}:{user_id}:profile")
+        progress = {dream: 0.0 for dream in DREAMS}
+
+        day = self.start_date + timedelta(days=6 - self.start_date.weekday())  # First Sunday
+        while day <= self.end_date:
+            review = day + timedelta(hours=20)
+            for pillar in PILLARS:
+                status = round(min(10, max(0, rng.gauss(persona["discipline"] * 10, 1.5))), 1)
+                yield review, "update_identity_pillar", (pillar, status, rng.choice(NOTES))
+            for shadow in SHADOWS:
+                if rng.random() > persona["discipline"]:
+                    yield review, "trigger_shadow_warning", (shadow,)
+                elif rng.random() < 0.5:
+                    yield review, "clear_shadow_warning", (shadow,)
+            dream = rng.choice(DREAMS)
+            progress[dream] = min(1.0, progress[dream] + rng.uniform(0, 0.02) * persona["discipline"])
+            yield review, "update_sunday_dream_progress", (dream, round(progress[dream], 4))
+            day += timedelta(days=7)
+
+    def populate_tracker(self, tracker, user_id):
+        """Log a user's whole history into a TriadTracker; returns the number of entries"""
+        loggers = {
+            "cognitive": tracker.log_cognitive_effort,
+            "kinetic": tracker.log_kinetic_effort,
+            "moral": tracker.log_moral_effort
+        }
+        count = 0
+        for frequency, fields in self.entries(user_id):
+            loggers[frequency](**fields)
+            count += 1
+        return count
+
+    def populate_profile(self, profile, user_id):
+        """Apply a user's profile mutations in order; returns the number applied"""
+        count = 0
+        for _, method_name, args in self.profile_mutations(user_id):
+            getattr(profile, method_name)(*args)
+            count += 1
+        return count
+
+    def build_dashboards(self, archive_after_days=None):
+        """Build one fully populated MirrorDashboard per user, as of the history's last day"""
+        from triad_tracker import MirrorDashboard
+
+        dashboards = {}
+        for user_id in self.user_ids():
+            dashboard = MirrorDashboard()
+            dashboard.tracker.archive_after_days = archive_after_days
+            dashboard.tracker.current_date = self.end_date
+            self.populate_tracker(dashboard.tracker, user_id)
+            self.populate_profile(dashboard.profile, user_id)
+            if archive_after_days is not None:
+                dashboard.tracker.compact_history()
+            dashboards[user_id] = dashboard
+        return dashboards
+
+    def _entry_fields(self, rng, frequency, timestamp):
+        notes = rng.choice(NOTES)
+        if frequency == "cognitive":
+            return {
+                "hours": round(rng.uniform(0.25, 4.0) * 4) / 4,
+                "activity_type": _weighted(rng, COGNITIVE_ACTIVITIES),
+                "notes": notes,
+                "timestamp": timestamp
+            }
+        elif frequency == "kinetic":
+            return {
+                "activity_type": _weighted(rng, KINETIC_ACTIVITIES),
+                "progress_made": rng.random() < 0.7,
+                "notes": notes,
+                "timestamp": timestamp
+            }
+        return {
+            "topic_area": _weighted(rng, MORAL_TOPICS),
+            "time_spent": round(rng.uniform(0.25, 2.0) * 4) / 4,
+            "notes": notes,
+            "timestamp": timestamp
+        }
+
+
+def _weighted(rng, options):
+    return rng.choices([name for name, _ in options], [weight for _, weight in options])[0]